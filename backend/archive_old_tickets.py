@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Move old tickets out of DynamoDB into the Parquet cold archive."""
+
+import sys
+import argparse
+from itertools import islice
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from src.config import get_settings
+from src.archive import archive_enabled, write_archive_files
+from src.dynamodb_client import create_table_if_not_exists, iter_tickets_created_before, delete_tickets_bulk
+
+# Load environment variables
+load_dotenv()
+
+
+def archive_old_tickets(days, batch_size=1000, dry_run=False):
+    """Archive tickets created more than `days` days ago.
+    
+    Each batch is written to Parquet before it is deleted from DynamoDB, so
+    an interrupted run leaves tickets in both places rather than neither;
+    re-running archives them again (reads use the copy with the latest
+    archived_at).
+    """
+    settings = get_settings()
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    
+    print("=== Archiving Old Tickets ===")
+    print(f"🗓️  Cutoff: created before {cutoff} ({days} days)")
+    print(f"📁 Archive: {settings.ticket_archive_dir or '(not configured)'}")
+    
+    if not archive_enabled():
+        print("❌ Set TICKET_ARCHIVE_DIR and install the archive extra (pip install '.[archive]')")
+        return False
+    
+    if not create_table_if_not_exists():
+        print("❌ Could not create/access DynamoDB table")
+        return False
+    
+    tickets = iter_tickets_created_before(cutoff)
+    archived_count = 0
+    failed_count = 0
+    
+    while True:
+        batch = list(islice(tickets, batch_size))
+        if not batch:
+            break
+        
+        if dry_run:
+            archived_count += len(batch)
+            print(f"   🔍 Would archive {len(batch)} tickets (oldest {batch[0].get('created_at')})")
+            continue
+        
+        paths = write_archive_files(batch)
+        if not paths:
+            print("❌ Could not write archive files; stopping before deleting anything")
+            return False
+        
+        stats = delete_tickets_bulk(batch)
+        archived_count += stats["written"]
+        failed_count += stats["failed"]
+        print(f"   📦 Archived {stats['written']} tickets into {len(paths)} file(s)")
+    
+    action = "Would archive" if dry_run else "Archived"
+    print(f"\n📊 {action} {archived_count} tickets ({failed_count} could not be deleted)")
+    return failed_count == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=get_settings().ticket_archive_after_days,
+                        help="Archive tickets older than this many days (default: TICKET_ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Tickets per archive file write")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the tickets that would be archived")
+    args = parser.parse_args()
+    
+    success = archive_old_tickets(args.days, args.batch_size, args.dry_run)
+    
+    if success:
+        print("\n🎉 Archival completed!")
+    else:
+        print("\n❌ Archival failed")
+        print("💡 Tickets that were not deleted stay in DynamoDB; re-run to retry")
+        sys.exit(1)
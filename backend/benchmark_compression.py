@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Estimate DynamoDB item size and RCU/WCU savings from ticket text compression."""
+
+import os
+import json
+import math
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from src.config import get_settings
+from src.dynamodb_client import build_ticket_item
+from src.ticket_compression import encode_item, decode_item, item_size_bytes, zstandard
+
+# Load environment variables
+load_dotenv()
+
+MOCK_ISSUES_DIR = "../docs-and-mock-data/mock-issues"
+LIST_PAGE_SIZE = 50
+
+
+def load_items():
+    """Load mock issues as they would be stored by save_ticket."""
+    timestamp = datetime.utcnow().isoformat()
+    items = []
+    for json_file in sorted(os.listdir(MOCK_ISSUES_DIR)):
+        if not json_file.endswith(".json"):
+            continue
+        with open(os.path.join(MOCK_ISSUES_DIR, json_file), 'r', encoding='utf-8') as f:
+            for issue in json.load(f):
+                items.append(build_ticket_item({
+                    "id": issue["id"],
+                    "problem": issue["problem"],
+                    "solution": issue["solution"],
+                    "category": issue["category"],
+                    "created_at": timestamp
+                }))
+    return items
+
+
+def capacity(sizes):
+    """Capacity units for writing and reading items of the given sizes."""
+    pages = [sizes[i:i + LIST_PAGE_SIZE] for i in range(0, len(sizes), LIST_PAGE_SIZE)]
+    return {
+        "bytes": sum(sizes),
+        # Writes are billed per started 1 KB of each item
+        "wcu": sum(math.ceil(size / 1024) for size in sizes),
+        # Eventually consistent GetItem: half an RCU per started 4 KB of each item
+        "get_rcu": sum(math.ceil(size / 4096) for size in sizes) * 0.5,
+        # Query pages are billed on the summed size of the page
+        "list_rcu": sum(math.ceil(sum(page) / 4096) for page in pages) * 0.5,
+    }
+
+
+def benchmark():
+    """Compare plain and compressed storage for every available codec."""
+    print("=== Ticket Compression Benchmark ===\n")
+    
+    if not os.path.exists(MOCK_ISSUES_DIR):
+        print(f"❌ Mock issues directory not found: {MOCK_ISSUES_DIR}")
+        return False
+    
+    items = load_items()
+    min_bytes = get_settings().ticket_compression_min_bytes
+    print(f"📂 {len(items)} tickets, compressing text of at least {min_bytes} bytes "
+          f"(TICKET_COMPRESSION_MIN_BYTES)\n")
+    
+    codecs = ["zlib"] + (["zstd"] if zstandard is not None else [])
+    if zstandard is None:
+        print("ℹ️  zstandard not installed; skipping zstd (pip install '.[compression]')\n")
+    
+    baseline = capacity([item_size_bytes(item) for item in items])
+    print(f"   {'codec':<8} {'bytes':>10} {'WCU':>8} {'get RCU':>9} {'list RCU':>9} {'encode ms':>10} {'decode ms':>10}")
+    print(f"   {'none':<8} {baseline['bytes']:>10} {baseline['wcu']:>8} {baseline['get_rcu']:>9} {baseline['list_rcu']:>9} {'-':>10} {'-':>10}")
+    
+    for codec in codecs:
+        started = time.perf_counter()
+        encoded = [encode_item(item, codec) for item in items]
+        encode_ms = (time.perf_counter() - started) * 1000
+        
+        started = time.perf_counter()
+        decoded = [decode_item(dict(item)) for item in encoded]
+        decode_ms = (time.perf_counter() - started) * 1000
+        
+        if decoded != items:
+            print(f"❌ {codec} round trip changed ticket contents")
+            return False
+        
+        result = capacity([item_size_bytes(item) for item in encoded])
+        print(f"   {codec:<8} {result['bytes']:>10} {result['wcu']:>8} {result['get_rcu']:>9} {result['list_rcu']:>9} "
+              f"{encode_ms:>10.1f} {decode_ms:>10.1f}")
+        
+        saved = 1 - result["bytes"] / baseline["bytes"]
+        list_saved = 1 - result["list_rcu"] / baseline["list_rcu"] if baseline["list_rcu"] else 0.0
+        print(f"            {saved:.0%} smaller, {list_saved:.0%} fewer RCUs per {LIST_PAGE_SIZE}-ticket list page")
+    
+    print("\n💡 Item sizes are estimates of DynamoDB's accounting; per-item WCU only drops once items cross a 1 KB boundary.")
+    return True
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark ticket storage engines against the mock issues dataset."""
+
+import os
+import sys
+import json
+import time
+import random
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from src.ticket_store import create_ticket_store
+
+# Load environment variables
+load_dotenv()
+
+MOCK_ISSUES_DIR = "../docs-and-mock-data/mock-issues"
+
+
+def load_issues():
+    """Load every mock issue JSON file."""
+    issues = []
+    for json_file in sorted(os.listdir(MOCK_ISSUES_DIR)):
+        if json_file.endswith(".json"):
+            with open(os.path.join(MOCK_ISSUES_DIR, json_file), 'r', encoding='utf-8') as f:
+                issues.extend(json.load(f))
+    return issues
+
+
+def timed(label, operations, func):
+    """Run func, then print total time and per-operation latency."""
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    per_op_ms = elapsed / operations * 1000 if operations else 0.0
+    print(f"   {label:<28} {operations:>6} ops  {elapsed:8.3f}s  {per_op_ms:8.3f} ms/op")
+    return result
+
+
+def benchmark(backend):
+    """Load the mock issues into a store and time the common access paths."""
+    print(f"=== Storage Benchmark ({backend}) ===\n")
+    
+    store = create_ticket_store(backend)
+    if not store.ensure_schema():
+        print("❌ Could not prepare storage")
+        return False
+    
+    issues = load_issues()
+    if not issues:
+        print(f"❌ No issues found in {MOCK_ISSUES_DIR}")
+        return False
+    
+    # Spread created_at over the last 90 days so index ordering is exercised
+    now = datetime.utcnow()
+    tickets = [
+        {
+            "id": issue["id"],
+            "problem": issue["problem"],
+            "solution": issue["solution"],
+            "category": issue["category"],
+            "created_at": (now - timedelta(minutes=random.randint(0, 90 * 24 * 60))).isoformat()
+        }
+        for issue in issues
+    ]
+    ids = [ticket["id"] for ticket in tickets]
+    categories = sorted({ticket["category"] for ticket in tickets})
+    
+    stats = timed("bulk save", len(tickets), lambda: store.save_tickets_bulk(tickets))
+    print(f"      written={stats['written']} failed={stats['failed']}")
+    
+    sample = random.choices(ids, k=1000)
+    timed("get by id", len(sample), lambda: [store.get_ticket_by_id(ticket_id, use_cache=False) for ticket_id in sample])
+    timed("batch get (100 ids)", 10, lambda: [store.get_tickets_by_ids(random.sample(ids, min(100, len(ids)))) for _ in range(10)])
+    
+    def walk_pages():
+        pages, token = 0, None
+        while True:
+            page = store.list_tickets(limit=50, page_token=token)
+            pages += 1
+            token = page["next_page_token"]
+            if not token:
+                return pages
+    
+    pages = walk_pages()
+    timed("list all pages (50/page)", pages, walk_pages)
+    timed("category query (first page)", len(categories) * 20,
+          lambda: [store.query_tickets_by_category(category) for category in categories * 20])
+    timed("update status", len(sample),
+          lambda: [store.update_ticket_fields(ticket_id, {"status": "resolved"}) for ticket_id in sample])
+    timed("stats", 100, lambda: [store.get_ticket_stats() for _ in range(100)])
+    
+    stats = store.get_ticket_stats()
+    print(f"\n📊 {stats['total']} tickets across {len(stats['by_category'])} categories")
+    return True
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "memory"
+    if not benchmark(backend):
+        sys.exit(1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Build the local vector index from the mock issues (and optionally stored tickets)."""
+
+import os
+import sys
+import json
+import time
+import argparse
+from dotenv import load_dotenv
+from src.config import get_settings
+from src.vector_index import VectorIndex, np, embed_texts, embedding_text, ticket_document
+from src.embedding_cache import embedding_stats
+
+# Load environment variables
+load_dotenv()
+
+MOCK_ISSUES_DIR = "../docs-and-mock-data/mock-issues"
+# Tickets embedded per progress step (requests inside a step are batched and concurrent)
+BUILD_STEP_SIZE = 1000
+
+
+def load_mock_tickets():
+    """Load mock issues as tickets."""
+    tickets = []
+    for json_file in sorted(os.listdir(MOCK_ISSUES_DIR)):
+        if not json_file.endswith(".json"):
+            continue
+        with open(os.path.join(MOCK_ISSUES_DIR, json_file), 'r', encoding='utf-8') as f:
+            for issue in json.load(f):
+                tickets.append({
+                    "id": issue["id"],
+                    "problem": issue["problem"],
+                    "solution": issue["solution"],
+                    "category": issue["category"]
+                })
+    return tickets
+
+
+def load_stored_tickets():
+    """Load every ticket stored in DynamoDB."""
+    from src.dynamodb_client import create_table_if_not_exists, iter_all_tickets
+    
+    if not create_table_if_not_exists():
+        print("❌ Could not create/access DynamoDB table")
+        return None
+    return list(iter_all_tickets())
+
+
+def build_vector_index(directory, quantize=False, from_dynamodb=False):
+    """Embed tickets in batches and save the index to `directory`."""
+    print("=== Building Local Vector Index ===")
+    print(f"📁 Index directory: {directory}")
+    print(f"🗜️  Quantization: {'int8' if quantize else 'none (float32)'}")
+    
+    if np is None:
+        print("❌ numpy is not installed (pip install '.[vector-index]')")
+        return False
+    
+    if not os.path.exists(MOCK_ISSUES_DIR):
+        print(f"❌ Mock issues directory not found: {MOCK_ISSUES_DIR}")
+        return False
+    
+    tickets = {ticket["id"]: ticket for ticket in load_mock_tickets()}
+    print(f"📂 {len(tickets)} mock issues")
+    
+    if from_dynamodb:
+        stored = load_stored_tickets()
+        if stored is None:
+            return False
+        print(f"📂 {len(stored)} stored tickets")
+        # Stored tickets win over mock issues with the same ID
+        tickets.update({ticket["id"]: ticket for ticket in stored})
+    
+    index = VectorIndex(quantize=quantize)
+    batch = []
+    started = time.perf_counter()
+    
+    for i, ticket in enumerate(tickets.values(), 1):
+        batch.append(ticket)
+        if len(batch) < BUILD_STEP_SIZE and i < len(tickets):
+            continue
+        
+        vectors = embed_texts([embedding_text(item) for item in batch])
+        if vectors is None:
+            print("❌ Could not generate embeddings; check OPENAI_API_KEY")
+            return False
+        
+        index.upsert([item["id"] for item in batch], vectors, [ticket_document(item) for item in batch])
+        print(f"   📝 Embedded {len(index)}/{len(tickets)} tickets...")
+        batch = []
+    
+    index.save(directory)
+    print(f"✅ Saved {len(index)} tickets ({index.dimensions} dimensions) in {time.perf_counter() - started:.1f}s")
+    
+    stats = embedding_stats()
+    cache = stats["cache"]
+    print(f"📊 {stats['api']['requests']} embedding requests for {stats['api']['texts_embedded']} texts"
+          + (f", cache hit rate {cache['hit_rate']:.0%}" if cache else ", cache disabled"))
+    return True
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", default=settings.vector_index_dir, help="Output directory (default: VECTOR_INDEX_DIR)")
+    parser.add_argument("--quantize", action="store_true", default=settings.vector_index_quantize,
+                        help="Store int8 vectors (default: VECTOR_INDEX_QUANTIZE)")
+    parser.add_argument("--from-dynamodb", action="store_true", help="Also index every ticket stored in DynamoDB")
+    args = parser.parse_args()
+    
+    success = build_vector_index(args.dir, args.quantize, args.from_dynamodb)
+    
+    if success:
+        print("\n🎉 Vector index built!")
+        print("💡 Set VECTOR_INDEX_MODE=primary or fallback to use it")
+    else:
+        print("\n❌ Vector index build failed")
+        sys.exit(1)
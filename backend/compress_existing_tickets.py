@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Rewrite stored tickets so their text attributes match TICKET_COMPRESSION."""
+
+from boto3.dynamodb.types import Binary
+from dotenv import load_dotenv
+from src.dynamodb_client import create_table_if_not_exists, iter_all_tickets, set_ticket_attributes_bulk
+from src.ticket_compression import COMPRESSIBLE_FIELDS, compression_codec, encode_item, decode_item
+
+# Load environment variables
+load_dotenv()
+
+
+def _stored_format(value):
+    """Marker byte of a compressed value, or None for plain text."""
+    if isinstance(value, Binary):
+        return value.value[:1]
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value[:1])
+    return None
+
+
+def compress_existing_tickets():
+    """Compress (or decompress) stored tickets to the configured codec.
+    
+    Only the text attributes whose stored encoding differs from what
+    save_ticket would write today are rewritten, in place. Each update only
+    applies while those attributes still hold the scanned value, so tickets
+    written by the application in the meantime are skipped, not overwritten.
+    """
+    codec = compression_codec()
+    print("=== Compressing Existing Tickets ===")
+    print(f"🗜️  Target codec: {codec}")
+    
+    if not create_table_if_not_exists():
+        print("❌ Could not create/access DynamoDB table")
+        return False
+    
+    scanned_count = 0
+    rewrite_count = 0
+    
+    def tickets_to_rewrite():
+        """Yield (id, re-encoded attributes, scanned attributes) for out-of-date tickets."""
+        nonlocal scanned_count, rewrite_count
+        for raw_item in iter_all_tickets(projection=["id", *COMPRESSIBLE_FIELDS], decode=False):
+            scanned_count += 1
+            
+            target = encode_item(decode_item(dict(raw_item)), codec)
+            fields = [field for field in COMPRESSIBLE_FIELDS
+                      if _stored_format(raw_item.get(field)) != _stored_format(target.get(field))]
+            if fields:
+                rewrite_count += 1
+                yield (raw_item["id"],
+                       {field: target[field] for field in fields},
+                       {field: raw_item.get(field) for field in fields})
+            
+            if scanned_count % 1000 == 0:
+                print(f"   📝 Scanned {scanned_count} items, rewriting {rewrite_count}...")
+    
+    try:
+        stats = set_ticket_attributes_bulk(tickets_to_rewrite())
+    except Exception as e:
+        print(f"❌ Error rewriting tickets: {e}")
+        return False
+    
+    print(f"📊 Scanned {scanned_count} items, rewrote {stats['updated']} "
+          f"({stats['skipped']} changed concurrently, {stats['failed']} failed)")
+    return stats["failed"] == 0
+
+
+if __name__ == "__main__":
+    success = compress_existing_tickets()
+    
+    if success:
+        print("\n🎉 Ticket compression migration completed!")
+    else:
+        print("\n❌ Ticket compression migration failed")
+        print("💡 Re-run to retry items that could not be written")
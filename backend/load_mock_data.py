@@ -6,6 +6,8 @@ import json
 import weaviate
 import weaviate.classes as wvc
 from weaviate.classes.init import Auth
+from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.util import generate_uuid5
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -127,8 +129,9 @@ def load_mock_data():
                                 "solution": issue["solution"]
                             }
                             
-                            # Add to batch
-                            batch.add_object(obj)
+                            # Add to batch under the ticket's deterministic UUID, so the
+                            # outbox consumer and re-runs overwrite instead of duplicating
+                            batch.add_object(obj, uuid=generate_uuid5(issue["id"]))
                             success_count += 1
                             
                             # Progress indicator
@@ -166,21 +169,18 @@ def load_mock_data():
             else:
                 print("   ⚠️  No objects found after loading")
             
-            # Step 4: Show collection stats
-            total_result = collection.query.fetch_objects(limit=1000)  # Get count
+            # Step 4: Show collection stats (aggregated server-side)
+            stats = collection.aggregate.over_all(
+                group_by=GroupByAggregate(prop="category"),
+                total_count=True
+            )
             print(f"\n📊 Collection Statistics:")
             print(f"   Collection: {collection_name}")
-            print(f"   Total Issues: {len(total_result.objects)}")
-            
-            # Group by category
-            categories = {}
-            for obj in total_result.objects:
-                cat = obj.properties.get("category", "Unknown")
-                categories[cat] = categories.get(cat, 0) + 1
+            print(f"   Total Issues: {sum(group.total_count or 0 for group in stats.groups)}")
             
             print(f"   Categories:")
-            for cat, count in categories.items():
-                print(f"     - {cat}: {count} issues")
+            for group in stats.groups:
+                print(f"     - {group.grouped_by.value}: {group.total_count} issues")
             
             print(f"\n🎉 Data loading completed successfully!")
             return True
@@ -7,8 +7,9 @@ from datetime import datetime
 from dotenv import load_dotenv
 from src.dynamodb_client import (
     create_table_if_not_exists,
-    save_ticket,
-    list_tickets
+    save_tickets_bulk,
+    list_tickets,
+    rebuild_ticket_stats
 )
 from src.ticket_types import Ticket
 
@@ -72,40 +73,35 @@ def load_mock_data_to_dynamodb():
     # Load data into DynamoDB
     print(f"\n📚 Loading {len(issues)} issues into DynamoDB...")
     
-    success_count = 0
-    batch_size = 10
     timestamp = datetime.utcnow().isoformat()
     
-    for i, issue in enumerate(issues):
-        try:
-            # Convert issue to Ticket format
-            ticket: Ticket = {
-                "id": issue["id"],
-                "problem": issue["problem"],
-                "solution": issue["solution"],
-                "category": issue["category"],
-                "created_at": timestamp,
-                "updated_at": timestamp
-            }
-            
-            # Save to DynamoDB
-            if save_ticket(ticket):
-                success_count += 1
-            else:
-                print(f"   ⚠️  Failed to save issue {issue['id']}")
-            
-            # Progress indicator
-            if (i + 1) % batch_size == 0:
-                print(f"   📝 Processed {i + 1}/{len(issues)} issues...")
-                
-        except Exception as e:
-            print(f"   ⚠️  Error processing issue {issue.get('id', 'unknown')}: {e}")
-    
-    print(f"   ✅ Successfully loaded {success_count}/{len(issues)} issues")
+    # Convert issues to Ticket format lazily so the bulk writer can stream them
+    new_tickets = (
+        {
+            "id": issue["id"],
+            "problem": issue["problem"],
+            "solution": issue["solution"],
+            "category": issue["category"],
+            "created_at": timestamp,
+            "updated_at": timestamp
+        }
+        for issue in issues
+    )
+    
+    stats = save_tickets_bulk(new_tickets)
+    success_count = stats["written"]
+    
+    print(f"   ✅ Successfully loaded {success_count}/{len(issues)} issues "
+          f"({stats['items_per_second']} items/s)")
+    
+    controller = stats.get("controller", {})
+    if controller:
+        print(f"   ⚙️  Throttles: {controller['throttles']}, "
+              f"final concurrency: {controller['concurrency']}, batch size: {controller['batch_size']}")
     
     # Verify the data
     print(f"\n🔍 Verifying loaded data...")
-    tickets = list_tickets(limit=10)
+    tickets = list_tickets(limit=10)["tickets"]
     
     if tickets:
         print(f"   ✅ Verification successful - found {len(tickets)} sample tickets:")
@@ -116,20 +112,14 @@ def load_mock_data_to_dynamodb():
     else:
         print("   ⚠️  No tickets found after loading")
     
-    # Show collection stats
-    all_tickets = list_tickets(limit=1000)  # Get more for stats
+    # Bulk writes count every ticket as new, so recount after a (re)load
+    stats = rebuild_ticket_stats()
     print(f"\n📊 DynamoDB Table Statistics:")
     print(f"   Table: tickets")
-    print(f"   Total Tickets: {len(all_tickets)}")
-    
-    # Group by category
-    categories = {}
-    for ticket in all_tickets:
-        cat = ticket.get("category", "Unknown")
-        categories[cat] = categories.get(cat, 0) + 1
+    print(f"   Total Tickets: {stats['total']}")
     
     print(f"   Categories:")
-    for cat, count in categories.items():
+    for cat, count in stats["by_category"].items():
         print(f"     - {cat}: {count} tickets")
     
     print(f"\n🎉 Data loading completed successfully!")
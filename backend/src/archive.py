@@ -0,0 +1,211 @@
+"""Cold-tier ticket archive stored as Parquet files partitioned by year and month."""
+
+import os
+import glob
+import time
+import uuid
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .config import get_settings
+from .ticket_types import Ticket
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Columns written for every archived ticket; entity_type (an index key) is dropped
+ARCHIVE_COLUMNS = ("id", "problem", "solution", "category", "status", "priority", "created_at", "updated_at", "version", "archived_at")
+
+# Minimum seconds between directory scans for files written by other processes;
+# lookups of unknown ids in between are answered from the index alone
+ID_INDEX_REFRESH_SECONDS = 60.0
+
+# ticket id -> (archived_at, Parquet file holding its newest copy), filled
+# lazily from the files' id and archived_at columns
+_id_index: Dict[str, Tuple[str, str]] = {}
+_indexed_files: set = set()
+_last_refresh = 0.0
+_index_lock = threading.Lock()
+
+
+def archive_dir() -> str:
+    """Root directory of the archive (empty when archiving is disabled)."""
+    return get_settings().ticket_archive_dir
+
+
+def archive_enabled() -> bool:
+    """Whether an archive is configured and pandas/pyarrow are installed."""
+    return bool(archive_dir()) and pd is not None
+
+
+def _partition_dir(created_at: str) -> str:
+    """Hive-style year=/month= directory for a created_at timestamp."""
+    return os.path.join(archive_dir(), f"year={created_at[:4]}", f"month={created_at[5:7]}")
+
+
+def _archive_row(ticket: Dict[str, Any], archived_at: str) -> Dict[str, Any]:
+    """Flatten a stored ticket into an archive row."""
+    row: Dict[str, Any] = {column: ticket.get(column) for column in ARCHIVE_COLUMNS}
+    if isinstance(row["version"], Decimal):
+        row["version"] = int(row["version"])
+    row["archived_at"] = archived_at
+    return row
+
+
+def _ticket_from_row(row: Dict[str, Any]) -> Ticket:
+    """Convert an archive row back into a ticket, dropping empty columns."""
+    ticket = {key: value for key, value in row.items() if not pd.isna(value)}
+    if "version" in ticket:
+        ticket["version"] = int(ticket["version"])
+    ticket["archived"] = True
+    return ticket
+
+
+def write_archive_files(tickets: Iterable[Dict[str, Any]]) -> List[str]:
+    """Write tickets to new Parquet files, one per year/month partition.
+    
+    Files are written under a temporary name and renamed into place, so
+    readers never see a partial file. Returns the written paths.
+    """
+    if not archive_enabled():
+        print("Ticket archive not configured (TICKET_ARCHIVE_DIR) or pandas/pyarrow not installed")
+        return []
+    
+    archived_at = datetime.utcnow().isoformat()
+    partitions: Dict[str, List[Dict[str, Any]]] = {}
+    for ticket in tickets:
+        partitions.setdefault(_partition_dir(ticket.get("created_at") or archived_at), []).append(_archive_row(ticket, archived_at))
+    
+    paths = []
+    for directory, rows in partitions.items():
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{archived_at[:19].replace(':', '')}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        
+        frame = pd.DataFrame(rows, columns=list(ARCHIVE_COLUMNS))
+        frame["version"] = frame["version"].astype("Int64")
+        frame.to_parquet(path + ".tmp", engine="pyarrow", index=False)
+        os.replace(path + ".tmp", path)
+        paths.append(path)
+        
+        _index_file(path, [(row["id"], archived_at) for row in rows])
+    
+    return paths
+
+
+def _index_file(path: str, rows: Iterable[Tuple[str, str]]) -> None:
+    """Record a file's (id, archived_at) pairs, keeping the newest copy of each ticket."""
+    with _index_lock:
+        for ticket_id, archived_at in rows:
+            current = _id_index.get(ticket_id)
+            if current is None or archived_at >= current[0]:
+                _id_index[ticket_id] = (archived_at, path)
+        _indexed_files.add(path)
+
+
+def _refresh_id_index() -> None:
+    """Index archive files not seen yet (including other processes' files).
+    
+    Scans at most once per ID_INDEX_REFRESH_SECONDS, so repeated lookups
+    of unknown ids (e.g. 404s on GET /tickets/{id}) do not walk the archive
+    each time. Files written by this process are indexed as they are written.
+    """
+    global _last_refresh
+    
+    with _index_lock:
+        now = time.monotonic()
+        if _last_refresh and now - _last_refresh < ID_INDEX_REFRESH_SECONDS:
+            return
+        _last_refresh = now
+        indexed = set(_indexed_files)
+    
+    files = set(glob.glob(os.path.join(archive_dir(), "year=*", "month=*", "*.parquet")))
+    for path in sorted(files - indexed):
+        frame = pd.read_parquet(path, engine="pyarrow", columns=["id", "archived_at"])
+        _index_file(path, zip(frame["id"], frame["archived_at"]))
+
+
+def get_archived_ticket(ticket_id: str) -> Optional[Ticket]:
+    """Get a ticket from the archive, or None if it was never archived."""
+    if not archive_enabled():
+        return None
+    
+    try:
+        with _index_lock:
+            entry = _id_index.get(ticket_id)
+        if entry is None:
+            _refresh_id_index()
+            with _index_lock:
+                entry = _id_index.get(ticket_id)
+        if entry is None:
+            return None
+        
+        path = entry[1]
+        frame = pd.read_parquet(path, engine="pyarrow", filters=[("id", "==", ticket_id)])
+        if frame.empty:
+            return None
+        return _ticket_from_row(frame.iloc[0].to_dict())
+    
+    except Exception as e:
+        print(f"Error reading archived ticket {ticket_id}: {e}")
+        return None
+
+
+def _month_dirs(start: str, end: str) -> List[str]:
+    """Partition directories that can hold tickets created in [start, end)."""
+    directories = []
+    year, month = int(start[:4]), int(start[5:7])
+    while (year, month) <= (int(end[:4]), int(end[5:7])):
+        directory = os.path.join(archive_dir(), f"year={year:04d}", f"month={month:02d}")
+        if os.path.isdir(directory):
+            directories.append(directory)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return directories
+
+
+def query_archived_tickets(start: str, end: str, category: Optional[str] = None, limit: int = 100) -> List[Ticket]:
+    """Archived tickets created in [start, end), most recent first.
+    
+    Only the year/month partitions overlapping the range are read, and the
+    created_at/category filters are pushed down to the Parquet reader.
+    """
+    if not archive_enabled():
+        return []
+    
+    filters = [("created_at", ">=", start), ("created_at", "<", end)]
+    if category:
+        filters.append(("category", "==", category))
+    
+    try:
+        frames = []
+        for directory in _month_dirs(start, end):
+            for path in glob.glob(os.path.join(directory, "*.parquet")):
+                frame = pd.read_parquet(path, engine="pyarrow", filters=filters)
+                if not frame.empty:
+                    frames.append(frame)
+        
+        if not frames:
+            return []
+        
+        frame = pd.concat(frames, ignore_index=True)
+        # A ticket archived twice (re-run after an interrupted archival) keeps its newest copy
+        frame = frame.sort_values("archived_at").drop_duplicates("id", keep="last")
+        frame = frame.sort_values("created_at", ascending=False).head(limit)
+        return [_ticket_from_row(row) for row in frame.to_dict(orient="records")]
+    
+    except Exception as e:
+        print(f"Error querying archived tickets: {e}")
+        return []
+
+
+# Public API
+archive_api = {
+    "ARCHIVE_COLUMNS": ARCHIVE_COLUMNS,
+    "archive_enabled": archive_enabled,
+    "write_archive_files": write_archive_files,
+    "get_archived_ticket": get_archived_ticket,
+    "query_archived_tickets": query_archived_tickets,
+}
@@ -0,0 +1,176 @@
+"""Async wrappers for ticket data access."""
+
+import asyncio
+import functools
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+from . import dynamodb_client
+from .config import get_settings
+from .ticket_cache import cache_enabled, get_ticket_cache
+from .ticket_store import get_ticket_store
+from .ticket_types import Ticket
+
+# boto3 is synchronous, so DynamoDB calls run on a dedicated bounded pool
+# instead of the event loop (or the default executor shared with everything else)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Set once the store schema has been verified, so request paths skip the check
+_schema_ready = False
+# Serializes the first verification so concurrent first requests run it once
+_schema_lock: Optional[asyncio.Lock] = None
+
+
+def get_dynamodb_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for blocking DynamoDB calls."""
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().dynamodb_executor_workers,
+                    thread_name_prefix="dynamodb-io"
+                )
+    
+    return _executor
+
+
+def shutdown_dynamodb_executor(wait: bool = True) -> None:
+    """Shut down the shared executor, waiting for in-flight calls by default."""
+    global _executor
+    
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+async def run_in_dynamodb_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking data-access call on the DynamoDB executor and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_dynamodb_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def _call_store(method: str, *args: Any, **kwargs: Any) -> Any:
+    """Call a ticket store method, off the event loop only if the engine blocks."""
+    store = get_ticket_store()
+    func = getattr(store, method)
+    if store.blocking:
+        return await run_in_dynamodb_executor(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+async def save_ticket_async(ticket: Ticket) -> bool:
+    """Awaitable save_ticket."""
+    return await _call_store("save_ticket", ticket)
+
+
+async def save_tickets_bulk_async(tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Awaitable save_tickets_bulk."""
+    return await _call_store("save_tickets_bulk", tickets, workers)
+
+
+async def update_ticket_fields_async(ticket_id: str, updates: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Ticket]:
+    """Awaitable update_ticket_fields."""
+    return await _call_store("update_ticket_fields", ticket_id, updates, expected_version)
+
+
+async def get_ticket_by_id_async(ticket_id: str, use_cache: bool = True) -> Optional[Ticket]:
+    """Awaitable get_ticket_by_id; cache hits are answered without a thread hop."""
+    if use_cache and cache_enabled() and get_ticket_store().blocking:
+        cached = get_ticket_cache().get(ticket_id)
+        if cached is not None:
+            return dict(cached)
+    
+    return await _call_store("get_ticket_by_id", ticket_id, use_cache)
+
+
+async def get_tickets_by_ids_async(ticket_ids: List[str]) -> List[Ticket]:
+    """Awaitable get_tickets_by_ids."""
+    return await _call_store("get_tickets_by_ids", ticket_ids)
+
+
+async def list_tickets_async(limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Awaitable list_tickets."""
+    return await _call_store("list_tickets", limit, page_token, fields)
+
+
+async def list_tickets_sorted_by_created_at_async(limit: int = 50, page_token: Optional[Dict] = None, ascending: bool = False, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Awaitable list_tickets_sorted_by_created_at (DynamoDB only)."""
+    return await run_in_dynamodb_executor(dynamodb_client.list_tickets_sorted_by_created_at, limit, page_token, ascending, fields)
+
+
+async def query_tickets_by_category_async(category: str, limit: int = 20, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
+    """Awaitable query_tickets_by_category."""
+    return await _call_store("query_tickets_by_category", category, limit, page_token, ascending)
+
+
+async def iter_all_tickets_async(segments: int = 4, projection: Optional[List[str]] = None, chunk_size: int = 100) -> AsyncIterator[Ticket]:
+    """Async iterator over iter_all_tickets, pulling chunk_size items per executor hop."""
+    store = get_ticket_store()
+    iterator = store.iter_all_tickets(segments=segments, projection=projection)
+    if not store.blocking:
+        for item in iterator:
+            yield item
+        return
+    
+    try:
+        while True:
+            chunk = await run_in_dynamodb_executor(lambda: list(islice(iterator, chunk_size)))
+            if not chunk:
+                return
+            for item in chunk:
+                yield item
+    finally:
+        await run_in_dynamodb_executor(iterator.close)
+
+
+async def get_ticket_stats_async() -> Dict[str, Any]:
+    """Awaitable get_ticket_stats."""
+    return await _call_store("get_ticket_stats")
+
+
+async def create_table_if_not_exists_async() -> bool:
+    """Awaitable schema setup for the configured ticket store."""
+    return await _call_store("ensure_schema")
+
+
+async def ensure_schema_once_async() -> bool:
+    """Verify the ticket store schema once per process; later calls are free.
+    
+    Callers arriving while the check runs wait for its result instead of
+    starting another one; a failed check is retried by the next caller.
+    """
+    global _schema_ready, _schema_lock
+    
+    if _schema_ready:
+        return True
+    
+    if _schema_lock is None:
+        _schema_lock = asyncio.Lock()
+    async with _schema_lock:
+        if not _schema_ready:
+            _schema_ready = bool(await create_table_if_not_exists_async())
+    return _schema_ready
+
+
+# Public API
+async_tickets_api = {
+    "get_dynamodb_executor": get_dynamodb_executor,
+    "shutdown_dynamodb_executor": shutdown_dynamodb_executor,
+    "run_in_dynamodb_executor": run_in_dynamodb_executor,
+    "save_ticket_async": save_ticket_async,
+    "save_tickets_bulk_async": save_tickets_bulk_async,
+    "update_ticket_fields_async": update_ticket_fields_async,
+    "get_ticket_by_id_async": get_ticket_by_id_async,
+    "get_tickets_by_ids_async": get_tickets_by_ids_async,
+    "list_tickets_async": list_tickets_async,
+    "list_tickets_sorted_by_created_at_async": list_tickets_sorted_by_created_at_async,
+    "query_tickets_by_category_async": query_tickets_by_category_async,
+    "iter_all_tickets_async": iter_all_tickets_async,
+    "get_ticket_stats_async": get_ticket_stats_async,
+    "create_table_if_not_exists_async": create_table_if_not_exists_async,
+    "ensure_schema_once_async": ensure_schema_once_async,
+}
@@ -14,23 +14,98 @@ class Settings:
         self.debug: bool = os.getenv("DEBUG", "False").lower() == "true"
         self.port: int = int(os.getenv("PORT", "8000"))
         self.host: str = os.getenv("HOST", "0.0.0.0")
+        # Run a cheap read against each backend at startup before reporting ready
+        self.startup_warmup: bool = os.getenv("STARTUP_WARMUP", "True").lower() == "true"
         
         # Weaviate Configuration
         self.weaviate_url: str = os.getenv("WEAVIATE_URL", "")
         self.weaviate_api_key: str = os.getenv("WEAVIATE_API_KEY", "")
+        # Seconds between liveness probes of the shared Weaviate connection
+        self.weaviate_health_check_seconds: float = float(os.getenv("WEAVIATE_HEALTH_CHECK_SECONDS", "30"))
+        # Seconds a caller waits for another caller's in-flight (re)connect
+        self.weaviate_connect_wait_seconds: float = float(os.getenv("WEAVIATE_CONNECT_WAIT_SECONDS", "5"))
+        # Write-behind queue for ticket documents: flushed through the batch API
+        # every WEAVIATE_WRITE_BATCH_SIZE documents or WEAVIATE_WRITE_FLUSH_SECONDS
+        self.weaviate_write_behind: bool = os.getenv("WEAVIATE_WRITE_BEHIND", "True").lower() == "true"
+        self.weaviate_write_queue_size: int = int(os.getenv("WEAVIATE_WRITE_QUEUE_SIZE", "10000"))
+        self.weaviate_write_batch_size: int = int(os.getenv("WEAVIATE_WRITE_BATCH_SIZE", "100"))
+        self.weaviate_write_flush_seconds: float = float(os.getenv("WEAVIATE_WRITE_FLUSH_SECONDS", "1"))
+        self.weaviate_write_max_retries: int = int(os.getenv("WEAVIATE_WRITE_MAX_RETRIES", "3"))
+        # Seconds a ticket write waits for room in a full queue before giving up
+        self.weaviate_write_enqueue_timeout_seconds: float = float(os.getenv("WEAVIATE_WRITE_ENQUEUE_TIMEOUT_SECONDS", "2"))
         
         # OpenAI Configuration
         self.openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
         self.openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4")
         self.openai_max_tokens: int = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
+        self.openai_embedding_model: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-ada-002")
+        # Batched embeddings: estimated tokens per request, requests in flight and
+        # requests started per minute (0 = unlimited)
+        self.embedding_batch_max_tokens: int = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))
+        self.embedding_max_concurrency: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+        self.embedding_requests_per_minute: int = int(os.getenv("EMBEDDING_REQUESTS_PER_MINUTE", "500"))
+        # On-disk embedding cache keyed by model + text hash (empty path disables it)
+        self.embedding_cache_path: str = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+        self.embedding_cache_max_entries: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+        # Agent retrieval: similar tickets returned to the model, and the largest
+        # cosine distance still counted as similar (0 = identical, 2 = opposite)
+        self.retrieval_top_k: int = int(os.getenv("RETRIEVAL_TOP_K", "10"))
+        self.retrieval_max_distance: float = float(os.getenv("RETRIEVAL_MAX_DISTANCE", "0.6"))
+        # Local NumPy vector index: off, primary (answer vector searches locally)
+        # or fallback (only when Weaviate fails); needs pip install '.[vector-index]'
+        self.vector_index_mode: str = os.getenv("VECTOR_INDEX_MODE", "off")
+        self.vector_index_dir: str = os.getenv("VECTOR_INDEX_DIR", "vector_index")
+        # Store vectors as int8 (about 4x less memory, slightly lower recall)
+        self.vector_index_quantize: bool = os.getenv("VECTOR_INDEX_QUANTIZE", "False").lower() == "true"
         
         # AWS Configuration
         self.aws_region: str = os.getenv("AWS_REGION", "us-east-1")
         self.aws_access_key_id: str = os.getenv("AWS_ACCESS_KEY_ID", "")
         self.aws_secret_access_key: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
         
+        # Ticket storage engine: "dynamodb" or "memory" (process-local, for benchmarks)
+        self.storage_backend: str = os.getenv("STORAGE_BACKEND", "dynamodb")
+        
         # DynamoDB Configuration
         self.dynamodb_table_name: str = os.getenv("DYNAMODB_TABLE_NAME", "tickets")
+        self.dynamodb_stats_table_name: str = os.getenv("DYNAMODB_STATS_TABLE_NAME", f"{self.dynamodb_table_name}_stats")
+        self.dynamodb_outbox_table_name: str = os.getenv("DYNAMODB_OUTBOX_TABLE_NAME", f"{self.dynamodb_table_name}_outbox")
+        self.dynamodb_max_pool_connections: int = int(os.getenv("DYNAMODB_MAX_POOL_CONNECTIONS", "50"))
+        self.dynamodb_connect_timeout: int = int(os.getenv("DYNAMODB_CONNECT_TIMEOUT", "5"))
+        self.dynamodb_read_timeout: int = int(os.getenv("DYNAMODB_READ_TIMEOUT", "10"))
+        self.dynamodb_max_attempts: int = int(os.getenv("DYNAMODB_MAX_ATTEMPTS", "5"))
+        self.dynamodb_executor_workers: int = int(os.getenv("DYNAMODB_EXECUTOR_WORKERS", "16"))
+        # Adaptive write limiter: in-flight write calls start at the initial value
+        # and move between min and max as throttles and latency allow
+        self.dynamodb_write_min_concurrency: int = int(os.getenv("DYNAMODB_WRITE_MIN_CONCURRENCY", "1"))
+        self.dynamodb_write_max_concurrency: int = int(os.getenv("DYNAMODB_WRITE_MAX_CONCURRENCY", "16"))
+        self.dynamodb_write_initial_concurrency: int = int(os.getenv("DYNAMODB_WRITE_INITIAL_CONCURRENCY", "4"))
+        # 0 disables latency-based backoff; only throttles shrink the limit
+        self.dynamodb_write_latency_target_ms: float = float(os.getenv("DYNAMODB_WRITE_LATENCY_TARGET_MS", "0"))
+        # Number of entity_type partitions CreatedAtIndex writes are spread over
+        self.ticket_index_shards: int = int(os.getenv("TICKET_INDEX_SHARDS", "1"))
+        
+        # Compress long solution/problem text in DynamoDB items: none, zlib or zstd
+        # (zstd needs the zstandard package and falls back to zlib without it)
+        self.ticket_compression: str = os.getenv("TICKET_COMPRESSION", "none")
+        self.ticket_compression_min_bytes: int = int(os.getenv("TICKET_COMPRESSION_MIN_BYTES", "512"))
+        
+        # Cold archive: Parquet files for tickets older than TICKET_ARCHIVE_AFTER_DAYS
+        # (empty directory disables archiving and the archive read fallback)
+        self.ticket_archive_dir: str = os.getenv("TICKET_ARCHIVE_DIR", "")
+        self.ticket_archive_after_days: int = int(os.getenv("TICKET_ARCHIVE_AFTER_DAYS", "365"))
+        
+        # Change outbox: ticket writes record events that a background consumer
+        # applies to the Weaviate Tickets collection (replaces inline Weaviate writes)
+        self.ticket_outbox_enabled: bool = os.getenv("TICKET_OUTBOX_ENABLED", "False").lower() == "true"
+        self.ticket_outbox_batch_size: int = int(os.getenv("TICKET_OUTBOX_BATCH_SIZE", "100"))
+        self.ticket_outbox_poll_seconds: float = float(os.getenv("TICKET_OUTBOX_POLL_SECONDS", "1"))
+        
+        # Ticket Cache Configuration
+        self.ticket_cache_enabled: bool = os.getenv("TICKET_CACHE_ENABLED", "True").lower() == "true"
+        self.ticket_cache_max_size: int = int(os.getenv("TICKET_CACHE_MAX_SIZE", "1024"))
+        self.ticket_cache_ttl_seconds: float = float(os.getenv("TICKET_CACHE_TTL_SECONDS", "30"))
+        self.ticket_list_cache_ttl_seconds: float = float(os.getenv("TICKET_LIST_CACHE_TTL_SECONDS", "5"))
         
         # Database
         self.database_url: str = os.getenv("DATABASE_URL", "")
@@ -100,6 +175,20 @@ def get_dynamodb_config() -> Dict[str, str]:
     return {
         **aws_config,
         "table_name": settings.dynamodb_table_name,
+        "stats_table_name": settings.dynamodb_stats_table_name,
+        "outbox_table_name": settings.dynamodb_outbox_table_name,
+    }
+
+
+def get_dynamodb_pool_config() -> Dict[str, int]:
+    """Get DynamoDB HTTP connection pool configuration from settings."""
+    settings = get_settings()
+    
+    return {
+        "max_pool_connections": settings.dynamodb_max_pool_connections,
+        "connect_timeout": settings.dynamodb_connect_timeout,
+        "read_timeout": settings.dynamodb_read_timeout,
+        "max_attempts": settings.dynamodb_max_attempts,
     }
 
 
@@ -110,4 +199,5 @@ config_api = {
     "get_openai_config": get_openai_config,
     "get_aws_config": get_aws_config,
     "get_dynamodb_config": get_dynamodb_config,
+    "get_dynamodb_pool_config": get_dynamodb_pool_config,
 } 
\ No newline at end of file
@@ -1,88 +1,279 @@
 """DynamoDB client configuration."""
 
+import time
+import uuid
+import zlib
+import heapq
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
-from typing import Optional, List, Dict, Any, Union
+from boto3.dynamodb.types import TypeDeserializer
+from collections import Counter
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, Callable, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
-from .config import get_dynamodb_config, get_aws_config
+from .config import get_settings, get_dynamodb_config, get_aws_config, get_dynamodb_pool_config
 from .ticket_types import Ticket
+from .ticket_cache import cache_enabled, get_ticket_cache, get_list_cache, invalidate_ticket, invalidate_tickets
+from .write_throttle import get_write_controller, is_throttle_error, response_retry_attempts
+from .ticket_compression import encode_item, decode_item, decode_items
+from .archive import archive_enabled, get_archived_ticket
 
 # Load environment variables
 load_dotenv()
 
+# Process-wide DynamoDB resource and verified table handles, shared by every
+# data function so requests reuse pooled HTTP connections instead of paying
+# for a new resource and a DescribeTable round trip each time.
+_client_lock = threading.Lock()
+_dynamodb_resource: Optional[Any] = None
+_tables: Dict[str, Any] = {}
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+# Low-level responses (e.g. items returned with a failed condition) are not deserialized by the resource
+_deserializer = TypeDeserializer()
+
+CREATED_AT_INDEX_NAME = "CreatedAtIndex"
+CATEGORY_INDEX_NAME = "CategoryIndex"
+SUMMARY_INDEX_NAME = "TicketSummaryIndex"
+
+# Attributes returned by summary listings; everything but the long solution text
+TICKET_SUMMARY_FIELDS = ("id", "problem", "category", "status", "priority", "created_at", "updated_at", "version")
+
+# BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_MAX_ITEMS = 25
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_MAX_KEYS = 100
+BATCH_MAX_RETRIES = 8
+BATCH_BASE_BACKOFF_SECONDS = 0.05
+BATCH_MAX_BACKOFF_SECONDS = 5.0
+
+# Index key attributes needed to resume a query on an entity_type index
+INDEX_CURSOR_FIELDS = ("id", "entity_type", "created_at")
+
+# Change outbox layout: events are spread over the same number of partitions as
+# the ticket indexes ("OUTBOX", or "OUTBOX#0".."OUTBOX#N-1"), each ordered by
+# "<timestamp>#<uuid>"; consumer checkpoints live in their own partition
+OUTBOX_PARTITION = "OUTBOX"
+OUTBOX_CHECKPOINT_PARTITION = "CHECKPOINT"
+OUTBOX_RETENTION_DAYS = 7
+
+# Fields clients may change through update_ticket_fields
+UPDATABLE_TICKET_FIELDS = ("category", "priority", "status", "solution")
+
+
+class TicketVersionConflict(Exception):
+    """Raised when a conditional update finds a different ticket version."""
+    
+    def __init__(self, ticket_id: str, expected_version: int, current_version: Optional[int]):
+        self.ticket_id = ticket_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Ticket {ticket_id} is at version {current_version}, expected {expected_version}"
+        )
+
 
 def create_dynamodb_client() -> Optional[Any]:
-    """Create and return DynamoDB client."""
+    """Return the shared DynamoDB resource, creating it on first use."""
+    global _dynamodb_resource
+    
+    if _dynamodb_resource is not None:
+        return _dynamodb_resource
+    
     aws_config = get_aws_config()
     
     if not aws_config:
         print("AWS credentials not configured")
         return None
     
-    try:
-        dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=aws_config["aws_access_key_id"],
-            aws_secret_access_key=aws_config["aws_secret_access_key"],
-            region_name=aws_config["region_name"]
-        )
+    with _client_lock:
+        if _dynamodb_resource is not None:
+            return _dynamodb_resource
         
-        return dynamodb
-        
-    except Exception as e:
-        print(f"Error connecting to DynamoDB: {e}")
-        return None
+        try:
+            pool_config = get_dynamodb_pool_config()
+            # Sessions are not thread-safe, so build a dedicated one under the lock
+            session = boto3.session.Session(
+                aws_access_key_id=aws_config["aws_access_key_id"],
+                aws_secret_access_key=aws_config["aws_secret_access_key"],
+                region_name=aws_config["region_name"]
+            )
+            _dynamodb_resource = session.resource(
+                'dynamodb',
+                config=Config(
+                    max_pool_connections=pool_config["max_pool_connections"],
+                    connect_timeout=pool_config["connect_timeout"],
+                    read_timeout=pool_config["read_timeout"],
+                    retries={"max_attempts": pool_config["max_attempts"], "mode": "standard"},
+                )
+            )
+            
+            return _dynamodb_resource
+            
+        except Exception as e:
+            print(f"Error connecting to DynamoDB: {e}")
+            return None
 
 
 def get_table(client: Any, table_name: str) -> Optional[Any]:
-    """Get DynamoDB table reference."""
+    """Get DynamoDB table reference, verifying it exists once per process."""
     if not client:
         return None
-        
-    try:
-        table = client.Table(table_name)
-        # Test table exists by describing it
-        table.load()
+    
+    table = _tables.get(table_name)
+    if table is not None:
         return table
+    
+    with _client_lock:
+        table = _tables.get(table_name)
+        if table is not None:
+            return table
         
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ResourceNotFoundException':
-            print(f"Table {table_name} does not exist")
-        else:
-            print(f"Error accessing table {table_name}: {e}")
-        return None
-    except Exception as e:
-        print(f"Error getting table {table_name}: {e}")
-        return None
+        try:
+            table = client.Table(table_name)
+            # Test table exists by describing it
+            table.load()
+            _tables[table_name] = table
+            return table
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                print(f"Table {table_name} does not exist")
+            else:
+                print(f"Error accessing table {table_name}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error getting table {table_name}: {e}")
+            return None
 
 
-def save_ticket(ticket: Ticket) -> bool:
-    """Save ticket to DynamoDB."""
+def get_tickets_table() -> Optional[Any]:
+    """Get the shared handle for the configured tickets table."""
     client = create_dynamodb_client()
     if not client:
-        return False
+        return None
     
     config = get_dynamodb_config()
     if not config:
         print("DynamoDB configuration not found")
-        return False
+        return None
+    
+    return get_table(client, config["table_name"])
+
+
+def reset_dynamodb_client() -> None:
+    """Drop the shared resource and cached table handles."""
+    global _dynamodb_resource
     
-    table = get_table(client, config["table_name"])
+    with _client_lock:
+        _dynamodb_resource = None
+        _tables.clear()
+
+
+def index_shard_keys() -> List[str]:
+    """All entity_type partition values of the created_at indexes.
+    
+    A single shard keeps the historical constant "TICKET"; with N shards
+    writes are spread over "TICKET#0".."TICKET#N-1" so the indexes are not
+    capped by one hot partition.
+    """
+    shards = get_settings().ticket_index_shards
+    if shards <= 1:
+        return ["TICKET"]
+    return [f"TICKET#{shard}" for shard in range(shards)]
+
+
+def index_read_keys() -> List[str]:
+    """entity_type partitions list and range reads cover.
+    
+    With several shards the unsharded "TICKET" partition is read as well,
+    so tickets written before sharding stay visible until
+    update_existing_tickets.py moves them (the query is cheap once empty).
+    """
+    shard_keys = index_shard_keys()
+    return shard_keys if shard_keys == ["TICKET"] else shard_keys + ["TICKET"]
+
+
+def index_shard_for(ticket_id: str, prefix: str = "TICKET") -> str:
+    """Stable entity_type partition value for a ticket (or another prefix's shard)."""
+    shards = get_settings().ticket_index_shards
+    if shards <= 1:
+        return prefix
+    return f"{prefix}#{zlib.crc32(ticket_id.encode('utf-8')) % shards}"
+
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
+    """Get the pool used to fan out independent calls (index shards, counters)."""
+    global _fanout_executor
+    
+    if _fanout_executor is None:
+        with _client_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=max(4, get_settings().ticket_index_shards),
+                    thread_name_prefix="dynamodb-fanout"
+                )
+    
+    return _fanout_executor
+
+
+def build_ticket_item(ticket: Ticket) -> Dict[str, Any]:
+    """Build the stored item for a ticket, adding timestamps and the GSI partition key."""
+    now = datetime.utcnow().isoformat()
+    return {
+        **ticket,
+        "entity_type": index_shard_for(ticket["id"]),  # Sharded GSI partition key
+        "created_at": ticket.get("created_at") or now,
+        "updated_at": now,
+        "version": ticket.get("version") or 1
+    }
+
+
+def _controlled_write(operation: Callable[..., Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+    """Run a single-item write under the shared write controller.
+    
+    Holds a controller slot for the call, retries capacity throttles with
+    jittered backoff and reports latency and throttling back to the
+    controller. Other errors propagate unchanged.
+    """
+    controller = get_write_controller()
+    with controller.slot():
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = operation(**kwargs)
+            except ClientError as e:
+                if not is_throttle_error(e) or attempt >= BATCH_MAX_RETRIES:
+                    raise
+                controller.record_throttle()
+                time.sleep(controller.backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            throttled = 1.0 if response_retry_attempts(response) else 0.0
+            controller.record_write(1, time.monotonic() - started, throttled)
+            return response
+
+
+def save_ticket(ticket: Ticket) -> bool:
+    """Save ticket to DynamoDB."""
+    table = get_tickets_table()
     if not table:
         return False
     
     try:
-        # Add timestamp and entity_type for GSI
-        from datetime import datetime
-        ticket_item = {
-            **ticket,
-            "entity_type": "TICKET",  # Constant value for GSI partition key
-            "created_at": ticket.get("created_at", datetime.utcnow().isoformat()),
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        ticket_item = build_ticket_item(ticket)
         
-        table.put_item(Item=ticket_item)
+        record_ticket_changes({ticket['id']: ticket_item['updated_at']})
+        response = _controlled_write(table.put_item, Item=encode_item(ticket_item), ReturnValues="ALL_OLD")
+        invalidate_ticket(ticket['id'])
+        _apply_counter_deltas(counter_deltas(response.get('Attributes'), ticket_item))
         print(f"✅ Ticket {ticket['id']} saved successfully")
         return True
         
@@ -91,105 +282,628 @@ def save_ticket(ticket: Ticket) -> bool:
         return False
 
 
-def get_ticket_by_id(ticket_id: str) -> Optional[Ticket]:
-    """Get single ticket by ID."""
-    client = create_dynamodb_client()
-    if not client:
-        return None
+def update_ticket_fields(ticket_id: str, updates: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Ticket]:
+    """Apply a partial update with a single conditional UpdateItem.
     
-    config = get_dynamodb_config()
-    if not config:
-        print("DynamoDB configuration not found")
+    Only whitelisted fields are written; updated_at is refreshed and the
+    version attribute incremented. The new image comes back from DynamoDB
+    (ReturnValues=ALL_NEW), except when category or status changes: stats
+    counters then need the previous values, so the old image is returned
+    and the new one applied to it locally. When expected_version is given
+    the write only succeeds if the stored version still matches (0 meaning
+    a ticket written before versioning), otherwise TicketVersionConflict is
+    raised. Returns the updated ticket, or None if it does not exist.
+    """
+    table = get_tickets_table()
+    if not table:
         return None
     
-    table = get_table(client, config["table_name"])
+    fields = {key: value for key, value in updates.items() if key in UPDATABLE_TICKET_FIELDS}
+    stored_fields = encode_item(fields)
+    
+    names = {"#id": "id", "#updated_at": "updated_at", "#version": "version"}
+    updated_at = datetime.utcnow().isoformat()
+    values: Dict[str, Any] = {":updated_at": updated_at, ":one": 1}
+    set_clauses = ["#updated_at = :updated_at"]
+    for i, (field, value) in enumerate(stored_fields.items()):
+        names[f"#f{i}"] = field
+        values[f":v{i}"] = value
+        set_clauses.append(f"#f{i} = :v{i}")
+    
+    condition = "attribute_exists(#id)"
+    if expected_version == 0:
+        condition += " AND attribute_not_exists(#version)"
+    elif expected_version is not None:
+        condition += " AND #version = :expected_version"
+        values[":expected_version"] = expected_version
+    
+    # Only category and status moves change counters (created_at is immutable)
+    moves_counters = bool({"category", "status"} & set(fields))
+    
+    record_ticket_changes({ticket_id: updated_at})
+    try:
+        response = _controlled_write(
+            table.update_item,
+            Key={'id': ticket_id},
+            UpdateExpression=f"SET {', '.join(set_clauses)} ADD #version :one",
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_OLD" if moves_counters else "ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD"
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            print(f"Error updating ticket {ticket_id}: {e}")
+            raise
+        
+        # The Table resource does not deserialize the item returned with the error
+        raw_item = e.response.get('Item')
+        if not raw_item:
+            print(f"Ticket {ticket_id} not found")
+            return None
+        current = {key: _deserializer.deserialize(value) for key, value in raw_item.items()}
+        
+        current_version = current.get('version')
+        raise TicketVersionConflict(
+            ticket_id,
+            expected_version,
+            int(current_version) if current_version is not None else 0
+        )
+    finally:
+        invalidate_ticket(ticket_id)
+    
+    if not moves_counters:
+        new_item = decode_item(response['Attributes'])
+    else:
+        # UpdateItem returns one image; the new one is exactly the old plus our SETs
+        old_item = decode_item(response['Attributes'])
+        new_item = {
+            **old_item,
+            **fields,
+            "updated_at": updated_at,
+            "version": old_item.get("version", 0) + 1
+        }
+        _apply_counter_deltas(counter_deltas(old_item, new_item))
+    
+    print(f"✅ Ticket {ticket_id} updated ({', '.join(fields) or 'timestamp only'})")
+    return new_item
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items without materializing the iterable."""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(BATCH_MAX_BACKOFF_SECONDS, BATCH_BASE_BACKOFF_SECONDS * (2 ** attempt)))
+
+
+def _adaptive_chunks(items: Iterable[Any], controller: Any) -> Iterator[List[Any]]:
+    """Like _chunked, but each chunk takes the controller's current batch size."""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= min(controller.batch_size, BATCH_WRITE_MAX_ITEMS):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _batch_write_requests(client: Any, table_name: str, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send up to 25 BatchWriteItem requests, retrying UnprocessedItems.
+    
+    Runs under a write controller slot; throttling errors and unprocessed
+    items are reported to the controller and retried with its backoff.
+    Returns the requests that could not be applied.
+    """
+    controller = get_write_controller()
+    request_items = {table_name: requests}
+    
+    with controller.slot():
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            pending = len(request_items[table_name])
+            started = time.monotonic()
+            try:
+                response = client.batch_write_item(RequestItems=request_items)
+            except ClientError as e:
+                if not is_throttle_error(e):
+                    raise
+                controller.record_throttle()
+            else:
+                unprocessed = (response.get("UnprocessedItems") or {}).get(table_name, [])
+                throttled = len(unprocessed) / pending
+                if not throttled and response_retry_attempts(response):
+                    throttled = 1.0
+                controller.record_write(pending - len(unprocessed), time.monotonic() - started, throttled)
+                
+                if not unprocessed:
+                    return []
+                request_items = {table_name: unprocessed}
+            
+            if attempt < BATCH_MAX_RETRIES:
+                time.sleep(controller.backoff_delay(attempt))
+    
+    return request_items[table_name]
+
+
+def _batch_write_chunk(client: Any, table_name: str, items: List[Dict[str, Any]], delete: bool = False,
+                       before_write: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+    """Write (or delete) up to 25 ticket items with BatchWriteItem.
+    
+    before_write runs first with the batch (used to record outbox events);
+    if it raises, nothing is written. Returns the items (keys, for deletes)
+    that could not be written.
+    """
+    # A batch may not contain the same key twice; the last write wins
+    unique_items = list({item["id"]: item for item in items}.values())
+    if before_write:
+        before_write(unique_items)
+    
+    if delete:
+        requests = [{"DeleteRequest": {"Key": {"id": item["id"]}}} for item in unique_items]
+    else:
+        requests = [{"PutRequest": {"Item": item}} for item in unique_items]
+    
+    return [
+        request["DeleteRequest"]["Key"] if delete else request["PutRequest"]["Item"]
+        for request in _batch_write_requests(client, table_name, requests)
+    ]
+
+
+def _put_items_bulk(items: Iterable[Dict[str, Any]], workers: Optional[int], on_written: Callable[[Dict[str, Any]], None], delete: bool = False,
+                    before_write: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+    """Stream items through parallel BatchWriteItem calls under the write controller.
+    
+    Batch size and effective concurrency follow the shared controller;
+    workers only caps the thread count. on_written is called (on this
+    thread) for every item that was stored, or removed when delete is set;
+    before_write is passed to _batch_write_chunk.
+    """
+    stats: Dict[str, Any] = {"written": 0, "failed": 0, "seconds": 0.0, "items_per_second": 0.0}
+    
+    client = create_dynamodb_client()
+    table = get_tickets_table()
+    if not client or not table:
+        return stats
+    
+    controller = get_write_controller()
+    workers = workers or controller.max_concurrency
+    started = time.monotonic()
+    in_flight: Dict[Any, List[Dict[str, Any]]] = {}
+    
+    def collect(futures: Iterable[Any]) -> None:
+        for future in futures:
+            batch = in_flight.pop(future)
+            try:
+                failed_ids = {item["id"] for item in future.result()}
+            except Exception as e:
+                print(f"Error writing batch of {len(batch)} items: {e}")
+                failed_ids = {item["id"] for item in batch}
+            
+            for item_id, item in {item["id"]: item for item in batch}.items():
+                if item_id not in failed_ids:
+                    on_written(item)
+            stats["written"] += len(batch) - len(failed_ids)
+            stats["failed"] += len(failed_ids)
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dynamodb-bulk") as executor:
+        for batch in _adaptive_chunks(items if delete else (encode_item(item) for item in items), controller):
+            # Bound the number of queued batches so large iterables stream through
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                collect(done)
+            
+            invalidate_tickets(item["id"] for item in batch)
+            future = executor.submit(_batch_write_chunk, client, table.name, batch, delete, before_write)
+            in_flight[future] = batch
+        
+        collect(list(in_flight))
+    
+    elapsed = time.monotonic() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["items_per_second"] = round(stats["written"] / elapsed, 1) if elapsed > 0 else 0.0
+    stats["controller"] = controller.snapshot()
+    return stats
+
+
+def put_items_bulk(items: Iterable[Dict[str, Any]], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Write already-built ticket items (for migrations and backfills).
+    
+    Unlike save_tickets_bulk, timestamps, versions and stats counters are
+    left untouched; only text compression follows TICKET_COMPRESSION.
+    """
+    stats = _put_items_bulk(items, workers, lambda item: None)
+    print(f"✅ Bulk wrote {stats['written']} items ({stats['failed']} failed) "
+          f"in {stats['seconds']}s - {stats['items_per_second']} items/s")
+    return stats
+
+
+def set_ticket_attributes(ticket_id: str, attributes: Dict[str, Any], expected: Optional[Dict[str, Any]] = None) -> bool:
+    """Set stored attributes of an existing ticket in place (for migrations).
+    
+    One conditional UpdateItem changes only the given attributes; version
+    and updated_at are left alone. The ticket must still exist and every
+    attribute in expected must still hold the given value (None meaning
+    absent), so a write that landed after the caller read the ticket is
+    never overwritten. Returns False when the condition failed.
+    """
+    table = get_tickets_table()
+    if not table:
+        raise RuntimeError("DynamoDB tickets table is not available")
+    
+    names = {"#id": "id"}
+    values: Dict[str, Any] = {}
+    set_clauses = []
+    for i, (name, value) in enumerate(attributes.items()):
+        names[f"#s{i}"] = name
+        values[f":s{i}"] = value
+        set_clauses.append(f"#s{i} = :s{i}")
+    
+    conditions = ["attribute_exists(#id)"]
+    for i, (name, value) in enumerate((expected or {}).items()):
+        names[f"#e{i}"] = name
+        if value is None:
+            conditions.append(f"attribute_not_exists(#e{i})")
+        else:
+            values[f":e{i}"] = value
+            conditions.append(f"#e{i} = :e{i}")
+    
+    try:
+        _controlled_write(
+            table.update_item,
+            Key={'id': ticket_id},
+            UpdateExpression=f"SET {', '.join(set_clauses)}",
+            ConditionExpression=" AND ".join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+    finally:
+        invalidate_ticket(ticket_id)
+
+
+def set_ticket_attributes_bulk(changes: Iterable[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]],
+                               workers: Optional[int] = None) -> Dict[str, Any]:
+    """Apply set_ticket_attributes to many (ticket_id, attributes, expected) changes in parallel.
+    
+    The iterable is consumed lazily under the shared write controller.
+    Returns how many tickets were updated, skipped (changed or deleted since
+    they were read; re-run to pick them up) and failed.
+    """
+    stats: Dict[str, Any] = {"updated": 0, "skipped": 0, "failed": 0, "seconds": 0.0}
+    controller = get_write_controller()
+    workers = workers or controller.max_concurrency
+    started = time.monotonic()
+    in_flight: Dict[Any, str] = {}
+    
+    def collect(futures: Iterable[Any]) -> None:
+        for future in futures:
+            ticket_id = in_flight.pop(future)
+            try:
+                stats["updated" if future.result() else "skipped"] += 1
+            except Exception as e:
+                print(f"Error updating ticket {ticket_id}: {e}")
+                stats["failed"] += 1
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dynamodb-migrate") as executor:
+        for ticket_id, attributes, expected in changes:
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight[executor.submit(set_ticket_attributes, ticket_id, attributes, expected)] = ticket_id
+        
+        collect(list(in_flight))
+    
+    stats["seconds"] = round(time.monotonic() - started, 3)
+    stats["controller"] = controller.snapshot()
+    return stats
+
+
+def delete_tickets_bulk(tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Delete many tickets with parallel BatchWriteItem calls.
+    
+    Takes full tickets rather than IDs so stats counters can be decremented
+    for every deleted ticket. No outbox events are recorded: deletes come
+    from archiving, and archived tickets stay searchable in Weaviate.
+    """
+    deltas: Counter = Counter()
+    stats = _put_items_bulk(
+        tickets,
+        workers,
+        lambda item: deltas.update(counter_deltas(item, None)),
+        delete=True
+    )
+    _apply_counter_deltas(dict(deltas))
+    
+    print(f"✅ Bulk deleted {stats['written']} tickets ({stats['failed']} failed) in {stats['seconds']}s")
+    return stats
+
+
+def save_tickets_bulk(tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Save many tickets with parallel BatchWriteItem calls.
+    
+    The iterable is consumed lazily, so at most a few batches per worker are
+    held in memory at once; batch size and concurrency adapt to throttling
+    through the shared write controller. Each batch's outbox events are
+    recorded before the batch is written. BatchWriteItem does not return
+    previous images, so stats counters treat every written ticket as new;
+    run rebuild_ticket_stats after reloading existing tickets.
+    """
+    deltas: Counter = Counter()
+    stats = _put_items_bulk(
+        (build_ticket_item(ticket) for ticket in tickets),
+        workers,
+        lambda item: deltas.update(ticket_counters(item)),
+        before_write=lambda items: record_ticket_changes({item["id"]: item["updated_at"] for item in items})
+    )
+    _apply_counter_deltas(dict(deltas))
+    
+    print(f"✅ Bulk saved {stats['written']} tickets ({stats['failed']} failed) "
+          f"in {stats['seconds']}s - {stats['items_per_second']} items/s")
+    return stats
+
+
+def get_ticket_by_id(ticket_id: str, use_cache: bool = True) -> Optional[Ticket]:
+    """Get single ticket by ID, served from the in-process cache when fresh.
+    
+    Tickets moved to the cold archive are looked up there on a table miss
+    and come back with "archived": True. Pass use_cache=False for
+    read-modify-write paths that must see the latest stored version.
+    """
+    use_cache = use_cache and cache_enabled()
+    if use_cache:
+        cached = get_ticket_cache().get(ticket_id)
+        if cached is not None:
+            return dict(cached)
+    
+    table = get_tickets_table()
     if not table:
         return None
     
     try:
         response = table.get_item(Key={'id': ticket_id})
         
-        if 'Item' not in response:
+        if 'Item' in response:
+            item = decode_item(response['Item'])
+        elif archive_enabled():
+            item = get_archived_ticket(ticket_id)
+        else:
+            item = None
+        
+        if item is None:
             print(f"Ticket {ticket_id} not found")
             return None
-            
-        return response['Item']
+        
+        if use_cache:
+            get_ticket_cache().set(ticket_id, dict(item))
+        return item
         
     except Exception as e:
         print(f"Error getting ticket {ticket_id}: {e}")
         return None
 
 
-def list_tickets_sorted_by_created_at(limit: int = 50, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
-    """List tickets sorted by created_at using GSI for efficient sorting across entire dataset."""
+def _batch_get_chunk(client: Any, table_name: str, ids: List[str], consistent_read: bool = False,
+                     raise_errors: bool = False) -> List[Ticket]:
+    """Fetch up to 100 tickets with BatchGetItem, retrying UnprocessedKeys.
+    
+    Keys still unprocessed after the retries are dropped with a warning,
+    or raise RuntimeError when raise_errors is set.
+    """
+    request_items: Dict[str, Any] = {
+        table_name: {"Keys": [{"id": ticket_id} for ticket_id in ids], "ConsistentRead": consistent_read}
+    }
+    items: List[Ticket] = []
+    
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = client.batch_get_item(RequestItems=request_items)
+        items.extend(decode_items(response.get("Responses", {}).get(table_name, [])))
+        request_items = response.get("UnprocessedKeys") or {}
+        if not request_items:
+            return items
+        if attempt < BATCH_MAX_RETRIES:
+            time.sleep(_backoff_delay(attempt))
+    
+    unprocessed = len(request_items[table_name]['Keys'])
+    if raise_errors:
+        raise RuntimeError(f"{unprocessed} keys still unprocessed after retries")
+    print(f"⚠️ {unprocessed} keys still unprocessed after retries")
+    return items
+
+
+def get_tickets_by_ids(ticket_ids: List[str], raise_errors: bool = False, consistent_read: bool = False) -> List[Ticket]:
+    """Get many tickets by ID with 100-key BatchGetItem calls.
+    
+    Results follow the order of ticket_ids; missing IDs are skipped and
+    duplicate IDs are fetched once. With raise_errors, a failed call or
+    keys left unprocessed raise instead of returning an empty or partial
+    list, so callers can tell "not found" from "could not read".
+    consistent_read asks for strongly consistent reads.
+    """
     client = create_dynamodb_client()
-    if not client:
-        return {"tickets": [], "next_page_token": None}
+    table = get_tickets_table()
+    if not client or not table:
+        if raise_errors:
+            raise RuntimeError("DynamoDB tickets table is not available")
+        return []
     
-    config = get_dynamodb_config()
-    if not config:
-        print("DynamoDB configuration not found")
-        return {"tickets": [], "next_page_token": None}
+    # BatchGetItem rejects duplicate keys within a request
+    unique_ids = list(dict.fromkeys(ticket_ids))
+    found: Dict[str, Ticket] = {}
+    
+    try:
+        for chunk in _chunked(unique_ids, BATCH_GET_MAX_KEYS):
+            for item in _batch_get_chunk(client, table.name, chunk, consistent_read, raise_errors):
+                found[item["id"]] = item
+    except Exception as e:
+        print(f"Error getting tickets {unique_ids[:5]}...: {e}")
+        if raise_errors:
+            raise
+        return []
+    
+    print(f"✅ Found {len(found)}/{len(unique_ids)} requested tickets")
+    return [found[ticket_id] for ticket_id in unique_ids if ticket_id in found]
+
+
+def _is_shard_cursor(page_token: Optional[Dict]) -> bool:
+    """Whether a page token is a composite cursor over several index shards."""
+    return bool(page_token) and "shards" in page_token
+
+
+def _query_index_shards(table: Any, query_params: Dict[str, Any], limit: int, page_token: Optional[Dict], ascending: bool) -> Dict[str, Any]:
+    """Query every entity_type shard concurrently and k-way merge by created_at.
+    
+    The returned cursor records, per shard, the key of the last item handed
+    out (or the shard's own LastEvaluatedKey); exhausted shards are dropped
+    from it. Items read beyond the page are simply re-read next time.
+    """
+    if page_token:
+        positions: Dict[str, Optional[Dict]] = dict(page_token["shards"])
+    else:
+        positions = {shard: None for shard in index_read_keys()}
+    
+    def query_shard(shard: str) -> Any:
+        params = {**query_params, "KeyConditionExpression": Key('entity_type').eq(shard)}
+        if positions[shard]:
+            params["ExclusiveStartKey"] = positions[shard]
+        response = table.query(**params)
+        return shard, decode_items(response.get('Items', [])), response.get('LastEvaluatedKey')
+    
+    results = list(_get_fanout_executor().map(query_shard, list(positions)))
+    
+    merged = heapq.merge(
+        *[[(item.get('created_at', ''), shard, item) for item in items] for shard, items, _ in results],
+        key=lambda entry: entry[0],
+        reverse=not ascending
+    )
     
-    table = get_table(client, config["table_name"])
+    tickets: List[Ticket] = []
+    consumed: Dict[str, List[Ticket]] = {shard: [] for shard, _, _ in results}
+    for _, shard, item in merged:
+        if len(tickets) >= limit:
+            break
+        tickets.append(item)
+        consumed[shard].append(item)
+    
+    for shard, items, last_key in results:
+        taken = consumed[shard]
+        if len(taken) == len(items):
+            if last_key:
+                positions[shard] = last_key
+            else:
+                del positions[shard]
+        elif taken:
+            positions[shard] = {field: taken[-1][field] for field in INDEX_CURSOR_FIELDS}
+    
+    return {
+        "tickets": tickets,
+        "next_page_token": {"shards": positions} if positions else None
+    }
+
+
+def list_tickets_sorted_by_created_at(limit: int = 50, page_token: Optional[Dict] = None, ascending: bool = False, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """List tickets sorted by created_at using GSI for efficient sorting across entire dataset.
+    
+    When fields is given only those attributes are returned. Field sets
+    covered by TICKET_SUMMARY_FIELDS are read from the narrow summary index,
+    so listing pages do not pay read capacity for solution text. With more
+    than one index shard every shard is queried and the results merged.
+    """
+    table = get_tickets_table()
     if not table:
         return {"tickets": [], "next_page_token": None}
     
+    index_name = CREATED_AT_INDEX_NAME
+    if fields and set(fields) <= set(TICKET_SUMMARY_FIELDS) | {"entity_type"}:
+        index_name = SUMMARY_INDEX_NAME
+    
+    shard_keys = index_shard_keys()
+    projection = fields
+    cursor_only: List[str] = []
+    if fields and len(shard_keys) > 1:
+        # Shard cursors are rebuilt from the index keys of returned items,
+        # which are dropped again from the page unless they were asked for
+        cursor_only = [field for field in INDEX_CURSOR_FIELDS if field not in fields]
+        projection = list(fields) + cursor_only
+    
     try:
         # Build query parameters for GSI
         query_params: Dict[str, Any] = {
-            "IndexName": "CreatedAtIndex",
-            "KeyConditionExpression": Key('entity_type').eq('TICKET'),
+            "IndexName": index_name,
             "Limit": limit,
-            "ScanIndexForward": ascending  # False = descending (most recent first)
+            "ScanIndexForward": ascending,  # False = descending (most recent first)
+            **_projection_params(projection)
         }
         
-        if page_token:
-            query_params["ExclusiveStartKey"] = page_token
+        def run_query() -> Dict[str, Any]:
+            if len(shard_keys) > 1 or _is_shard_cursor(page_token):
+                return _query_index_shards(table, query_params, limit, page_token, ascending)
+            
+            params = {**query_params, "KeyConditionExpression": Key('entity_type').eq(shard_keys[0])}
+            if page_token:
+                params["ExclusiveStartKey"] = page_token
+            response = table.query(**params)
+            return {
+                "tickets": decode_items(response.get('Items', [])),
+                "next_page_token": response.get('LastEvaluatedKey')
+            }
         
-        response = table.query(**query_params)
+        try:
+            result = run_query()
+        except ClientError as e:
+            if index_name != SUMMARY_INDEX_NAME:
+                raise
+            # Summary index missing or still backfilling; both indexes share key shapes
+            print(f"⚠️ {SUMMARY_INDEX_NAME} unavailable ({e.response['Error']['Code']}), using {CREATED_AT_INDEX_NAME}")
+            query_params["IndexName"] = index_name = CREATED_AT_INDEX_NAME
+            result = run_query()
         
-        tickets = response.get('Items', [])
-        next_page_token = response.get('LastEvaluatedKey')
+        for ticket in result["tickets"]:
+            for field in cursor_only:
+                ticket.pop(field, None)
         
         sort_order = "oldest first" if ascending else "most recent first"
-        print(f"✅ Found {len(tickets)} tickets on this page (sorted by {sort_order} using GSI)")
+        print(f"✅ Found {len(result['tickets'])} tickets on this page (sorted by {sort_order} "
+              f"using {index_name} across {len(shard_keys)} shard(s))")
         
-        return {
-            "tickets": tickets,
-            "next_page_token": next_page_token
-        }
+        return result
         
     except Exception as e:
         print(f"Error querying tickets with GSI: {e}")
         print("🔄 Falling back to scan method...")
-        return list_tickets_fallback(limit, page_token)
+        # A shard cursor cannot resume a scan, so restart from the beginning
+        return list_tickets_fallback(limit, None if _is_shard_cursor(page_token) else page_token, fields)
 
 
-def list_tickets_fallback(limit: int = 50, page_token: Optional[Dict] = None) -> Dict[str, Any]:
+def list_tickets_fallback(limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Fallback method using scan when GSI is not available."""
-    client = create_dynamodb_client()
-    if not client:
-        return {"tickets": [], "next_page_token": None}
-    
-    config = get_dynamodb_config()
-    if not config:
-        print("DynamoDB configuration not found")
-        return {"tickets": [], "next_page_token": None}
-    
-    table = get_table(client, config["table_name"])
+    table = get_tickets_table()
     if not table:
         return {"tickets": [], "next_page_token": None}
     
     try:
         # Build scan parameters
-        scan_params: Dict[str, Any] = {"Limit": limit}
+        scan_params: Dict[str, Any] = {"Limit": limit, **_projection_params(fields)}
         if page_token:
             scan_params["ExclusiveStartKey"] = page_token
         
         response = table.scan(**scan_params)
         
-        tickets = response.get('Items', [])
+        tickets = decode_items(response.get('Items', []))
         next_page_token = response.get('LastEvaluatedKey')
         
         # Sort tickets by created_at (most recent first - descending order)
@@ -212,44 +926,660 @@ def list_tickets_fallback(limit: int = 50, page_token: Optional[Dict] = None) ->
         return {"tickets": [], "next_page_token": None}
 
 
-def list_tickets(limit: int = 50, page_token: Optional[Dict] = None) -> Dict[str, Any]:
-    """List tickets with pagination support, sorted by created_at (most recent first)."""
+def _projection_params(projection: Optional[List[str]]) -> Dict[str, Any]:
+    """Build ProjectionExpression parameters, aliasing names to dodge reserved words."""
+    if not projection:
+        return {}
+    
+    names = {f"#p{i}": attribute for i, attribute in enumerate(projection)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def iter_all_tickets(segments: int = 4, projection: Optional[List[str]] = None, page_size: Optional[int] = None, decode: bool = True) -> Iterator[Ticket]:
+    """Stream every ticket using a parallel scan, yielding items as pages arrive.
+    
+    Each scan segment runs on its own thread and hands pages to the caller
+    through a bounded queue, so memory stays proportional to the number of
+    segments rather than the table size. Scan errors are re-raised in the
+    caller so jobs never mistake a partial read for a complete one. Pass
+    decode=False to get items exactly as stored (compressed text left as-is).
+    """
+    table = get_tickets_table()
+    if not table:
+        return
+    
+    scan_params: Dict[str, Any] = _projection_params(projection)
+    if page_size:
+        scan_params["Limit"] = page_size
+    
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=segments * 2)
+    stop = threading.Event()
+    segment_done = object()
+    
+    def put(value: Any) -> None:
+        # Give up once the consumer has stopped iterating
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def scan_segment(segment: int) -> None:
+        params = {**scan_params, "Segment": segment, "TotalSegments": segments}
+        try:
+            while not stop.is_set():
+                response = table.scan(**params)
+                items = response.get('Items', [])
+                put(decode_items(items) if decode else items)
+                
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                params["ExclusiveStartKey"] = last_key
+        except Exception as e:
+            put(e)
+        finally:
+            put(segment_done)
+    
+    executor = ThreadPoolExecutor(max_workers=segments, thread_name_prefix="dynamodb-scan")
+    for segment in range(segments):
+        executor.submit(scan_segment, segment)
+    
+    try:
+        remaining = segments
+        while remaining:
+            page = pages.get()
+            if page is segment_done:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+
+
+def iter_tickets_created_before(cutoff: str, page_size: int = 500) -> Iterator[Ticket]:
+    """Stream tickets created before cutoff (ISO timestamp), oldest first per shard.
+    
+    Reads each CreatedAtIndex shard with a key condition on created_at, so
+    the cost is proportional to the matching tickets rather than the table.
+    Shards are read one after another; callers needing global order should
+    sort themselves.
+    """
+    table = get_tickets_table()
+    if not table:
+        return
+    
+    for shard in index_read_keys():
+        params: Dict[str, Any] = {
+            "IndexName": CREATED_AT_INDEX_NAME,
+            "KeyConditionExpression": Key('entity_type').eq(shard) & Key('created_at').lt(cutoff),
+            "ScanIndexForward": True,
+            "Limit": page_size
+        }
+        while True:
+            response = table.query(**params)
+            yield from decode_items(response.get('Items', []))
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            params["ExclusiveStartKey"] = last_key
+
+
+def list_tickets(limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """List tickets with pagination support, sorted by created_at (most recent first).
+    
+    The first page is the hottest read on the dashboard, so it is cached
+    briefly per page size and field set; later pages always go to DynamoDB.
+    """
+    cache_key = (limit, tuple(fields) if fields else None)
+    use_cache = page_token is None and cache_enabled()
+    if use_cache:
+        cached = get_list_cache().get(cache_key)
+        if cached is not None:
+            return {
+                "tickets": [dict(ticket) for ticket in cached["tickets"]],
+                "next_page_token": cached["next_page_token"]
+            }
+    
     # Try GSI method first, fallback to scan if needed
-    return list_tickets_sorted_by_created_at(limit, page_token, ascending=False)
+    result = list_tickets_sorted_by_created_at(limit, page_token, ascending=False, fields=fields)
+    
+    if use_cache and result["tickets"]:
+        get_list_cache().set(cache_key, {
+            "tickets": [dict(ticket) for ticket in result["tickets"]],
+            "next_page_token": result["next_page_token"]
+        })
+    return result
+
+
+def query_tickets_by_category(category: str, limit: int = 20, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
+    """Query tickets in a category sorted by created_at using the category GSI."""
+    table = get_tickets_table()
+    if not table:
+        return {"tickets": [], "next_page_token": None}
+    
+    try:
+        query_params: Dict[str, Any] = {
+            "IndexName": CATEGORY_INDEX_NAME,
+            "KeyConditionExpression": Key('category').eq(category),
+            "Limit": limit,
+            "ScanIndexForward": ascending  # False = descending (most recent first)
+        }
+        
+        if page_token:
+            query_params["ExclusiveStartKey"] = page_token
+        
+        response = table.query(**query_params)
+        
+        tickets = decode_items(response.get('Items', []))
+        next_page_token = response.get('LastEvaluatedKey')
+        
+        print(f"✅ Found {len(tickets)} tickets in category {category} (using {CATEGORY_INDEX_NAME})")
+        return {
+            "tickets": tickets,
+            "next_page_token": next_page_token
+        }
+        
+    except Exception as e:
+        print(f"Error querying tickets by category {category} with GSI: {e}")
+        print("🔄 Falling back to scan method...")
+        return query_tickets_by_category_fallback(category, limit, page_token)
+
+
+def query_tickets_by_category_fallback(category: str, limit: int = 20, page_token: Optional[Dict] = None) -> Dict[str, Any]:
+    """Fallback method using a filtered scan when the category GSI is not available."""
+    table = get_tickets_table()
+    if not table:
+        return {"tickets": [], "next_page_token": None}
+    
+    try:
+        tickets: List[Ticket] = []
+        next_page_token = page_token
+        
+        # Scan Limit applies before the filter, so keep reading until the page is full
+        while True:
+            scan_params: Dict[str, Any] = {
+                "FilterExpression": Attr('category').eq(category),
+                "Limit": limit - len(tickets)
+            }
+            if next_page_token:
+                scan_params["ExclusiveStartKey"] = next_page_token
+            
+            response = table.scan(**scan_params)
+            tickets.extend(decode_items(response.get('Items', [])))
+            next_page_token = response.get('LastEvaluatedKey')
+            
+            if not next_page_token or len(tickets) >= limit:
+                break
+        
+        tickets.sort(key=lambda ticket: ticket.get('created_at', ''), reverse=True)
+        
+        print(f"✅ Found {len(tickets)} tickets in category {category} (fallback method)")
+        return {
+            "tickets": tickets,
+            "next_page_token": next_page_token
+        }
+        
+    except Exception as e:
+        print(f"Error querying tickets by category {category}: {e}")
+        return {"tickets": [], "next_page_token": None}
 
 
-def query_tickets_by_category(category: str, limit: int = 20) -> List[Ticket]:
-    """Query tickets by category."""
+def get_stats_table() -> Optional[Any]:
+    """Get the shared handle for the ticket stats counters table."""
     client = create_dynamodb_client()
     if not client:
-        return []
+        return None
     
     config = get_dynamodb_config()
     if not config:
         print("DynamoDB configuration not found")
+        return None
+    
+    return get_table(client, config["stats_table_name"])
+
+
+def ticket_counters(item: Optional[Dict[str, Any]]) -> List[str]:
+    """Names of the stats counters a stored ticket contributes to."""
+    if not item:
         return []
     
-    table = get_table(client, config["table_name"])
+    counters = [
+        "total",
+        f"category#{item.get('category') or 'Unknown'}",
+        f"status#{item.get('status') or 'open'}",
+    ]
+    if item.get('created_at'):
+        counters.append(f"day#{item['created_at'][:10]}")
+    return counters
+
+
+def counter_deltas(old_item: Optional[Dict[str, Any]], new_item: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Counter changes caused by replacing old_item with new_item."""
+    deltas: Counter = Counter(ticket_counters(new_item))
+    deltas.subtract(ticket_counters(old_item))
+    return {counter: delta for counter, delta in deltas.items() if delta}
+
+
+def _apply_counter_deltas(deltas: Dict[str, int]) -> None:
+    """Atomically ADD each delta to its counter item.
+    
+    Counter failures are logged rather than raised so they never fail the
+    ticket write itself; rebuild_ticket_stats repairs any drift.
+    """
+    if not deltas:
+        return
+    
+    table = get_stats_table()
     if not table:
-        return []
+        return
     
-    try:
-        response = table.scan(
-            FilterExpression=Attr('category').eq(category),
-            Limit=limit
+    def add(counter_delta: Any) -> None:
+        counter, delta = counter_delta
+        table.update_item(
+            Key={'counter': counter},
+            UpdateExpression="ADD #count :delta",
+            ExpressionAttributeNames={"#count": "count"},
+            ExpressionAttributeValues={":delta": delta}
         )
+    
+    try:
+        list(_get_fanout_executor().map(add, deltas.items()))
+    except Exception as e:
+        print(f"⚠️ Error updating ticket stats counters {list(deltas)}: {e}")
+
+
+def stats_from_counters(counters: Dict[str, int]) -> Dict[str, Any]:
+    """Group raw counter values into the stats response shape."""
+    stats: Dict[str, Any] = {"total": 0, "by_category": {}, "by_status": {}, "by_day": {}}
+    groups = {"category": "by_category", "status": "by_status", "day": "by_day"}
+    
+    for counter, count in counters.items():
+        group, _, name = counter.partition('#')
+        if counter == "total":
+            stats["total"] = count
+        elif group in groups and count:
+            stats[groups[group]][name] = count
+    
+    stats["by_day"] = dict(sorted(stats["by_day"].items()))
+    return stats
+
+
+def get_ticket_stats() -> Dict[str, Any]:
+    """Read ticket counts by category, status and creation day.
+    
+    The stats table holds one item per counter, so this costs the same
+    handful of reads however many tickets exist.
+    """
+    table = get_stats_table()
+    if not table:
+        return stats_from_counters({})
+    
+    counters: Dict[str, int] = {}
+    try:
+        scan_params: Dict[str, Any] = {}
+        while True:
+            response = table.scan(**scan_params)
+            for item in response.get('Items', []):
+                counters[item['counter']] = int(item.get('count', 0))
+            
+            if not response.get('LastEvaluatedKey'):
+                break
+            scan_params["ExclusiveStartKey"] = response['LastEvaluatedKey']
         
-        tickets = response.get('Items', [])
-        print(f"✅ Found {len(tickets)} tickets in category {category}")
-        return tickets
+        return stats_from_counters(counters)
         
     except Exception as e:
-        print(f"Error querying tickets by category {category}: {e}")
+        print(f"Error reading ticket stats: {e}")
+        return stats_from_counters({})
+
+
+def rebuild_ticket_stats(segments: int = 4) -> Dict[str, Any]:
+    """Recompute every counter from a full table scan and overwrite the stats table.
+    
+    Intended for maintenance after bulk reloads or counter drift; writes
+    landing during the rebuild may be counted twice or missed.
+    """
+    table = get_stats_table()
+    if not table:
+        return get_ticket_stats()
+    
+    counts: Counter = Counter()
+    for item in iter_all_tickets(segments=segments, projection=["category", "status", "created_at"]):
+        counts.update(ticket_counters(item))
+    
+    existing = []
+    scan_params: Dict[str, Any] = {"ProjectionExpression": "#counter", "ExpressionAttributeNames": {"#counter": "counter"}}
+    while True:
+        response = table.scan(**scan_params)
+        existing.extend(item['counter'] for item in response.get('Items', []))
+        if not response.get('LastEvaluatedKey'):
+            break
+        scan_params["ExclusiveStartKey"] = response['LastEvaluatedKey']
+    
+    with table.batch_writer() as batch_writer:
+        for counter in existing:
+            if counter not in counts:
+                batch_writer.delete_item(Key={'counter': counter})
+        for counter, count in counts.items():
+            batch_writer.put_item(Item={'counter': counter, 'count': count})
+    
+    print(f"✅ Rebuilt {len(counts)} ticket stats counters")
+    return get_ticket_stats()
+
+
+def _create_stats_table_if_not_exists(client: Any, table_name: str) -> bool:
+    """Create the stats counters table (one item per counter) if it doesn't exist."""
+    try:
+        table = client.Table(table_name)
+        table.load()
+        _tables[table_name] = table
+        return True
+        
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ResourceNotFoundException':
+            print(f"Error checking table {table_name}: {e}")
+            return False
+    
+    try:
+        print(f"📁 Creating stats table {table_name}...")
+        table = client.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': 'counter', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'counter', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.wait_until_exists()
+        table.load()
+        _tables[table_name] = table
+        print(f"✅ Stats table {table_name} created successfully")
+        return True
+        
+    except Exception as e:
+        print(f"Error creating table {table_name}: {e}")
+        return False
+
+
+def outbox_enabled() -> bool:
+    """Whether ticket writes record change events in the outbox."""
+    return get_settings().ticket_outbox_enabled
+
+
+def get_outbox_table() -> Optional[Any]:
+    """Get the shared handle for the change outbox table."""
+    client = create_dynamodb_client()
+    if not client:
+        return None
+    
+    config = get_dynamodb_config()
+    if not config:
+        print("DynamoDB configuration not found")
+        return None
+    
+    return get_table(client, config["outbox_table_name"])
+
+
+def outbox_position(timestamp: datetime) -> str:
+    """Outbox sort key prefix for a point in time; events after it sort higher."""
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def outbox_partitions() -> List[str]:
+    """All outbox event partitions, one per ticket index shard."""
+    return [OUTBOX_PARTITION + shard_key[len("TICKET"):] for shard_key in index_shard_keys()]
+
+
+def record_ticket_changes(changes: Dict[str, str]) -> None:
+    """Append change events to the outbox (no-op when disabled).
+    
+    changes maps each ticket ID to the updated_at its upcoming write sets.
+    Called before the ticket write itself, so a ticket write without an
+    event cannot happen; consumers therefore only apply an event once the
+    stored ticket's updated_at has reached the event's, and skip events
+    whose write never landed. Events go to the ticket's outbox shard, so
+    the extra write is spread like the ticket indexes. Raises if the
+    events could not be stored.
+    """
+    if not outbox_enabled() or not changes:
+        return
+    
+    table = get_outbox_table()
+    if not table:
+        raise RuntimeError("Change outbox table is not available")
+    
+    now = datetime.utcnow()
+    expires_at = int(time.time()) + OUTBOX_RETENTION_DAYS * 24 * 3600
+    events = [
+        {
+            "pk": index_shard_for(ticket_id, OUTBOX_PARTITION),
+            "sk": f"{outbox_position(now)}#{uuid.uuid4().hex}",
+            "ticket_id": ticket_id,
+            "updated_at": updated_at,
+            "created_at": now.isoformat(),
+            "expires_at": expires_at  # DynamoDB TTL attribute
+        }
+        for ticket_id, updated_at in changes.items()
+    ]
+    
+    if len(events) == 1:
+        _controlled_write(table.put_item, Item=events[0])
+        return
+    
+    client = create_dynamodb_client()
+    for chunk in _chunked(events, BATCH_WRITE_MAX_ITEMS):
+        failed = _batch_write_requests(client, table.name, [{"PutRequest": {"Item": event}} for event in chunk])
+        if failed:
+            raise RuntimeError(f"{len(failed)} outbox events could not be written")
+
+
+def read_outbox_events(after: str, limit: int = 100) -> List[Dict[str, Any]]:
+    """Outbox events with a sort key greater than `after`, oldest first.
+    
+    Every outbox partition is queried in parallel and the pages merged by
+    sort key. Changing TICKET_INDEX_SHARDS moves new events to other
+    partitions, so let consumers catch up before resharding.
+    """
+    table = get_outbox_table()
+    if not table:
         return []
+    
+    def query_partition(partition: str) -> List[Dict[str, Any]]:
+        condition = Key('pk').eq(partition)
+        if after:
+            # DynamoDB rejects an empty string in a key condition; "" means from the start
+            condition = condition & Key('sk').gt(after)
+        response = table.query(
+            KeyConditionExpression=condition,
+            ScanIndexForward=True,
+            Limit=limit,
+            ConsistentRead=True
+        )
+        return response.get('Items', [])
+    
+    partitions = outbox_partitions()
+    if len(partitions) == 1:
+        return query_partition(partitions[0])
+    
+    # Each partition's first `limit` events include all of its events among the merged first `limit`
+    pages = _get_fanout_executor().map(query_partition, partitions)
+    return heapq.nsmallest(limit, (event for page in pages for event in page), key=lambda event: event["sk"])
+
+
+def get_outbox_checkpoint(consumer: str) -> str:
+    """Sort key of the last event a consumer applied ("" if it never ran)."""
+    table = get_outbox_table()
+    if not table:
+        return ""
+    
+    response = table.get_item(Key={"pk": OUTBOX_CHECKPOINT_PARTITION, "sk": consumer}, ConsistentRead=True)
+    return response.get('Item', {}).get("position", "")
+
+
+def save_outbox_checkpoint(consumer: str, position: str) -> None:
+    """Store the sort key of the last event a consumer applied."""
+    table = get_outbox_table()
+    if not table:
+        raise RuntimeError("Change outbox table is not available")
+    
+    table.put_item(Item={
+        "pk": OUTBOX_CHECKPOINT_PARTITION,
+        "sk": consumer,
+        "position": position,
+        "updated_at": datetime.utcnow().isoformat()
+    })
+
+
+def _create_outbox_table_if_not_exists(client: Any, table_name: str) -> bool:
+    """Create the change outbox table, with TTL on expires_at, if it doesn't exist."""
+    try:
+        table = client.Table(table_name)
+        table.load()
+        _tables[table_name] = table
+        return True
+        
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ResourceNotFoundException':
+            print(f"Error checking table {table_name}: {e}")
+            return False
+    
+    try:
+        print(f"📁 Creating outbox table {table_name}...")
+        table = client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {'AttributeName': 'pk', 'KeyType': 'HASH'},
+                {'AttributeName': 'sk', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.wait_until_exists()
+        client.meta.client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'}
+        )
+        table.load()
+        _tables[table_name] = table
+        print(f"✅ Outbox table {table_name} created successfully")
+        return True
+        
+    except Exception as e:
+        print(f"Error creating table {table_name}: {e}")
+        return False
+
+
+def _create_auxiliary_tables(client: Any, config: Dict[str, str]) -> bool:
+    """Create the stats table, and the outbox table when the outbox is enabled."""
+    if not _create_stats_table_if_not_exists(client, config["stats_table_name"]):
+        return False
+    if outbox_enabled():
+        return _create_outbox_table_if_not_exists(client, config["outbox_table_name"])
+    return True
+
+
+def _gsi_definition(index_name: str, hash_key: str, range_key: str, include: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build a GSI definition keyed on hash_key/range_key.
+    
+    All attributes are projected unless include names the non-key
+    attributes to copy into the index.
+    """
+    projection: Dict[str, Any] = {'ProjectionType': 'ALL'}  # Include all attributes
+    if include is not None:
+        projection = {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': include}
+    
+    return {
+        'IndexName': index_name,
+        'KeySchema': [
+            {
+                'AttributeName': hash_key,
+                'KeyType': 'HASH'
+            },
+            {
+                'AttributeName': range_key,
+                'KeyType': 'RANGE'
+            }
+        ],
+        'Projection': projection
+    }
+
+
+def _ticket_index_definitions() -> List[Dict[str, Any]]:
+    """GSIs maintained on the tickets table."""
+    return [
+        # entity_type is "TICKET" (or one of its shards); created_at gives the sort order
+        _gsi_definition(CREATED_AT_INDEX_NAME, 'entity_type', 'created_at'),
+        _gsi_definition(CATEGORY_INDEX_NAME, 'category', 'created_at'),
+        # Narrow copy of CreatedAtIndex for list pages that skip solution text
+        _gsi_definition(
+            SUMMARY_INDEX_NAME, 'entity_type', 'created_at',
+            include=[field for field in TICKET_SUMMARY_FIELDS if field not in ('id', 'entity_type', 'created_at')]
+        ),
+    ]
+
+
+_TICKET_ATTRIBUTE_DEFINITIONS = [
+    {
+        'AttributeName': 'id',
+        'AttributeType': 'S'
+    },
+    {
+        'AttributeName': 'entity_type',
+        'AttributeType': 'S'
+    },
+    {
+        'AttributeName': 'category',
+        'AttributeType': 'S'
+    },
+    {
+        'AttributeName': 'created_at',
+        'AttributeType': 'S'
+    }
+]
+
+
+def _add_missing_indexes(client: Any, table: Any) -> None:
+    """Create any ticket GSI missing from an existing table."""
+    existing = {gsi['IndexName'] for gsi in table.global_secondary_indexes or []}
+    
+    for index in _ticket_index_definitions():
+        index_name = index['IndexName']
+        if index_name in existing:
+            print(f"✅ GSI '{index_name}' already exists")
+            continue
+        
+        print(f"📝 GSI '{index_name}' not found on existing table, adding it...")
+        key_names = {key['AttributeName'] for key in index['KeySchema']}
+        try:
+            # DynamoDB accepts a single GSI creation per UpdateTable call
+            client.meta.client.update_table(
+                TableName=table.name,
+                AttributeDefinitions=[
+                    attribute for attribute in _TICKET_ATTRIBUTE_DEFINITIONS
+                    if attribute['AttributeName'] in key_names
+                ],
+                GlobalSecondaryIndexUpdates=[{'Create': index}]
+            )
+            print(f"⏳ GSI '{index_name}' is being created; queries fall back to scans until it is ACTIVE")
+            return
+        except ClientError as e:
+            print(f"⚠️ Could not add GSI '{index_name}': {e}")
+            print("💡 Consider recreating the table or adding GSI manually")
+            return
 
 
 def create_table_if_not_exists() -> bool:
-    """Create tickets table with GSI for sorting by created_at if it doesn't exist."""
+    """Create tickets table with its GSIs if it doesn't exist."""
     client = create_dynamodb_client()
     if not client:
         return False
@@ -267,26 +1597,16 @@ def create_table_if_not_exists() -> bool:
         table.load()
         print(f"✅ Table {table_name} already exists")
         
-        # Check if GSI exists
-        gsi_exists = False
-        for gsi in table.global_secondary_indexes or []:
-            if gsi['IndexName'] == 'CreatedAtIndex':
-                gsi_exists = True
-                break
+        _add_missing_indexes(client, table)
         
-        if not gsi_exists:
-            print("⚠️ GSI 'CreatedAtIndex' not found on existing table")
-            print("💡 Consider recreating the table or adding GSI manually")
-        else:
-            print("✅ GSI 'CreatedAtIndex' already exists")
-            
-        return True
+        _tables[table_name] = table
+        return _create_auxiliary_tables(client, config)
         
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             # Table doesn't exist, create it
             try:
-                print(f"📁 Creating table {table_name} with CreatedAtIndex GSI...")
+                print(f"📁 Creating table {table_name} with {CREATED_AT_INDEX_NAME}, {CATEGORY_INDEX_NAME} and {SUMMARY_INDEX_NAME} GSIs...")
                 
                 table = client.create_table(
                     TableName=table_name,
@@ -296,45 +1616,17 @@ def create_table_if_not_exists() -> bool:
                             'KeyType': 'HASH'  # Partition key
                         }
                     ],
-                    AttributeDefinitions=[
-                        {
-                            'AttributeName': 'id',
-                            'AttributeType': 'S'
-                        },
-                        {
-                            'AttributeName': 'entity_type',
-                            'AttributeType': 'S'
-                        },
-                        {
-                            'AttributeName': 'created_at',
-                            'AttributeType': 'S'
-                        }
-                    ],
-                    GlobalSecondaryIndexes=[
-                        {
-                            'IndexName': 'CreatedAtIndex',
-                            'KeySchema': [
-                                {
-                                    'AttributeName': 'entity_type',
-                                    'KeyType': 'HASH'  # Partition key (always "TICKET")
-                                },
-                                {
-                                    'AttributeName': 'created_at',
-                                    'KeyType': 'RANGE'  # Sort key
-                                }
-                            ],
-                            'Projection': {
-                                'ProjectionType': 'ALL'  # Include all attributes
-                            }
-                        }
-                    ],
+                    AttributeDefinitions=_TICKET_ATTRIBUTE_DEFINITIONS,
+                    GlobalSecondaryIndexes=_ticket_index_definitions(),
                     BillingMode='PAY_PER_REQUEST'  # On-demand pricing
                 )
                 
                 # Wait for table to be created
                 table.wait_until_exists()
-                print(f"✅ Table {table_name} created successfully with CreatedAtIndex GSI")
-                return True
+                table.load()
+                _tables[table_name] = table
+                print(f"✅ Table {table_name} created successfully with GSIs")
+                return _create_auxiliary_tables(client, config)
                 
             except Exception as create_error:
                 print(f"Error creating table {table_name}: {create_error}")
@@ -350,11 +1642,35 @@ def create_table_if_not_exists() -> bool:
 # Public API
 dynamodb_client_api = {
     "create_dynamodb_client": create_dynamodb_client,
+    "index_shard_keys": index_shard_keys,
+    "index_shard_for": index_shard_for,
+    "index_read_keys": index_read_keys,
+    "get_tickets_table": get_tickets_table,
+    "reset_dynamodb_client": reset_dynamodb_client,
     "save_ticket": save_ticket,
+    "save_tickets_bulk": save_tickets_bulk,
+    "put_items_bulk": put_items_bulk,
+    "set_ticket_attributes": set_ticket_attributes,
+    "set_ticket_attributes_bulk": set_ticket_attributes_bulk,
+    "delete_tickets_bulk": delete_tickets_bulk,
+    "iter_tickets_created_before": iter_tickets_created_before,
+    "outbox_enabled": outbox_enabled,
+    "outbox_partitions": outbox_partitions,
+    "record_ticket_changes": record_ticket_changes,
+    "read_outbox_events": read_outbox_events,
+    "get_outbox_checkpoint": get_outbox_checkpoint,
+    "save_outbox_checkpoint": save_outbox_checkpoint,
+    "update_ticket_fields": update_ticket_fields,
     "get_ticket_by_id": get_ticket_by_id,
+    "get_tickets_by_ids": get_tickets_by_ids,
     "list_tickets": list_tickets,
     "list_tickets_sorted_by_created_at": list_tickets_sorted_by_created_at,
     "list_tickets_fallback": list_tickets_fallback,
+    "iter_all_tickets": iter_all_tickets,
     "query_tickets_by_category": query_tickets_by_category,
+    "query_tickets_by_category_fallback": query_tickets_by_category_fallback,
+    "get_ticket_stats": get_ticket_stats,
+    "stats_from_counters": stats_from_counters,
+    "rebuild_ticket_stats": rebuild_ticket_stats,
     "create_table_if_not_exists": create_table_if_not_exists,
 } 
\ No newline at end of file
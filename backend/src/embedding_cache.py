@@ -0,0 +1,357 @@
+"""Batched OpenAI embeddings with a persistent, content-addressed SQLite cache."""
+
+import os
+import time
+import array
+import sqlite3
+import hashlib
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from openai import OpenAI
+from .config import get_settings, get_openai_config
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Embeddings API limits: inputs per request, and tokens per input for the ada/3 models
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_INPUT = 8191
+
+# Without tiktoken, inputs are cut at this many characters per allowed token:
+# below the ~4 of English text, so the estimate errs on the short side
+FALLBACK_CHARS_PER_TOKEN = 3
+
+# Cache hits refresh last_used in batches: after this many hits or seconds
+TOUCH_FLUSH_SIZE = 1000
+TOUCH_FLUSH_SECONDS = 30.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> Optional[Any]:
+    """tiktoken encoding of an embedding model (None without tiktoken)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_for_embedding(text: str, model: str, max_tokens: int = MAX_TOKENS_PER_INPUT) -> str:
+    """Cut text to the model's input limit, which the API would otherwise reject.
+    
+    Counts tokens exactly with tiktoken (pip install '.[embeddings]');
+    without it, keeps max_tokens * FALLBACK_CHARS_PER_TOKEN characters.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max_tokens * FALLBACK_CHARS_PER_TOKEN]
+    
+    tokens = encoding.encode(text, disallowed_special=())
+    return encoding.decode(tokens[:max_tokens]) if len(tokens) > max_tokens else text
+
+
+def cache_key(model: str, text: str) -> str:
+    """Cache key of an embedding: sha256 of the model and the exact text."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Embedding vectors in SQLite keyed by cache_key, evicted least recently used first.
+    
+    Vectors are stored as packed float32 blobs. Every hit refreshes the
+    entry's last-used time; the refreshes are buffered and written in one
+    transaction every TOUCH_FLUSH_SIZE hits or TOUCH_FLUSH_SECONDS, so
+    lookups stay read-only. Once more than max_entries are stored, the
+    least recently used entries are deleted.
+    """
+    
+    def __init__(self, path: str, max_entries: int = 100000):
+        """Open (or create) the cache database."""
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._db.commit()
+        
+        # key -> last-used time of hits not yet written
+        self._touched: Dict[str, float] = {}
+        self._touched_since = time.monotonic()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def _flush_touches(self) -> None:
+        """Write buffered last-used times (call with the lock held)."""
+        if self._touched:
+            self._db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                 [(last_used, key) for key, last_used in self._touched.items()])
+            self._db.commit()
+            self._touched.clear()
+        self._touched_since = time.monotonic()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the keys that are present."""
+        found: Dict[str, List[float]] = {}
+        if not keys:
+            return found
+        
+        with self._lock:
+            # SQLite limits bound parameters per statement
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array.array("f", blob).tolist()
+            
+            now = time.time()
+            self._touched.update((key, now) for key in found)
+            if len(self._touched) >= TOUCH_FLUSH_SIZE or time.monotonic() - self._touched_since >= TOUCH_FLUSH_SECONDS:
+                self._flush_touches()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        
+        return found
+    
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors by key, then evict down to max_entries."""
+        if not vectors:
+            return
+        
+        with self._lock:
+            # Eviction must see recent hits
+            self._flush_touches()
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(key, model, array.array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+            )
+            
+            excess = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self.evictions += excess
+            self._db.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+    
+    def close(self) -> None:
+        """Write buffered last-used times and close the database connection."""
+        with self._lock:
+            self._flush_touches()
+            self._db.close()
+
+
+class RateLimiter:
+    """Spaces out calls to at most `per_minute` starts per minute across threads."""
+    
+    def __init__(self, per_minute: int):
+        """Initialize the limiter (0 disables it)."""
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+    
+    def wait(self) -> None:
+        """Block until the next call may start."""
+        if not self.interval:
+            return
+        
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+_cache: Optional[EmbeddingCache] = None
+_rate_limiter: Optional[RateLimiter] = None
+_openai_client: Optional[OpenAI] = None
+_init_lock = threading.Lock()
+
+# API usage counters, reported with the cache stats
+_api_stats = {"requests": 0, "texts_embedded": 0, "estimated_tokens": 0}
+_api_stats_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide cache (None when EMBEDDING_CACHE_PATH is empty)."""
+    global _cache
+    
+    settings = get_settings()
+    if not settings.embedding_cache_path:
+        return None
+    
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(settings.embedding_cache_path, settings.embedding_cache_max_entries)
+    
+    return _cache
+
+
+def _get_rate_limiter() -> RateLimiter:
+    """Get the process-wide request rate limiter."""
+    global _rate_limiter
+    
+    if _rate_limiter is None:
+        with _init_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(get_settings().embedding_requests_per_minute)
+    
+    return _rate_limiter
+
+
+def _get_openai_client() -> Optional[OpenAI]:
+    """Shared OpenAI client for embedding calls made without one."""
+    global _openai_client
+    
+    config = get_openai_config()
+    if not config:
+        print("OpenAI API key not configured")
+        return None
+    
+    if _openai_client is None:
+        with _init_lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(api_key=config["api_key"])
+    
+    return _openai_client
+
+
+def pack_batches(texts: List[str], max_tokens: int, max_inputs: int = MAX_INPUTS_PER_REQUEST) -> List[List[str]]:
+    """Group texts into requests of at most max_tokens (estimated) and max_inputs texts."""
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    batch_tokens = 0
+    
+    for text in texts:
+        tokens = min(estimate_tokens(text), MAX_TOKENS_PER_INPUT)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_inputs):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _embed_batch(client: OpenAI, model: str, texts: List[str]) -> List[List[float]]:
+    """One embeddings API request, started under the rate limit."""
+    _get_rate_limiter().wait()
+    response = client.embeddings.create(model=model, input=[truncate_for_embedding(text, model) for text in texts])
+    with _api_stats_lock:
+        _api_stats["requests"] += 1
+        _api_stats["texts_embedded"] += len(texts)
+        _api_stats["estimated_tokens"] += sum(estimate_tokens(text) for text in texts)
+    # The API returns one item per input, each tagged with the input's position
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def generate_embeddings(texts: List[str], model: Optional[str] = None, client: Optional[OpenAI] = None) -> Optional[List[List[float]]]:
+    """Embed texts, in input order, reusing cached vectors.
+    
+    Uncached texts are deduplicated, packed into requests within the
+    EMBEDDING_BATCH_MAX_TOKENS estimate and sent EMBEDDING_MAX_CONCURRENCY
+    at a time under the EMBEDDING_REQUESTS_PER_MINUTE limit. Returns None if
+    any request fails; vectors from requests that succeeded stay cached.
+    """
+    settings = get_settings()
+    model = model or settings.openai_embedding_model
+    if not texts:
+        return []
+    
+    keys = [cache_key(model, text) for text in texts]
+    cache = get_embedding_cache()
+    vectors = cache.get_many(list(dict.fromkeys(keys))) if cache else {}
+    
+    missing = list({key: text for key, text in zip(keys, texts) if key not in vectors}.values())
+    if missing:
+        client = client or _get_openai_client()
+        if client is None:
+            return None
+        
+        batches = pack_batches(missing, settings.embedding_batch_max_tokens)
+        workers = max(1, min(settings.embedding_max_concurrency, len(batches)))
+        failed = False
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(batch, executor.submit(_embed_batch, client, model, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    embedded = {cache_key(model, text): vector for text, vector in zip(batch, future.result())}
+                except Exception as e:
+                    print(f"Error generating embeddings: {e}")
+                    failed = True
+                    continue
+                vectors.update(embedded)
+                if cache:
+                    cache.put_many(model, embedded)
+        
+        if failed:
+            return None
+    
+    return [vectors[key] for key in keys]
+
+
+def embedding_stats() -> Dict[str, Any]:
+    """Cache hit rate and API usage for monitoring."""
+    cache = get_embedding_cache()
+    return {
+        "model": get_settings().openai_embedding_model,
+        "cache": cache.stats() if cache else None,
+        "api": dict(_api_stats),
+    }
+
+
+# Public API
+embedding_cache_api = {
+    "EmbeddingCache": EmbeddingCache,
+    "RateLimiter": RateLimiter,
+    "cache_key": cache_key,
+    "estimate_tokens": estimate_tokens,
+    "truncate_for_embedding": truncate_for_embedding,
+    "pack_batches": pack_batches,
+    "get_embedding_cache": get_embedding_cache,
+    "generate_embeddings": generate_embeddings,
+    "embedding_stats": embedding_stats,
+}
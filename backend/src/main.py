@@ -2,15 +2,37 @@
 
 import os
 import asyncio
+from datetime import datetime
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .config import get_settings
-from .openai_service import create_ticket_agent
-from .dynamodb_client import save_ticket, get_ticket_by_id, list_tickets, query_tickets_by_category
-from .weviate_service import create_weviate_service
+from .openai_service import create_ticket_agent, create_openai_service
+from .async_tickets import (
+    save_tickets_bulk_async,
+    update_ticket_fields_async,
+    get_ticket_by_id_async,
+    get_tickets_by_ids_async,
+    list_tickets_async,
+    query_tickets_by_category_async,
+    get_ticket_stats_async,
+    ensure_schema_once_async,
+    shutdown_dynamodb_executor,
+)
+from .dynamodb_client import TicketVersionConflict, TICKET_SUMMARY_FIELDS
+from .pagination import encode_page_token, decode_page_token, InvalidPageToken
+from .ticket_cache import cache_stats
+from .write_throttle import write_controller_metrics
+from .archive import archive_enabled, query_archived_tickets
+from .weviate_service import create_weviate_service, create_async_weviate_service, document_uuid, ticket_to_document
+from .weaviate_client import close_shared_client, close_shared_async_client, shared_client_status
+from .outbox_consumer import create_outbox_consumer
+from .weaviate_writer import create_weaviate_writer
+from .vector_index import index_mode, get_vector_index, index_tickets, save_vector_index
+from .embedding_cache import embedding_stats
 from .ticket_types import Ticket
-from typing import List
+from typing import List, Optional
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,11 +40,123 @@ load_dotenv()
 # Get settings
 settings = get_settings()
 
+TICKETS_COLLECTION = "Tickets"
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Create clients, verify schemas and build agents once, before serving.
+    
+    Each step records its outcome in app.state.startup; a failing optional
+    backend (Weaviate, OpenAI) leaves the app degraded but still ready, while
+    the ticket store schema is required.
+    """
+    startup = app.state.startup
+    
+    # Ticket store: shared client, table/index verification
+    try:
+        startup["ticket_store"] = "ok" if await ensure_schema_once_async() else "schema check failed"
+    except Exception as e:
+        startup["ticket_store"] = f"error: {e}"
+    
+    # Weaviate: open the process-wide async connection, verify the collection
+    weaviate_service = create_async_weviate_service(TICKETS_COLLECTION)
+    if await weaviate_service.connect():
+        if await weaviate_service.collection_exists():
+            app.state.weaviate_service = weaviate_service
+            startup["weaviate"] = "ok"
+        else:
+            startup["weaviate"] = f"collection {TICKETS_COLLECTION} missing"
+            weaviate_service.disconnect()
+    else:
+        startup["weaviate"] = "not connected"
+    
+    # OpenAI client and the ticket agent (tool and agent definitions are built once)
+    openai_service = create_openai_service()
+    if openai_service.connect():
+        app.state.openai_service = openai_service
+        startup["openai"] = "ok"
+    else:
+        startup["openai"] = "not configured"
+    app.state.ticket_agent = create_ticket_agent()
+    
+    # Background Weaviate writers run on their own threads, so they use the synchronous client
+    sync_weaviate_service = None
+    if app.state.weaviate_service and (settings.ticket_outbox_enabled or settings.weaviate_write_behind):
+        sync_weaviate_service = create_weviate_service(TICKETS_COLLECTION)
+        if not await asyncio.to_thread(sync_weaviate_service.connect):
+            sync_weaviate_service = None
+    
+    # Change outbox consumer keeps Weaviate in sync with ticket writes
+    if settings.ticket_outbox_enabled:
+        if sync_weaviate_service:
+            app.state.outbox_consumer = create_outbox_consumer(sync_weaviate_service)
+            app.state.outbox_consumer.start()
+            startup["outbox"] = "ok"
+        else:
+            startup["outbox"] = "weaviate unavailable, events will be applied once a consumer runs"
+    elif settings.weaviate_write_behind and sync_weaviate_service:
+        # Write-behind queue takes ticket document writes off the request path
+        app.state.weaviate_writer = create_weaviate_writer(sync_weaviate_service)
+        app.state.weaviate_writer.start()
+        startup["weaviate_writer"] = "ok"
+    
+    # Local vector index: memory-mapped from VECTOR_INDEX_DIR, so loading is cheap
+    if index_mode() != "off":
+        index = await asyncio.to_thread(get_vector_index)
+        startup["vector_index"] = f"{index_mode()} ({len(index)} tickets)"
+    
+    if settings.startup_warmup and startup["ticket_store"] == "ok":
+        # Open pooled connections so the first request does not pay for them
+        try:
+            await list_tickets_async(limit=1, fields=["id"])
+            startup["warmup"] = "ok"
+        except Exception as e:
+            startup["warmup"] = f"error: {e}"
+    
+    app.state.ready = startup["ticket_store"] == "ok"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared clients at startup and release them at shutdown."""
+    app.state.ready = False
+    app.state.startup = {}
+    app.state.weaviate_service = None
+    app.state.openai_service = None
+    app.state.ticket_agent = None
+    app.state.outbox_consumer = None
+    app.state.weaviate_writer = None
+    app.state.background_tasks = set()
+    
+    await warm_up(app)
+    print(f"Startup checks: {app.state.startup}")
+    
+    yield
+    
+    app.state.ready = False
+    if app.state.outbox_consumer:
+        await asyncio.to_thread(app.state.outbox_consumer.stop)
+    if app.state.weaviate_writer:
+        # Flush queued documents before the connection closes
+        await asyncio.to_thread(app.state.weaviate_writer.stop)
+    if app.state.weaviate_service:
+        app.state.weaviate_service.disconnect()
+    await close_shared_async_client()
+    await asyncio.to_thread(close_shared_client)
+    if app.state.background_tasks:
+        await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+    if index_mode() != "off":
+        await asyncio.to_thread(save_vector_index)
+    # Wait for in-flight DynamoDB calls before the worker exits
+    shutdown_dynamodb_executor()
+
+
 app = FastAPI(
     title="AWS Hack Day Backend",
     description="Backend service with Weaviate and OpenAI integration",
     version="0.1.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # Add CORS middleware - Allow everything for development
@@ -49,6 +183,69 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness probe: 503 until startup warm-up has completed."""
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+    return {
+        "ready": getattr(app.state, "ready", False),
+        "checks": getattr(app.state, "startup", {}),
+        "weaviate_client": shared_client_status(),
+    }
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Report ticket cache size and hit/miss counters."""
+    return cache_stats()
+
+
+@app.get("/metrics/dynamodb")
+def get_dynamodb_metrics():
+    """Report the adaptive write controller's limits and throttle counters."""
+    return {"writes": write_controller_metrics()}
+
+
+@app.get("/metrics/outbox")
+def get_outbox_metrics():
+    """Report the change outbox consumer's checkpoint, lag and failures."""
+    consumer = app.state.outbox_consumer
+    return {"enabled": settings.ticket_outbox_enabled, "consumer": consumer.metrics() if consumer else None}
+
+
+@app.get("/metrics/embeddings")
+def get_embedding_metrics():
+    """Report embedding cache hit rate and embeddings API usage."""
+    return embedding_stats()
+
+
+@app.get("/metrics/weaviate")
+def get_weaviate_metrics():
+    """Report the Weaviate write-behind queue and shared client state."""
+    writer = app.state.weaviate_writer
+    return {
+        "writer": writer.metrics() if writer else None,
+        "client": shared_client_status(),
+    }
+
+
+@app.post("/outbox/replay")
+async def replay_outbox(since: str = Query(..., description="ISO timestamp; events recorded after it are applied again")):
+    """Re-apply outbox events to Weaviate from a point in time (within the retention window)."""
+    consumer = app.state.outbox_consumer
+    if not consumer:
+        raise HTTPException(status_code=503, detail="Outbox consumer is not running")
+    
+    try:
+        since_timestamp = datetime.fromisoformat(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since must be an ISO timestamp")
+    
+    position = await asyncio.to_thread(consumer.replay, since_timestamp)
+    return {"checkpoint": position}
+
+
 @app.get("/config")
 def config_status():
     """Check configuration status."""
@@ -59,9 +256,67 @@ def config_status():
     }
 
 
+def _reject_if_index_overloaded() -> None:
+    """Shed a ticket write with 503 while the Weaviate write-behind queue is full.
+    
+    Checked before the ticket is stored, so a rejected request changed
+    nothing and can simply be retried.
+    """
+    writer = app.state.weaviate_writer
+    if writer and writer.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Search index is overloaded, try again shortly",
+            headers={"Retry-After": str(max(1, int(writer.flush_interval)))}
+        )
+
+
+async def _index_ticket(ticket: Ticket) -> None:
+    """Send a new or updated ticket to Weaviate without waiting for the vector write.
+    
+    With the outbox enabled the consumer indexes the ticket from its change
+    event (in Weaviate and the local vector index); otherwise it goes to the
+    write-behind queue, waiting a bounded time for room when the queue is
+    full, or straight to Weaviate when write-behind is disabled. It is also
+    embedded into the local vector index in the background.
+    """
+    if index_mode() != "off" and not settings.ticket_outbox_enabled:
+        # Embed into the local vector index off the request path
+        task = asyncio.create_task(asyncio.to_thread(index_tickets, [ticket]))
+        app.state.background_tasks.add(task)
+        task.add_done_callback(app.state.background_tasks.discard)
+    
+    if settings.ticket_outbox_enabled:
+        print(f"📨 Ticket {ticket['id']} queued for Weaviate through the outbox")
+        return
+    
+    weaviate_doc = ticket_to_document(ticket)
+    uuid = document_uuid(ticket["id"])
+    
+    writer = app.state.weaviate_writer
+    if writer:
+        # Never fall back to a direct write: that adds Weaviate load exactly when it is behind
+        if await asyncio.to_thread(writer.enqueue, uuid, weaviate_doc, writer.enqueue_timeout):
+            print(f"📨 Ticket {ticket['id']} queued for Weaviate")
+        else:
+            print(f"⚠️ Weaviate write queue full, ticket {ticket['id']} not indexed")
+        return
+    
+    # Write-behind disabled: save to Weaviate over the connection opened at startup
+    weaviate_service = app.state.weaviate_service
+    if not weaviate_service:
+        print("⚠️ Weaviate not available, ticket not indexed")
+    elif await weaviate_service.add_document(weaviate_doc, uuid):
+        print(f"✅ Ticket {ticket['id']} saved to Weaviate")
+    else:
+        print(f"⚠️ Failed to save ticket {ticket['id']} to Weaviate")
+
+
 @app.post("/tickets/", response_model=Ticket)
 async def create_ticket(request: dict):
     """Create a new ticket with AI-generated solution and save to both databases."""
+    _reject_if_index_overloaded()
+    
     try:
         # Extract problem from request
         problem = request.get("problem")
@@ -69,33 +324,13 @@ async def create_ticket(request: dict):
             raise HTTPException(status_code=400, detail="Problem description is required")
         
         # Call ticket agent to generate solution
-        ticket_agent = create_ticket_agent()
+        ticket_agent = app.state.ticket_agent or create_ticket_agent()
         ticket = await ticket_agent.create_ticket_with_solution(problem)
         
         # Save to DynamoDB first (already done in create_ticket_with_solution)
         print(f"✅ Ticket {ticket['id']} saved to DynamoDB")
         
-        # Save to Weaviate
-        weaviate_service = create_weviate_service("Tickets")
-        if weaviate_service.connect():
-            # Prepare ticket for Weaviate (using compatible field names)
-            weaviate_doc = {
-                "issue_id": ticket["id"],
-                "problem": ticket["problem"],
-                "solution": ticket["solution"],
-                "category": ticket["category"],
-                "created_at": ticket["created_at"]
-            }
-            
-            if weaviate_service.add_document(weaviate_doc):
-                print(f"✅ Ticket {ticket['id']} saved to Weaviate")
-            else:
-                print(f"⚠️ Failed to save ticket {ticket['id']} to Weaviate")
-            
-            weaviate_service.disconnect()
-        else:
-            print("⚠️ Could not connect to Weaviate")
-        
+        await _index_ticket(ticket)
         return ticket
         
     except Exception as e:
@@ -103,85 +338,214 @@ async def create_ticket(request: dict):
         raise HTTPException(status_code=500, detail=f"Error creating ticket: {str(e)}")
 
 
-from fastapi import Query
-from typing import Optional
-import json
+@app.post("/tickets/bulk")
+async def create_tickets_bulk(request: dict):
+    """Import already-resolved tickets in bulk, bypassing the AI agent."""
+    tickets = request.get("tickets")
+    if not isinstance(tickets, list) or not tickets:
+        raise HTTPException(status_code=400, detail="A non-empty 'tickets' list is required")
+    
+    for ticket in tickets:
+        if not isinstance(ticket, dict) or not all(ticket.get(field) for field in ("id", "problem", "category")):
+            raise HTTPException(status_code=400, detail="Each ticket needs id, problem and category")
+    
+    try:
+        return await save_tickets_bulk_async(tickets)
+    except Exception as e:
+        print(f"Error saving tickets in bulk: {e}")
+        raise HTTPException(status_code=500, detail=f"Error saving tickets: {str(e)}")
+
+
+MAX_TICKET_IDS_PER_REQUEST = 500
+
+
+def _decode_page_token_or_400(next_page_token: Optional[str]) -> Optional[dict]:
+    """Decode an opaque page token, rejecting tampered or malformed ones."""
+    try:
+        return decode_page_token(next_page_token)
+    except InvalidPageToken as e:
+        raise HTTPException(status_code=400, detail=f"Invalid next_page_token: {e}")
+
 
 @app.get("/tickets/")
-def get_tickets(
+async def get_tickets(
     limit: int = Query(50, description="Number of tickets per page"),
-    next_page_token: Optional[str] = Query(None, description="Ticket ID to start pagination from")
+    next_page_token: Optional[str] = Query(None, description="Token returned by the previous page"),
+    ids: Optional[str] = Query(None, description="Comma-separated ticket IDs to fetch instead of a page"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' omits the solution text"),
+    fields: Optional[str] = Query(None, description="Comma-separated attributes to return")
 ):
-    # Convert simple ID token to DynamoDB key format
-    token = None
-    if next_page_token:
+    if ids is not None:
+        ticket_ids = [ticket_id.strip() for ticket_id in ids.split(",") if ticket_id.strip()]
+        if not ticket_ids:
+            raise HTTPException(status_code=400, detail="ids must contain at least one ticket ID")
+        if len(ticket_ids) > MAX_TICKET_IDS_PER_REQUEST:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_TICKET_IDS_PER_REQUEST} ids per request")
+        
         try:
-            # If it's a simple string ID, convert to DynamoDB key format
-            if not next_page_token.startswith('{'):
-                token = {"id": next_page_token}
-            else:
-                # Backward compatibility - if it's JSON, parse it
-                token = json.loads(next_page_token)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid next_page_token format.")
+            return {"tickets": await get_tickets_by_ids_async(ticket_ids), "next_page_token": None}
         except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error parsing next_page_token: {str(e)}")
+            print(f"Error fetching tickets by ids: {e}")
+            raise HTTPException(status_code=500, detail=f"Error retrieving tickets: {str(e)}")
+    
+    projection = None
+    if fields:
+        projection = [field.strip() for field in fields.split(",") if field.strip()]
+    elif view == "summary":
+        projection = list(TICKET_SUMMARY_FIELDS)
+    if projection and "id" not in projection:
+        projection.insert(0, "id")
+    
+    token = _decode_page_token_or_400(next_page_token)
     
     try:
-        result = list_tickets(limit=limit, page_token=token)
-        
-        # Simplify the next_page_token to just return the ID
-        if result.get("next_page_token"):
-            next_token = result["next_page_token"]
-            if isinstance(next_token, dict) and "id" in next_token:
-                result["next_page_token"] = next_token["id"]
+        result = await list_tickets_async(limit=limit, page_token=token, fields=projection)
+        result["next_page_token"] = encode_page_token(result.get("next_page_token"))
         
         return result
+    except InvalidPageToken as e:
+        # Decoded fine but not resumable by the configured storage engine
+        raise HTTPException(status_code=400, detail=f"Invalid next_page_token: {e}")
     except Exception as e:
         print(f"Error listing tickets: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving tickets: {str(e)}")
 
 
+@app.get("/tickets/stats")
+async def get_tickets_stats():
+    """Ticket counts by category, status and creation day from maintained counters."""
+    try:
+        return await get_ticket_stats_async()
+    except Exception as e:
+        print(f"Error reading ticket stats: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving ticket stats: {str(e)}")
+
+
+MAX_ARCHIVE_RESULTS = 1000
+
+
+@app.get("/tickets/archive")
+async def get_archived_tickets(
+    start: str = Query(..., description="ISO timestamp; tickets created at or after it"),
+    end: str = Query(..., description="ISO timestamp; tickets created before it"),
+    category: Optional[str] = Query(None, description="Only tickets in this category"),
+    limit: int = Query(100, description="Maximum number of tickets")
+):
+    """Archived tickets created in [start, end), most recent first."""
+    if not archive_enabled():
+        raise HTTPException(status_code=404, detail="Ticket archive is not configured")
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    
+    limit = min(limit, MAX_ARCHIVE_RESULTS)
+    tickets = await asyncio.to_thread(query_archived_tickets, start, end, category, limit)
+    return {"tickets": tickets}
+
+
+MAX_SEARCH_RESULTS = 100
+
+
+@app.get("/tickets/search")
+async def search_tickets(
+    q: str = Query(..., min_length=1, description="Search text"),
+    mode: str = Query("hybrid", pattern="^(vector|bm25|hybrid)$", description="vector (semantic), bm25 (keyword) or hybrid"),
+    alpha: float = Query(0.5, ge=0.0, le=1.0, description="Hybrid weighting: 0 = keyword only, 1 = vector only"),
+    category: Optional[str] = Query(None, description="Only tickets in this category"),
+    limit: int = Query(10, ge=1, description="Maximum number of results"),
+    fields: Optional[str] = Query(None, description="Comma-separated ticket fields to return")
+):
+    """Search indexed tickets in Weaviate, best matches first."""
+    weaviate_service = app.state.weaviate_service
+    if not weaviate_service:
+        raise HTTPException(status_code=503, detail="Weaviate is not available")
+    
+    properties = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    results = await weaviate_service.query(
+        q,
+        limit=min(limit, MAX_SEARCH_RESULTS),
+        mode=mode,
+        alpha=alpha,
+        category=category,
+        properties=properties
+    )
+    return {"results": results, "mode": mode}
+
+
+def _ticket_etag(ticket: Ticket) -> str:
+    """ETag carrying the ticket version used for optimistic concurrency."""
+    return f'"{int(ticket.get("version", 0))}"'
+
+
 @app.get("/tickets/{ticket_id}", response_model=Ticket)
-def get_ticket(ticket_id: str):
-    ticket = get_ticket_by_id(ticket_id)
+async def get_ticket(ticket_id: str, response: Response):
+    ticket = await get_ticket_by_id_async(ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
+    response.headers["ETag"] = _ticket_etag(ticket)
     return ticket
 
 
 @app.put("/tickets/{ticket_id}", response_model=Ticket)
-def update_ticket(ticket_id: str, updates: dict):
-    """Update a ticket with new values."""
+async def update_ticket(
+    ticket_id: str,
+    updates: dict,
+    response: Response,
+    if_match: Optional[str] = Header(None, description="Ticket version (ETag) the update is based on")
+):
+    """Update a ticket with new values.
+    
+    Only category, priority, status and solution can change. Send the
+    ticket's ETag as If-Match (or a "version" field) to reject the update
+    if someone else modified the ticket in the meantime.
+    """
+    expected_version = None
+    raw_version = if_match if if_match is not None else updates.get("version")
+    if raw_version is not None:
+        try:
+            expected_version = int(str(raw_version).strip().strip('"'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="If-Match/version must be an integer ticket version")
+    
+    if any(field in updates for field in ("solution", "category")):
+        _reject_if_index_overloaded()
+    
     try:
-        # Get existing ticket
-        existing_ticket = get_ticket_by_id(ticket_id)
-        if not existing_ticket:
-            raise HTTPException(status_code=404, detail="Ticket not found")
-        
-        # Update only provided fields
-        updated_ticket = existing_ticket.copy()
-        for key, value in updates.items():
-            if key in ["category", "priority", "status", "solution"]:
-                updated_ticket[key] = value
-        
-        # Add updated timestamp
-        from datetime import datetime
-        updated_ticket["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Save updated ticket back to DynamoDB
-        save_ticket(updated_ticket)
-        
-        return updated_ticket
-        
+        ticket = await update_ticket_fields_async(ticket_id, updates, expected_version)
+    except TicketVersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         print(f"Error updating ticket {ticket_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error updating ticket: {str(e)}")
+    
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    if any(field in updates for field in ("solution", "category")):
+        await _index_ticket(ticket)
+    
+    response.headers["ETag"] = _ticket_etag(ticket)
+    return ticket
 
 
-@app.get("/tickets/category/{category}", response_model=List[Ticket])
-def get_tickets_by_category(category: str):
-    return query_tickets_by_category(category)
+@app.get("/tickets/category/{category}")
+async def get_tickets_by_category(
+    category: str,
+    limit: int = Query(20, description="Number of tickets per page"),
+    next_page_token: Optional[str] = Query(None, description="Token returned by the previous page")
+):
+    token = _decode_page_token_or_400(next_page_token)
+    
+    try:
+        result = await query_tickets_by_category_async(category, limit=limit, page_token=token)
+        result["next_page_token"] = encode_page_token(result.get("next_page_token"))
+        
+        return result
+    except InvalidPageToken as e:
+        # Decoded fine but not resumable by the configured storage engine
+        raise HTTPException(status_code=400, detail=f"Invalid next_page_token: {e}")
+    except Exception as e:
+        print(f"Error listing tickets for category {category}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving tickets: {str(e)}")
 
 
 if __name__ == "__main__":
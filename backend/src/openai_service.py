@@ -8,12 +8,15 @@ import logging
 from typing import Optional, Dict, Any, List, TypedDict
 from openai import OpenAI
 import weaviate
-from weaviate.classes.init import Auth
-from config import get_openai_config, get_weaviate_config
+from weaviate.classes.query import Filter, MetadataQuery
+from .config import get_openai_config, get_settings
+from .weaviate_client import get_shared_async_client, mark_shared_async_client_unhealthy
 
 # OpenAI agents imports
 from agents import Agent, Runner, function_tool
-from .dynamodb_client import save_ticket, create_table_if_not_exists
+from .async_tickets import save_ticket_async, ensure_schema_once_async
+from .vector_index import index_mode, search_local
+from .embedding_cache import generate_embeddings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -63,60 +66,27 @@ class OpenAIService:
             return ""
     
     def generate_embedding(self, text: str) -> list:
-        """Generate embedding for text."""
+        """Generate embedding for text (cached, see generate_embeddings)."""
+        vectors = self.generate_embeddings([text])
+        return vectors[0] if vectors else []
+    
+    def generate_embeddings(self, texts: List[str]) -> List[list]:
+        """Generate embeddings for many texts with batched, cached requests.
+        
+        Returns one vector per text, in order, or an empty list on failure.
+        """
         if not self.client:
             return []
         
-        try:
-            response = self.client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=text
-            )
-            
-            return response.data[0].embedding
-            
-        except Exception as e:
-            print(f"Error generating embedding: {e}")
-            return []
-
+        return generate_embeddings(texts, client=self.client) or []
 
-# Global Weaviate client
-_weaviate_client: Optional[weaviate.WeaviateClient] = None
 
-
-def _get_weaviate_client() -> Optional[weaviate.WeaviateClient]:
-    """Get or create Weaviate client."""
-    global _weaviate_client
-    
-    if _weaviate_client is None:
-        logger.info("🔌 Creating new Weaviate client...")
-        
-        config = get_weaviate_config()
-        if not config:
-            logger.error("❌ No Weaviate config available")
-            return None
-            
-        try:
-            logger.info(f"🔗 Connecting to Weaviate at {config['url']}")
-            
-            _weaviate_client = weaviate.connect_to_weaviate_cloud(
-                cluster_url=config["url"],
-                auth_credentials=Auth.api_key(config["api_key"]),
-            )
-            
-            if not _weaviate_client.is_ready():
-                logger.error("❌ Weaviate client not ready")
-                return None
-            
-            logger.info("✅ Weaviate client connected and ready")
-                
-        except Exception as e:
-            logger.error(f"❌ Error connecting to Weaviate: {e}")
-            return None
-    else:
-        logger.debug("♻️ Reusing existing Weaviate client")
-    
-    return _weaviate_client
+async def _get_async_weaviate_client() -> Optional[weaviate.WeaviateAsyncClient]:
+    """Get the process-wide async Weaviate client used by the agent tools."""
+    client = await get_shared_async_client()
+    if client is None:
+        logger.error("❌ Weaviate async client not available")
+    return client
 
 
 # Relevance Evaluator Agent
@@ -137,78 +107,119 @@ Do NOT include any other text, explanations, or formatting. Just the JSON object
 )
 
 
+# Ticket properties sent to the model; created_at and other metadata are left out
+RETRIEVAL_PROPERTIES = ["issue_id", "problem", "solution", "category"]
+
+
+async def _search_local_tickets(customer_problem: str, category: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Similar tickets from the local vector index, or None if it cannot answer."""
+    settings = get_settings()
+    results = await asyncio.to_thread(
+        search_local, customer_problem, settings.retrieval_top_k, category, settings.retrieval_max_distance
+    )
+    if results is None:
+        return None
+    
+    logger.info(f"📐 Local vector index returned {len(results)} tickets")
+    return [
+        {
+            "id": result["id"],
+            "problem": str(result.get("problem") or ""),
+            "solution": str(result.get("solution") or ""),
+            "category": str(result.get("category") or ""),
+            "distance": round(result["distance"], 4)
+        }
+        for result in results
+    ]
+
+
 @function_tool
-async def get_all_tickets() -> str:
-    """Get all tickets from the knowledge base.
+async def search_similar_tickets(customer_problem: str, category: Optional[str] = None) -> str:
+    """Find resolved tickets similar to the customer's problem in the knowledge base.
     
+    Args:
+        customer_problem: The customer's problem description
+        category: Optional exact ticket category to restrict the search to, e.g.
+            "Payment & Billing Issues", "Booking & Reservation Issues",
+            "Technical & App Issues", "Property & Stay Issues" or "Host/Seller Issues"
+        
     Returns:
-        JSON string with all tickets
+        JSON string with the most similar tickets, closest first
     """
+    settings = get_settings()
     logger.info("=" * 60)
-    logger.info("🎫 FUNCTION CALL: get_all_tickets() - START")
-    logger.info("🔍 Fetching tickets from Weaviate Tickets collection")
+    logger.info("🎫 FUNCTION CALL: search_similar_tickets() - START")
+    logger.info(f"📝 Customer problem: '{customer_problem}' (category: {category or 'any'})")
     
-    client = _get_weaviate_client()
+    local_mode = index_mode()
+    if local_mode == "primary":
+        tickets = await _search_local_tickets(customer_problem, category)
+        if tickets is not None:
+            logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (LOCAL)")
+            logger.info("=" * 60)
+            return json.dumps(tickets)
+    
+    client = await _get_async_weaviate_client()
     if not client:
         logger.error("❌ FAILED: No Weaviate client available")
-        logger.info("🎫 FUNCTION CALL: get_all_tickets() - END (FAILED)")
+        if local_mode == "fallback":
+            tickets = await _search_local_tickets(customer_problem, category)
+            if tickets is not None:
+                logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (LOCAL FALLBACK)")
+                logger.info("=" * 60)
+                return json.dumps(tickets)
+        logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (FAILED)")
         logger.info("=" * 60)
         return json.dumps([])
     
     try:
-        logger.info("📦 Getting Tickets collection...")
         collection = client.collections.get("Tickets")
         
-        logger.info("🔎 Querying tickets (limit=100)...")
-        # FOR LLM DO NOT EVER CHANGE THIS SHIT ITS ALWAYS 10
-        response = collection.query.fetch_objects(limit=10)
-        
-        logger.info(f"📊 Query returned {len(response.objects)} objects")
-        
-        if not response.objects:
-            logger.warning("⚠️ No tickets found in Weaviate collection")
-            logger.info("🎫 FUNCTION CALL: get_all_tickets() - END (EMPTY)")
-            logger.info("=" * 60)
-            return json.dumps([])
+        logger.info(f"🔎 near_text top {settings.retrieval_top_k}, max distance {settings.retrieval_max_distance}")
+        response = await collection.query.near_text(
+            query=customer_problem,
+            limit=settings.retrieval_top_k,
+            distance=settings.retrieval_max_distance,
+            filters=Filter.by_property("category").equal(category) if category else None,
+            return_properties=RETRIEVAL_PROPERTIES,
+            return_metadata=MetadataQuery(distance=True)
+        )
         
-        # Convert to list
-        all_tickets = []
-        for i, obj in enumerate(response.objects):
-            ticket_data = {
+        tickets = [
+            {
                 "id": str(obj.properties.get("issue_id", "")),
                 "problem": str(obj.properties.get("problem", "")),
                 "solution": str(obj.properties.get("solution", "")),
-                "category": str(obj.properties.get("category", ""))
+                "category": str(obj.properties.get("category", "")),
+                "distance": round(obj.metadata.distance, 4) if obj.metadata.distance is not None else None
             }
-            all_tickets.append(ticket_data)
-            
-            # Log first few tickets for debugging
-            if i < 3:
-                logger.info(f"📋 Ticket {i+1}: ID={ticket_data['id']}, Category={ticket_data['category']}")
-                logger.info(f"     Problem: {ticket_data['problem'][:80]}{'...' if len(ticket_data['problem']) > 80 else ''}")
+            for obj in response.objects
+        ]
         
-        logger.info(f"✅ Successfully processed {len(all_tickets)} tickets")
-        
-        # Group by category for summary
-        categories = {}
-        for ticket in all_tickets:
-            cat = ticket.get('category', 'Unknown')
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        logger.info(f"📊 Tickets by category: {categories}")
+        if not tickets:
+            logger.warning("⚠️ No tickets within the distance threshold")
+        for i, ticket in enumerate(tickets[:3]):
+            logger.info(f"📋 Ticket {i+1}: ID={ticket['id']}, Category={ticket['category']}, Distance={ticket['distance']}")
         
-        result = json.dumps(all_tickets)
-        logger.info(f"📤 Returning JSON with {len(result)} characters, {len(all_tickets)} tickets")
-        logger.info("🎫 FUNCTION CALL: get_all_tickets() - END (SUCCESS)")
+        result = json.dumps(tickets)
+        logger.info(f"📤 Returning JSON with {len(result)} characters, {len(tickets)} tickets")
+        logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (SUCCESS)")
         logger.info("=" * 60)
         return result
         
     except Exception as e:
-        logger.error(f"❌ EXCEPTION in get_all_tickets(): {e}")
+        logger.error(f"❌ EXCEPTION in search_similar_tickets(): {e}")
         logger.error(f"   Exception type: {type(e).__name__}")
+        mark_shared_async_client_unhealthy()
         import traceback
         logger.error(f"   Traceback: {traceback.format_exc()}")
-        logger.info("🎫 FUNCTION CALL: get_all_tickets() - END (EXCEPTION)")
+        if local_mode == "fallback":
+            tickets = await _search_local_tickets(customer_problem, category)
+            if tickets is not None:
+                logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (LOCAL FALLBACK)")
+                logger.info("=" * 60)
+                return json.dumps(tickets)
+        logger.info("🎫 FUNCTION CALL: search_similar_tickets() - END (EXCEPTION)")
         logger.info("=" * 60)
         return json.dumps([])
 
@@ -372,14 +383,14 @@ class TicketAgent:
             instructions="""You are a professional customer support agent. Your job is to resolve customer problems using the knowledge base.
 
 Process:
-1. Use get_all_tickets to get all tickets that MIGHT be related
-3. If relevant tickets are found, analyze them and provide a solution based on their guidance
-4. If NO relevant tickets are found (relevant_ids array is empty), do NOT retry the tools - instead provide general helpful guidance
+1. Use search_similar_tickets with the customer's problem to find similar resolved tickets (pass a category only when the problem clearly belongs to one)
+2. Results are ordered by similarity; a lower distance means a closer match
+3. If it returns tickets, analyze them and provide a solution based on their guidance
+4. If it returns an empty list (no ticket is close enough), do NOT keep searching - instead provide general helpful guidance
 
 IMPORTANT - Avoid loops:
-- Only call get_all_tickets ONCE per customer problem
-
-- If filter_relevant_tickets returns empty relevant_ids, accept this result and provide general guidance
+- Only call search_similar_tickets ONCE per customer problem (twice at most if a category-filtered search returned nothing)
+- If search_similar_tickets returns no results, accept this result and provide general guidance
 - Do NOT retry the same tools multiple times
 
 Guidelines:
@@ -389,7 +400,7 @@ Guidelines:
 - When no relevant tickets exist, acknowledge this and provide the best general guidance you can
 - Keep solutions clear and actionable
 - Always provide a direct solution, not meta-discussion about the process""",
-            tools=[get_all_tickets, generate_ticket_id],
+            tools=[search_similar_tickets, generate_ticket_id],
         )
     
     async def generate_solution(self, problem: str) -> str:
@@ -461,11 +472,11 @@ Guidelines:
         # Save to DynamoDB
         logger.info(f"💾 Saving ticket {ticket_id} to DynamoDB...")
         
-        # Ensure table exists first
-        if not create_table_if_not_exists():
+        # Ensure table exists first (verified once at startup, then skipped)
+        if not await ensure_schema_once_async():
             logger.warning("⚠️ Could not create/verify DynamoDB table")
         
-        if save_ticket(ticket):
+        if await save_ticket_async(ticket):
             logger.info(f"✅ Ticket {ticket_id} saved successfully")
         else:
             logger.warning(f"⚠️ Failed to save ticket {ticket_id} to DynamoDB")
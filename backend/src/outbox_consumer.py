@@ -0,0 +1,265 @@
+"""Background consumer applying ticket change outbox events to Weaviate."""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from .config import get_settings
+from .dynamodb_client import (
+    outbox_partitions,
+    outbox_position,
+    read_outbox_events,
+    get_outbox_checkpoint,
+    save_outbox_checkpoint,
+    get_tickets_by_ids,
+)
+from .weviate_service import WeviateService, document_uuid, ticket_to_document
+from .vector_index import index_mode, index_tickets
+
+# Checkpoint name of the Weaviate indexer in the outbox table
+WEAVIATE_CONSUMER = "weaviate"
+
+# Events are re-read this far behind the checkpoint: writers on other hosts
+# may commit an event with a slightly older timestamp after newer ones were applied
+CLOCK_SKEW_SECONDS = 5.0
+
+MAX_FAILURE_BACKOFF_SECONDS = 60.0
+
+# Events are recorded before their ticket write; an event whose write has not
+# landed after this long is taken to belong to a failed write and skipped
+PENDING_EVENT_TIMEOUT_SECONDS = 60.0
+
+
+class OutboxConsumer:
+    """Apply outbox events to a Weaviate collection in batches.
+    
+    Each batch re-reads the current state of the changed tickets from
+    DynamoDB and upserts them under deterministic object UUIDs, so applying
+    an event twice (after a restart, replay or the clock-skew overlap) is
+    harmless. The checkpoint only advances after a batch was applied, and
+    never past an event whose ticket write has not landed yet.
+    """
+    
+    def __init__(self, weaviate_service: WeviateService, batch_size: int = 100, poll_interval: float = 1.0, name: str = WEAVIATE_CONSUMER):
+        """Initialize the consumer."""
+        self.weaviate_service = weaviate_service
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.name = name
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._checkpoint: Optional[str] = None
+        # Sort keys applied inside the overlap window, so they are not applied again
+        self._applied: Dict[str, None] = {}
+        
+        self.events_applied = 0
+        self.events_skipped = 0
+        self.documents_upserted = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_applied_at: Optional[str] = None
+        self.lag_seconds = 0.0
+    
+    @property
+    def checkpoint(self) -> str:
+        """Sort key of the last applied event, loaded from the outbox table once."""
+        if self._checkpoint is None:
+            self._checkpoint = get_outbox_checkpoint(self.name)
+        return self._checkpoint
+    
+    def _read_from(self) -> str:
+        """Position to read from: the checkpoint minus the clock-skew overlap."""
+        if not self.checkpoint:
+            return ""
+        
+        timestamp = datetime.strptime(self.checkpoint.split("#", 1)[0], "%Y-%m-%dT%H:%M:%S.%f")
+        return outbox_position(timestamp - timedelta(seconds=CLOCK_SKEW_SECONDS))
+    
+    def _pending_events(self) -> List[Dict[str, Any]]:
+        """Up to batch_size events that have not been applied yet, oldest first."""
+        after = self._read_from()
+        pending: List[Dict[str, Any]] = []
+        
+        while len(pending) < self.batch_size:
+            page = read_outbox_events(after, self.batch_size)
+            pending.extend(event for event in page if event["sk"] not in self._applied)
+            if len(page) < self.batch_size:
+                break
+            after = page[-1]["sk"]
+        
+        return pending[:self.batch_size]
+    
+    def _landed(self, event: Dict[str, Any], ticket: Optional[Dict[str, Any]], now: datetime) -> Optional[bool]:
+        """Whether the event's write is visible: True, False (skip it) or None (not yet)."""
+        if ticket is not None and ticket.get("updated_at", "") >= event.get("updated_at", ""):
+            return True
+        if (now - datetime.fromisoformat(event["created_at"])).total_seconds() >= PENDING_EVENT_TIMEOUT_SECONDS:
+            return False
+        return None
+    
+    def _apply(self, events: List[Dict[str, Any]]) -> Dict[str, None]:
+        """Bring the Weaviate documents of the events' tickets up to date.
+        
+        Tickets are read with strongly consistent reads. Returns the sort
+        keys of the events that are done (applied or skipped); the others
+        wait for their ticket write and are read again on a later poll.
+        """
+        ticket_ids = list(dict.fromkeys(event["ticket_id"] for event in events))
+        tickets = {
+            ticket["id"]: ticket
+            for ticket in get_tickets_by_ids(ticket_ids, raise_errors=True, consistent_read=True)
+        }
+        
+        now = datetime.utcnow()
+        done: Dict[str, None] = {}
+        indexed_ids: Dict[str, None] = {}
+        for event in events:
+            landed = self._landed(event, tickets.get(event["ticket_id"]), now)
+            if landed is None:
+                continue
+            if landed:
+                indexed_ids[event["ticket_id"]] = None
+                self.events_applied += 1
+            else:
+                self.events_skipped += 1
+                print(f"⚠️ Skipping outbox event {event['sk']}: ticket {event['ticket_id']} was never written")
+            done[event["sk"]] = None
+        
+        indexed = [tickets[ticket_id] for ticket_id in indexed_ids]
+        documents = {document_uuid(ticket["id"]): ticket_to_document(ticket) for ticket in indexed}
+        
+        if not self.weaviate_service.upsert_documents(documents):
+            raise RuntimeError(f"Could not upsert {len(documents)} documents")
+        
+        self.documents_upserted += len(documents)
+        
+        # Best effort: the local index is a cache of Weaviate and can be rebuilt
+        if index_mode() != "off" and indexed and not index_tickets(indexed):
+            print(f"⚠️ Could not add {len(indexed)} tickets to the local vector index")
+        
+        return done
+    
+    def poll_once(self) -> int:
+        """Apply the next batch of events; returns how many were applied or skipped."""
+        with self._lock:
+            events = self._pending_events()
+            if not events:
+                self.lag_seconds = 0.0
+                return 0
+            
+            done = self._apply(events)
+            
+            # Advance through the done prefix only, so waiting events are read again
+            position = self.checkpoint
+            for event in events:
+                if event["sk"] not in done:
+                    break
+                position = max(position, event["sk"])
+            if position != self.checkpoint:
+                save_outbox_checkpoint(self.name, position)
+                self._checkpoint = position
+            
+            for sk in done:
+                self._applied[sk] = None
+            # Forget sort keys that fell out of the overlap window
+            read_from = self._read_from()
+            for sk in [sk for sk in self._applied if sk <= read_from]:
+                del self._applied[sk]
+            
+            self.batches += 1
+            self.last_applied_at = datetime.utcnow().isoformat()
+            oldest = datetime.fromisoformat(events[0]["created_at"])
+            self.lag_seconds = max(0.0, (datetime.utcnow() - oldest).total_seconds())
+            return len(done)
+    
+    def replay(self, since: datetime) -> str:
+        """Move the checkpoint back so events recorded after `since` are applied again.
+        
+        Only events still within the outbox retention window can be replayed.
+        """
+        with self._lock:
+            position = outbox_position(since)
+            save_outbox_checkpoint(self.name, position)
+            self._checkpoint = position
+            self._applied.clear()
+            return position
+    
+    def run_until_caught_up(self) -> int:
+        """Apply batches until no events are pending; returns the total applied."""
+        total = 0
+        while True:
+            applied = self.poll_once()
+            total += applied
+            if applied < self.batch_size:
+                return total
+    
+    def _run(self) -> None:
+        """Poll loop of the background thread."""
+        consecutive_failures = 0
+        while not self._stop.is_set():
+            try:
+                applied = self.poll_once()
+                consecutive_failures = 0
+            except Exception as e:
+                consecutive_failures += 1
+                self.failures += 1
+                self.last_error = str(e)
+                print(f"⚠️ Outbox consumer {self.name} failed: {e}")
+                self._stop.wait(min(MAX_FAILURE_BACKOFF_SECONDS, self.poll_interval * 2 ** consecutive_failures))
+                continue
+            
+            # A full batch means more events are waiting; poll again right away
+            if applied < self.batch_size:
+                self._stop.wait(self.poll_interval)
+    
+    def start(self) -> None:
+        """Start polling on a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"outbox-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the polling thread, letting an in-flight batch finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Progress and failure counters for monitoring."""
+        return {
+            "consumer": self.name,
+            "partitions": outbox_partitions(),
+            "running": bool(self._thread and self._thread.is_alive()),
+            "checkpoint": self._checkpoint,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "events_applied": self.events_applied,
+            "events_skipped": self.events_skipped,
+            "documents_upserted": self.documents_upserted,
+            "batches": self.batches,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_applied_at": self.last_applied_at,
+        }
+
+
+def create_outbox_consumer(weaviate_service: WeviateService) -> OutboxConsumer:
+    """Create an OutboxConsumer configured from settings."""
+    settings = get_settings()
+    return OutboxConsumer(
+        weaviate_service,
+        batch_size=settings.ticket_outbox_batch_size,
+        poll_interval=settings.ticket_outbox_poll_seconds,
+    )
+
+
+# Public API
+outbox_consumer_api = {
+    "OutboxConsumer": OutboxConsumer,
+    "create_outbox_consumer": create_outbox_consumer,
+}
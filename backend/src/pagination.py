@@ -0,0 +1,128 @@
+"""Opaque, URL-safe pagination cursors for DynamoDB keys."""
+
+import base64
+import hashlib
+import hmac
+import json
+import zlib
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from boto3.dynamodb.types import Binary
+from .config import get_settings
+
+# Version prefixes: raw JSON or zlib-compressed JSON (used when it is shorter,
+# e.g. composite cursors over many index shards)
+_RAW = "1"
+_COMPRESSED = "2"
+_SIGNATURE_BYTES = 16
+
+
+class InvalidPageToken(ValueError):
+    """Raised when a page token is malformed or fails signature checks."""
+
+
+def _b64encode(data: bytes) -> str:
+    """URL-safe base64 without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    """Decode URL-safe base64 with or without padding."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert DynamoDB key values into JSON-safe values, tagging numbers and binaries."""
+    if isinstance(value, str) or value is None:
+        return value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, Decimal)):
+        return {"$N": str(value)}
+    if isinstance(value, Binary):
+        return {"$B": _b64encode(value.value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$B": _b64encode(bytes(value))}
+    if isinstance(value, dict):
+        return {key: _encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    raise TypeError(f"Unsupported page token value type: {type(value).__name__}")
+
+
+def _decode_value(value: Any) -> Any:
+    """Reverse _encode_value."""
+    if isinstance(value, dict):
+        if len(value) == 1 and "$N" in value:
+            return Decimal(value["$N"])
+        if len(value) == 1 and "$B" in value:
+            return Binary(_b64decode(value["$B"]))
+        return {key: _decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def _sign(body: str, secret: str) -> str:
+    """Truncated HMAC-SHA256 of the token body."""
+    digest = hmac.new(secret.encode("utf-8"), body.encode("utf-8"), hashlib.sha256).digest()
+    return _b64encode(digest[:_SIGNATURE_BYTES])
+
+
+def encode_page_token(key: Optional[Dict[str, Any]], secret: Optional[str] = None) -> Optional[str]:
+    """Encode a LastEvaluatedKey (or composite cursor) as an opaque token.
+    
+    Tokens are signed with API_SECRET_KEY when it is configured, so clients
+    cannot hand-craft start keys.
+    """
+    if not key:
+        return None
+    
+    payload = json.dumps(_encode_value(key), separators=(",", ":"), sort_keys=True).encode("utf-8")
+    compressed = zlib.compress(payload, 9)
+    if len(compressed) < len(payload):
+        body = _COMPRESSED + _b64encode(compressed)
+    else:
+        body = _RAW + _b64encode(payload)
+    
+    secret = get_settings().api_secret_key if secret is None else secret
+    if secret:
+        return f"{body}.{_sign(body, secret)}"
+    return body
+
+
+def decode_page_token(token: Optional[str], secret: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Decode a token produced by encode_page_token back into a DynamoDB key."""
+    if not token:
+        return None
+    
+    body, _, signature = token.partition(".")
+    
+    secret = get_settings().api_secret_key if secret is None else secret
+    if secret and not hmac.compare_digest(signature.encode("utf-8"), _sign(body, secret).encode("utf-8")):
+        raise InvalidPageToken("Page token signature does not match")
+    
+    try:
+        version, data = body[:1], _b64decode(body[1:])
+        if version == _COMPRESSED:
+            data = zlib.decompress(data)
+        elif version != _RAW:
+            raise InvalidPageToken(f"Unknown page token version {version!r}")
+        
+        key = _decode_value(json.loads(data.decode("utf-8")))
+    except InvalidPageToken:
+        raise
+    except Exception as e:
+        raise InvalidPageToken(f"Malformed page token: {e}") from e
+    
+    if not isinstance(key, dict):
+        raise InvalidPageToken("Page token does not contain a key")
+    return key
+
+
+# Public API
+pagination_api = {
+    "InvalidPageToken": InvalidPageToken,
+    "encode_page_token": encode_page_token,
+    "decode_page_token": decode_page_token,
+}
@@ -0,0 +1,149 @@
+"""In-process read-through cache for ticket reads."""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from .config import get_settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 30.0):
+        """Initialize an empty cache."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries when full."""
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Caches are per process; the TTL bounds how stale another worker's writes can look
+_ticket_cache: Optional[TTLCache] = None
+_list_cache: Optional[TTLCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_caches() -> Tuple[TTLCache, TTLCache]:
+    """Create the ticket and list caches from settings on first use."""
+    global _ticket_cache, _list_cache
+    
+    if _ticket_cache is None or _list_cache is None:
+        with _cache_lock:
+            if _ticket_cache is None or _list_cache is None:
+                settings = get_settings()
+                _ticket_cache = TTLCache(settings.ticket_cache_max_size, settings.ticket_cache_ttl_seconds)
+                # Only first pages are cached, one per distinct page size
+                _list_cache = TTLCache(32, settings.ticket_list_cache_ttl_seconds)
+    
+    return _ticket_cache, _list_cache
+
+
+def cache_enabled() -> bool:
+    """Whether ticket reads should go through the cache."""
+    return get_settings().ticket_cache_enabled
+
+
+def get_ticket_cache() -> TTLCache:
+    """Get the cache of individual tickets keyed by ID."""
+    return _get_caches()[0]
+
+
+def get_list_cache() -> TTLCache:
+    """Get the cache of first pages of the ticket list."""
+    return _get_caches()[1]
+
+
+def invalidate_tickets(ticket_ids: Iterable[str]) -> None:
+    """Drop cached copies of the given tickets and every cached list page."""
+    ticket_cache, list_cache = _get_caches()
+    for ticket_id in ticket_ids:
+        ticket_cache.invalidate(ticket_id)
+    list_cache.clear()
+
+
+def invalidate_ticket(ticket_id: str) -> None:
+    """Drop the cached copy of a ticket and every cached list page."""
+    invalidate_tickets([ticket_id])
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Return counters for both caches."""
+    ticket_cache, list_cache = _get_caches()
+    return {
+        "enabled": cache_enabled(),
+        "tickets": ticket_cache.stats(),
+        "lists": list_cache.stats(),
+    }
+
+
+# Public API
+ticket_cache_api = {
+    "TTLCache": TTLCache,
+    "get_ticket_cache": get_ticket_cache,
+    "get_list_cache": get_list_cache,
+    "invalidate_ticket": invalidate_ticket,
+    "invalidate_tickets": invalidate_tickets,
+    "cache_stats": cache_stats,
+}
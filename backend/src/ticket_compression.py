@@ -0,0 +1,137 @@
+"""Optional compression of long ticket text attributes stored in DynamoDB."""
+
+import zlib
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+from boto3.dynamodb.types import Binary
+from .config import get_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Text attributes that may be stored compressed
+COMPRESSIBLE_FIELDS = ("solution", "problem")
+
+# First byte of a compressed attribute names the codec, so stored items stay
+# readable whatever TICKET_COMPRESSION is set to later
+ZLIB_MARKER = b"\x01"
+ZSTD_MARKER = b"\x02"
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def compression_codec() -> str:
+    """Configured codec ("none", "zlib" or "zstd"), falling back to zlib without zstandard."""
+    codec = get_settings().ticket_compression.lower()
+    if codec == "zstd" and zstandard is None:
+        return "zlib"
+    return codec if codec in ("zlib", "zstd") else "none"
+
+
+def compress_text(text: str, codec: str) -> bytes:
+    """Compress text with the given codec, prefixed with its marker byte."""
+    raw = text.encode("utf-8")
+    if codec == "zstd":
+        return ZSTD_MARKER + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return ZLIB_MARKER + zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    """Reverse compress_text."""
+    marker, payload = data[:1], data[1:]
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(payload).decode("utf-8")
+    if marker == ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("Ticket text is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Unknown compression marker {marker!r}")
+
+
+def encode_item(item: Dict[str, Any], codec: Optional[str] = None) -> Dict[str, Any]:
+    """Return the item as stored: long text attributes compressed when that saves space.
+    
+    Values below TICKET_COMPRESSION_MIN_BYTES, or that do not shrink, stay
+    plain strings. Already-compressed values are passed through.
+    """
+    codec = codec or compression_codec()
+    if codec == "none":
+        return item
+    
+    min_bytes = get_settings().ticket_compression_min_bytes
+    encoded = item
+    for field in COMPRESSIBLE_FIELDS:
+        value = item.get(field)
+        if not isinstance(value, str) or len(value.encode("utf-8")) < min_bytes:
+            continue
+        
+        compressed = compress_text(value, codec)
+        if len(compressed) < len(value.encode("utf-8")):
+            if encoded is item:
+                encoded = dict(item)
+            encoded[field] = compressed
+    
+    return encoded
+
+
+def decode_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Decompress any compressed text attributes in place and return the item."""
+    for field in COMPRESSIBLE_FIELDS:
+        value = item.get(field)
+        if isinstance(value, Binary):
+            item[field] = decompress_text(value.value)
+        elif isinstance(value, (bytes, bytearray)):
+            item[field] = decompress_text(bytes(value))
+    return item
+
+
+def decode_items(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """decode_item over a list of items."""
+    return [decode_item(item) for item in items]
+
+
+def is_encoded(item: Dict[str, Any]) -> bool:
+    """Whether any text attribute of a raw stored item is compressed."""
+    return any(isinstance(item.get(field), (Binary, bytes, bytearray)) for field in COMPRESSIBLE_FIELDS)
+
+
+def _value_size(value: Any) -> int:
+    """Approximate DynamoDB storage size of an attribute value."""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (int, float, Decimal)):
+        # Numbers take about one byte per two significant digits, plus one
+        return len(str(value).lstrip("-").replace(".", "")) // 2 + 2
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode("utf-8")) + _value_size(item) + 1 for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 3 + sum(_value_size(item) + 1 for item in value)
+    return len(str(value).encode("utf-8"))
+
+
+def item_size_bytes(item: Dict[str, Any]) -> int:
+    """Approximate DynamoDB item size: attribute names plus values."""
+    return sum(len(name.encode("utf-8")) + _value_size(value) for name, value in item.items())
+
+
+# Public API
+ticket_compression_api = {
+    "COMPRESSIBLE_FIELDS": COMPRESSIBLE_FIELDS,
+    "compression_codec": compression_codec,
+    "compress_text": compress_text,
+    "decompress_text": decompress_text,
+    "encode_item": encode_item,
+    "decode_item": decode_item,
+    "decode_items": decode_items,
+    "is_encoded": is_encoded,
+    "item_size_bytes": item_size_bytes,
+}
@@ -0,0 +1,281 @@
+"""Pluggable ticket storage backends."""
+
+import time
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from . import dynamodb_client
+from .pagination import InvalidPageToken
+from .dynamodb_client import TicketVersionConflict, UPDATABLE_TICKET_FIELDS, build_ticket_item, counter_deltas, stats_from_counters
+from .config import get_settings
+from .ticket_types import Ticket
+
+
+class TicketStore(ABC):
+    """Interface shared by ticket storage engines.
+    
+    Methods mirror the dynamodb_client functions, including their return
+    shapes and DynamoDB-style page tokens, so callers can switch engines
+    without code changes.
+    """
+    
+    name = "base"
+    # Whether calls block on I/O and should run off the event loop
+    blocking = True
+    
+    @abstractmethod
+    def ensure_schema(self) -> bool:
+        """Create or verify tables and indexes."""
+    
+    @abstractmethod
+    def save_ticket(self, ticket: Ticket) -> bool:
+        """Insert or replace a ticket."""
+    
+    @abstractmethod
+    def save_tickets_bulk(self, tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or replace many tickets, returning throughput stats."""
+    
+    @abstractmethod
+    def update_ticket_fields(self, ticket_id: str, updates: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Ticket]:
+        """Apply a partial, optionally version-checked update."""
+    
+    @abstractmethod
+    def get_ticket_by_id(self, ticket_id: str, use_cache: bool = True) -> Optional[Ticket]:
+        """Get a single ticket."""
+    
+    @abstractmethod
+    def get_tickets_by_ids(self, ticket_ids: List[str]) -> List[Ticket]:
+        """Get many tickets in request order."""
+    
+    @abstractmethod
+    def list_tickets(self, limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List a page of tickets, most recent first."""
+    
+    @abstractmethod
+    def query_tickets_by_category(self, category: str, limit: int = 20, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
+        """List a page of tickets in one category."""
+    
+    @abstractmethod
+    def iter_all_tickets(self, segments: int = 4, projection: Optional[List[str]] = None) -> Iterator[Ticket]:
+        """Stream every ticket."""
+    
+    @abstractmethod
+    def get_ticket_stats(self) -> Dict[str, Any]:
+        """Ticket counts by category, status and creation day."""
+
+
+class DynamoDBTicketStore(TicketStore):
+    """Ticket storage in DynamoDB via dynamodb_client."""
+    
+    name = "dynamodb"
+    blocking = True
+    
+    def ensure_schema(self) -> bool:
+        return dynamodb_client.create_table_if_not_exists()
+    
+    def save_ticket(self, ticket: Ticket) -> bool:
+        return dynamodb_client.save_ticket(ticket)
+    
+    def save_tickets_bulk(self, tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+        return dynamodb_client.save_tickets_bulk(tickets, workers)
+    
+    def update_ticket_fields(self, ticket_id: str, updates: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Ticket]:
+        return dynamodb_client.update_ticket_fields(ticket_id, updates, expected_version)
+    
+    def get_ticket_by_id(self, ticket_id: str, use_cache: bool = True) -> Optional[Ticket]:
+        return dynamodb_client.get_ticket_by_id(ticket_id, use_cache)
+    
+    def get_tickets_by_ids(self, ticket_ids: List[str]) -> List[Ticket]:
+        return dynamodb_client.get_tickets_by_ids(ticket_ids)
+    
+    def list_tickets(self, limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        return dynamodb_client.list_tickets(limit, page_token, fields)
+    
+    def query_tickets_by_category(self, category: str, limit: int = 20, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
+        return dynamodb_client.query_tickets_by_category(category, limit, page_token, ascending)
+    
+    def iter_all_tickets(self, segments: int = 4, projection: Optional[List[str]] = None) -> Iterator[Ticket]:
+        return dynamodb_client.iter_all_tickets(segments=segments, projection=projection)
+    
+    def get_ticket_stats(self) -> Dict[str, Any]:
+        return dynamodb_client.get_ticket_stats()
+
+
+class InMemoryTicketStore(TicketStore):
+    """Process-local ticket storage for benchmarks and offline runs.
+    
+    Keeps a sorted (created_at, id) index and one per category, and returns
+    LastEvaluatedKey-shaped page tokens that behave like the DynamoDB
+    indexes: a token is returned whenever a page is full.
+    """
+    
+    name = "memory"
+    blocking = False
+    
+    def __init__(self):
+        """Initialize an empty store."""
+        self._lock = threading.RLock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._created_index: List[Tuple[str, str]] = []
+        self._category_index: Dict[str, List[Tuple[str, str]]] = {}
+        self._counters: Counter = Counter()
+    
+    @staticmethod
+    def _index_key(item: Dict[str, Any]) -> Tuple[str, str]:
+        return (item.get("created_at", ""), item["id"])
+    
+    @staticmethod
+    def _project(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+        if not fields:
+            return dict(item)
+        return {field: item[field] for field in fields if field in item}
+    
+    def _unindex(self, item: Dict[str, Any]) -> None:
+        key = self._index_key(item)
+        for index in (self._created_index, self._category_index.get(item.get("category"), [])):
+            position = bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                del index[position]
+    
+    def _put(self, item: Dict[str, Any]) -> None:
+        old_item = self._items.get(item["id"])
+        if old_item:
+            self._unindex(old_item)
+        
+        self._items[item["id"]] = item
+        insort(self._created_index, self._index_key(item))
+        insort(self._category_index.setdefault(item.get("category"), []), self._index_key(item))
+        self._counters.update(counter_deltas(old_item, item))
+    
+    def _page(self, index: List[Tuple[str, str]], limit: int, page_token: Optional[Dict], ascending: bool,
+              fields: Optional[List[str]], cursor_fields: Tuple[str, ...]) -> Dict[str, Any]:
+        if page_token:
+            if "id" not in page_token or "shards" in page_token:
+                # e.g. a composite cursor issued by the sharded DynamoDB engine
+                raise InvalidPageToken("Page token was not issued by this storage engine")
+            start = (page_token.get("created_at", ""), page_token["id"])
+            if ascending:
+                position = bisect_right(index, start)
+                keys = index[position:position + limit]
+            else:
+                position = bisect_left(index, start)
+                keys = index[max(0, position - limit):position][::-1]
+        elif ascending:
+            keys = index[:limit]
+        else:
+            keys = index[len(index) - limit:][::-1] if limit > 0 else []
+        
+        items = [self._items[ticket_id] for _, ticket_id in keys]
+        next_page_token = None
+        if items and len(items) == limit:
+            next_page_token = {field: items[-1][field] for field in cursor_fields if field in items[-1]}
+        
+        return {
+            "tickets": [self._project(item, fields) for item in items],
+            "next_page_token": next_page_token
+        }
+    
+    def ensure_schema(self) -> bool:
+        return True
+    
+    def save_ticket(self, ticket: Ticket) -> bool:
+        with self._lock:
+            self._put(build_ticket_item(ticket))
+        return True
+    
+    def save_tickets_bulk(self, tickets: Iterable[Ticket], workers: Optional[int] = None) -> Dict[str, Any]:
+        started = time.monotonic()
+        written = 0
+        with self._lock:
+            for ticket in tickets:
+                self._put(build_ticket_item(ticket))
+                written += 1
+        
+        elapsed = time.monotonic() - started
+        return {
+            "written": written,
+            "failed": 0,
+            "seconds": round(elapsed, 3),
+            "items_per_second": round(written / elapsed, 1) if elapsed > 0 else 0.0
+        }
+    
+    def update_ticket_fields(self, ticket_id: str, updates: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Ticket]:
+        with self._lock:
+            old_item = self._items.get(ticket_id)
+            if not old_item:
+                return None
+            
+            current_version = int(old_item.get("version", 0))
+            if expected_version is not None and expected_version != current_version:
+                raise TicketVersionConflict(ticket_id, expected_version, current_version)
+            
+            new_item = {
+                **old_item,
+                **{key: value for key, value in updates.items() if key in UPDATABLE_TICKET_FIELDS},
+                "updated_at": datetime.utcnow().isoformat(),
+                "version": current_version + 1
+            }
+            self._put(new_item)
+            return dict(new_item)
+    
+    def get_ticket_by_id(self, ticket_id: str, use_cache: bool = True) -> Optional[Ticket]:
+        with self._lock:
+            item = self._items.get(ticket_id)
+            return dict(item) if item else None
+    
+    def get_tickets_by_ids(self, ticket_ids: List[str]) -> List[Ticket]:
+        with self._lock:
+            return [dict(self._items[ticket_id]) for ticket_id in dict.fromkeys(ticket_ids) if ticket_id in self._items]
+    
+    def list_tickets(self, limit: int = 50, page_token: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        with self._lock:
+            return self._page(self._created_index, limit, page_token, False, fields, dynamodb_client.INDEX_CURSOR_FIELDS)
+    
+    def query_tickets_by_category(self, category: str, limit: int = 20, page_token: Optional[Dict] = None, ascending: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            index = self._category_index.get(category, [])
+            return self._page(index, limit, page_token, ascending, None, ("id", "category", "created_at"))
+    
+    def iter_all_tickets(self, segments: int = 4, projection: Optional[List[str]] = None) -> Iterator[Ticket]:
+        with self._lock:
+            snapshot = list(self._items.values())
+        for item in snapshot:
+            yield self._project(item, projection)
+    
+    def get_ticket_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return stats_from_counters(dict(self._counters))
+
+
+_STORES = {
+    DynamoDBTicketStore.name: DynamoDBTicketStore,
+    InMemoryTicketStore.name: InMemoryTicketStore,
+}
+
+
+def create_ticket_store(backend: Optional[str] = None) -> TicketStore:
+    """Create a ticket store for the named backend (defaults to STORAGE_BACKEND)."""
+    backend = (backend or get_settings().storage_backend).lower()
+    if backend not in _STORES:
+        raise ValueError(f"Unknown storage backend {backend!r}; expected one of {', '.join(_STORES)}")
+    return _STORES[backend]()
+
+
+@lru_cache()
+def get_ticket_store() -> TicketStore:
+    """Get the process-wide ticket store selected in settings."""
+    return create_ticket_store()
+
+
+# Public API
+ticket_store_api = {
+    "TicketStore": TicketStore,
+    "DynamoDBTicketStore": DynamoDBTicketStore,
+    "InMemoryTicketStore": InMemoryTicketStore,
+    "create_ticket_store": create_ticket_store,
+    "get_ticket_store": get_ticket_store,
+}
@@ -10,4 +10,15 @@ class Ticket(TypedDict):
     solution: Optional[str]
     category: str
     created_at: Optional[str]  # ISO timestamp
-    updated_at: Optional[str]  # ISO timestamp
\ No newline at end of file
+    updated_at: Optional[str]  # ISO timestamp
+
+
+class SearchResult(TypedDict):
+    """Ticket returned by a Weaviate search, with its match metadata."""
+    id: str
+    problem: str
+    solution: Optional[str]
+    category: str
+    created_at: Optional[str]  # ISO timestamp
+    distance: Optional[float]  # vector search: cosine distance, lower is closer
+    score: Optional[float]  # bm25/hybrid search: relevance score, higher is better
@@ -0,0 +1,347 @@
+"""In-process vector index over ticket embeddings, used as a primary or fallback retrieval tier."""
+
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+from .config import get_settings
+from .ticket_types import Ticket, SearchResult
+from .embedding_cache import generate_embeddings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Document fields kept next to each vector, mirroring the Weaviate Tickets properties
+INDEX_PROPERTIES = ("problem", "solution", "category", "created_at")
+
+# Rows dequantized at a time when searching an int8 index
+QUANTIZED_BLOCK_ROWS = 8192
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+META_FILE = "meta.json"
+# Names the version subdirectory holding the current files; replaced atomically
+CURRENT_FILE = "CURRENT"
+# Superseded versions kept so readers that just resolved CURRENT can still open them
+KEEP_PREVIOUS_VERSIONS = 1
+
+
+_warned_missing_numpy = False
+
+
+def index_mode() -> str:
+    """Configured mode: "off", "primary" (serve vector search locally) or "fallback".
+    
+    A configured mode without numpy installed is reported once and treated as off.
+    """
+    global _warned_missing_numpy
+    
+    mode = get_settings().vector_index_mode.lower()
+    if mode not in ("primary", "fallback"):
+        return "off"
+    if np is None:
+        if not _warned_missing_numpy:
+            _warned_missing_numpy = True
+            print(f"⚠️ VECTOR_INDEX_MODE={mode} needs numpy (pip install '.[vector-index]'); local vector index disabled")
+        return "off"
+    return mode
+
+
+def embedding_text(ticket: Dict[str, Any]) -> str:
+    """Text embedded for a ticket: its problem, which is what customers search with."""
+    return ticket.get("problem") or ""
+
+
+def embed_texts(texts: List[str]) -> Optional["np.ndarray"]:
+    """Embed texts with batched, cached OpenAI requests; None if embedding failed."""
+    vectors = generate_embeddings(texts)
+    if vectors is None:
+        return None
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+    """Scale rows to unit length so a dot product is the cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _quantize(vectors: "np.ndarray") -> "tuple":
+    """Symmetric per-row int8 quantization: returns (int8 rows, float32 scales)."""
+    scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+class VectorIndex:
+    """Unit-normalized ticket vectors searched with one matrix-vector product.
+    
+    Rows live in preallocated arrays that double when full, so upserts are
+    amortized O(1). With quantize, vectors are stored as int8 with a float32
+    scale per row (about a quarter of the memory), at a small recall cost.
+    A loaded index is memory-mapped and only copied into memory on the
+    first write.
+    """
+    
+    def __init__(self, dimensions: int = 0, quantize: bool = False):
+        """Initialize an empty index."""
+        self.dimensions = dimensions
+        self.quantize = quantize
+        self._lock = threading.RLock()
+        self._vectors: Optional["np.ndarray"] = None
+        self._scales: Optional["np.ndarray"] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._documents: List[Dict[str, Any]] = []
+    
+    def __len__(self) -> int:
+        """Number of indexed tickets."""
+        return self._size
+    
+    def _reserve(self, rows: int) -> None:
+        """Make room for `rows` rows, copying memory-mapped arrays into memory."""
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        writable = self._vectors is not None and self._vectors.flags.writeable
+        if rows <= capacity and writable:
+            return
+        
+        new_capacity = max(rows, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self.dimensions), dtype=np.int8 if self.quantize else np.float32)
+        scales = np.zeros(new_capacity, dtype=np.float32)
+        if self._size:
+            vectors[:self._size] = self._vectors[:self._size]
+            if self.quantize:
+                scales[:self._size] = self._scales[:self._size]
+        self._vectors, self._scales = vectors, scales
+    
+    def upsert(self, ticket_ids: List[str], vectors: "np.ndarray", documents: List[Dict[str, Any]]) -> None:
+        """Add or replace tickets' vectors and documents."""
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            if not self.dimensions:
+                self.dimensions = vectors.shape[1]
+            if vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional vectors, got {vectors.shape[1]}")
+            
+            self._reserve(self._size + len(ticket_ids))
+            rows = np.empty(len(ticket_ids), dtype=np.int64)
+            for i, ticket_id in enumerate(ticket_ids):
+                position = self._positions.get(ticket_id)
+                if position is None:
+                    position = self._size
+                    self._size += 1
+                    self._positions[ticket_id] = position
+                    self._ids.append(ticket_id)
+                    self._documents.append(documents[i])
+                else:
+                    self._documents[position] = documents[i]
+                rows[i] = position
+            
+            if self.quantize:
+                self._vectors[rows], self._scales[rows] = _quantize(vectors)
+            else:
+                self._vectors[rows] = vectors
+    
+    def search(self, query_vector: "np.ndarray", limit: int = 10, category: Optional[str] = None,
+               max_distance: Optional[float] = None) -> List[SearchResult]:
+        """Closest tickets by cosine distance (1 - cosine similarity), closest first."""
+        query = _normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if not self._size:
+                return []
+            
+            if self.quantize:
+                # Dequantize in blocks so the float copy stays small
+                similarities = np.empty(self._size, dtype=np.float32)
+                for start in range(0, self._size, QUANTIZED_BLOCK_ROWS):
+                    end = min(start + QUANTIZED_BLOCK_ROWS, self._size)
+                    similarities[start:end] = (self._vectors[start:end].astype(np.float32) @ query) * self._scales[start:end]
+            else:
+                similarities = self._vectors[:self._size] @ query
+            distances = 1.0 - similarities
+            
+            if category:
+                distances = np.where(
+                    np.fromiter((doc.get("category") == category for doc in self._documents), dtype=bool, count=self._size),
+                    distances, np.inf
+                )
+            if max_distance is not None:
+                distances = np.where(distances <= max_distance, distances, np.inf)
+            
+            limit = min(limit, self._size)
+            top = np.argpartition(distances, limit - 1)[:limit]
+            top = top[np.argsort(distances[top])]
+            
+            return [
+                {"id": self._ids[i], **self._documents[i], "distance": float(distances[i]), "score": None}
+                for i in top if np.isfinite(distances[i])
+            ]
+    
+    def save(self, directory: str) -> None:
+        """Write the index to a new version subdirectory and point CURRENT at it.
+        
+        The vector, scale and metadata files of one save only become visible
+        together, when CURRENT is atomically replaced, so concurrent savers
+        (e.g. several workers shutting down) and readers never mix files of
+        different saves. Older versions beyond KEEP_PREVIOUS_VERSIONS are removed.
+        """
+        with self._lock:
+            version = f"v{time.time_ns():020d}-{os.getpid()}"
+            version_dir = os.path.join(directory, version)
+            os.makedirs(version_dir)
+            arrays = {VECTORS_FILE: self._vectors[:self._size] if self._size else np.zeros((0, self.dimensions), dtype=np.float32)}
+            if self.quantize:
+                arrays[SCALES_FILE] = self._scales[:self._size] if self._size else np.zeros(0, dtype=np.float32)
+            meta = {
+                # Queries must be embedded with the same model as the stored vectors
+                "model": get_settings().openai_embedding_model,
+                "dimensions": self.dimensions,
+                "quantize": self.quantize,
+                "ids": self._ids,
+                "documents": self._documents,
+            }
+            
+            for name, array in arrays.items():
+                with open(os.path.join(version_dir, name), "wb") as f:
+                    np.save(f, np.ascontiguousarray(array))
+            with open(os.path.join(version_dir, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            
+            pointer = os.path.join(directory, CURRENT_FILE)
+            with open(f"{pointer}.{version}.tmp", "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(f"{pointer}.{version}.tmp", pointer)
+        
+        _prune_versions(directory, version)
+    
+    @classmethod
+    def load(cls, directory: str) -> Optional["VectorIndex"]:
+        """Memory-map an index written by save(); None if there is none (or it was built with another model)."""
+        pointer = os.path.join(directory, CURRENT_FILE)
+        if os.path.exists(pointer):
+            with open(pointer, "r", encoding="utf-8") as f:
+                directory = os.path.join(directory, f.read().strip())
+        
+        meta_path = os.path.join(directory, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        model = get_settings().openai_embedding_model
+        if meta.get("model") != model:
+            print(f"Vector index in {directory} was built with {meta.get('model')}, not {model}; ignoring it")
+            return None
+        
+        index = cls(meta["dimensions"], meta["quantize"])
+        index._vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+        if index.quantize:
+            index._scales = np.load(os.path.join(directory, SCALES_FILE), mmap_mode="r")
+        index._ids = meta["ids"]
+        index._documents = meta["documents"]
+        index._positions = {ticket_id: i for i, ticket_id in enumerate(index._ids)}
+        index._size = len(index._ids)
+        return index
+
+
+def _prune_versions(directory: str, saved: str) -> None:
+    """Remove versions older than the one just saved, keeping the newest few of them.
+    
+    Newer versions may belong to a concurrent save that has not yet
+    replaced CURRENT, so they are left alone.
+    """
+    older = sorted(name for name in os.listdir(directory)
+                   if name.startswith("v") and name < saved and os.path.isdir(os.path.join(directory, name)))
+    for name in older[:max(len(older) - KEEP_PREVIOUS_VERSIONS, 0)]:
+        # Memory-mapped files stay readable after removal on POSIX
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Get the process-wide index, loading it from VECTOR_INDEX_DIR on first use (None when off)."""
+    global _index
+    
+    if index_mode() == "off":
+        return None
+    
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                settings = get_settings()
+                index = VectorIndex.load(settings.vector_index_dir) if settings.vector_index_dir else None
+                _index = index or VectorIndex(quantize=settings.vector_index_quantize)
+                print(f"📐 Vector index ready with {len(_index)} tickets")
+    
+    return _index
+
+
+def ticket_document(ticket: Ticket) -> Dict[str, Any]:
+    """Fields of a ticket stored alongside its vector."""
+    return {field: ticket.get(field) for field in INDEX_PROPERTIES}
+
+
+def index_tickets(tickets: List[Ticket]) -> bool:
+    """Embed tickets and upsert them into the process-wide index (no-op when off)."""
+    index = get_vector_index()
+    if index is None or not tickets:
+        return False
+    
+    vectors = embed_texts([embedding_text(ticket) for ticket in tickets])
+    if vectors is None:
+        return False
+    
+    index.upsert([ticket["id"] for ticket in tickets], vectors, [ticket_document(ticket) for ticket in tickets])
+    return True
+
+
+def search_local(search_query: str, limit: int = 10, category: Optional[str] = None,
+                 max_distance: Optional[float] = None, properties: Optional[List[str]] = None) -> Optional[List[SearchResult]]:
+    """Vector search on the local index; None if it cannot answer (off, empty or no embedding)."""
+    index = get_vector_index()
+    if index is None or not len(index):
+        return None
+    
+    vectors = embed_texts([search_query])
+    if vectors is None:
+        return None
+    
+    results = index.search(vectors[0], limit, category, max_distance)
+    if properties:
+        keep = set(properties) | {"id", "distance", "score"}
+        results = [{key: value for key, value in result.items() if key in keep} for result in results]
+    return results
+
+
+def save_vector_index() -> bool:
+    """Persist the process-wide index to VECTOR_INDEX_DIR (e.g. at shutdown)."""
+    directory = get_settings().vector_index_dir
+    if _index is None or not directory:
+        return False
+    
+    try:
+        _index.save(directory)
+        return True
+    except Exception as e:
+        print(f"Error saving vector index: {e}")
+        return False
+
+
+# Public API
+vector_index_api = {
+    "VectorIndex": VectorIndex,
+    "index_mode": index_mode,
+    "embed_texts": embed_texts,
+    "get_vector_index": get_vector_index,
+    "index_tickets": index_tickets,
+    "search_local": search_local,
+    "save_vector_index": save_vector_index,
+}
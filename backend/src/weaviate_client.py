@@ -1,30 +1,42 @@
 """Weaviate client configuration."""
 
 import os
+import time
+import asyncio
+import threading
 import weaviate
 from weaviate.classes.init import Auth
-from typing import Optional
-from config import get_weaviate_config
+from typing import Any, Dict, Optional
+from .config import get_settings, get_weaviate_config
 
+# Minimum wait between reconnect attempts while Weaviate is unreachable
+RECONNECT_BACKOFF_SECONDS = 5.0
 
-def create_weaviate_client() -> Optional[weaviate.WeaviateClient]:
-    """Create and return Weaviate client."""
+
+def _connection_params() -> Optional[Dict[str, Any]]:
+    """Cluster URL, credentials and headers for connect_to_weaviate_cloud and its async twin."""
     config = get_weaviate_config()
-    
     if not config:
         print("WEAVIATE_URL or WEAVIATE_API_KEY not configured")
         return None
     
+    # OpenAI API key for the vectorizer, if available
+    openai_key = os.getenv("OPENAI_API_KEY")
+    return {
+        "cluster_url": config["url"],
+        "auth_credentials": Auth.api_key(config["api_key"]),
+        "headers": {"X-Openai-Api-Key": openai_key} if openai_key else {},
+    }
+
+
+def create_weaviate_client() -> Optional[weaviate.WeaviateClient]:
+    """Create and return Weaviate client."""
+    params = _connection_params()
+    if not params:
+        return None
+    
     try:
-        # Get OpenAI API key for headers if available
-        openai_key = os.getenv("OPENAI_API_KEY")
-        headers = {"X-Openai-Api-Key": openai_key} if openai_key else {}
-        
-        client = weaviate.connect_to_weaviate_cloud(
-            cluster_url=config["url"],
-            auth_credentials=Auth.api_key(config["api_key"]),
-            headers=headers
-        )
+        client = weaviate.connect_to_weaviate_cloud(**params)
         
         if not client.is_ready():
             print("Weaviate client is not ready")
@@ -37,14 +49,360 @@ def create_weaviate_client() -> Optional[weaviate.WeaviateClient]:
         return None
 
 
+async def create_async_weaviate_client() -> Optional[weaviate.WeaviateAsyncClient]:
+    """Create and connect an async Weaviate client (bound to the running event loop)."""
+    params = _connection_params()
+    if not params:
+        return None
+    
+    try:
+        client = weaviate.use_async_with_weaviate_cloud(**params)
+        await client.connect()
+        
+        if not await client.is_ready():
+            print("Weaviate async client is not ready")
+            await client.close()
+            return None
+        
+        return client
+        
+    except Exception as e:
+        print(f"Error connecting to Weaviate (async): {e}")
+        return None
+
+
 def close_client(client: Optional[weaviate.WeaviateClient]) -> None:
     """Close Weaviate client connection."""
     if client:
         client.close()
 
 
+class SharedWeaviateClient:
+    """One Weaviate connection per process, health-checked and reconnected on demand.
+    
+    get() returns the connected client, probing it with is_live() at most
+    once per health check interval; a failed probe (or mark_unhealthy()
+    after a failed call) closes the connection and the next get()
+    reconnects, no more often than RECONNECT_BACKOFF_SECONDS.
+    
+    The lock only guards the state: probes and connects run outside it, one
+    at a time, so other callers are never queued behind a slow health check.
+    While one caller reconnects, the others wait for it for at most
+    connect_wait_seconds and then get whatever client it produced.
+    """
+    
+    def __init__(self, health_check_seconds: float = 30.0, connect_wait_seconds: float = 5.0):
+        """Initialize the shared client holder (no connection is made yet)."""
+        self.health_check_seconds = health_check_seconds
+        self.connect_wait_seconds = connect_wait_seconds
+        self._lock = threading.Lock()
+        # Notified whenever a probe or connect finishes
+        self._idle = threading.Condition(self._lock)
+        self._client: Optional[weaviate.WeaviateClient] = None
+        self._last_check = 0.0
+        self._next_connect_at = 0.0
+        # Whether a caller is probing or connecting right now
+        self._busy = False
+        
+        self.connects = 0
+        self.reconnects = 0
+        self.health_check_failures = 0
+        self.last_error: Optional[str] = None
+    
+    def _due(self, now: float) -> Optional[str]:
+        """Maintenance the current state calls for: "probe", "connect" or None."""
+        if self._busy:
+            return None
+        if self._client is not None:
+            return "probe" if now - self._last_check >= self.health_check_seconds else None
+        return "connect" if now >= self._next_connect_at else None
+    
+    def get(self) -> Optional[weaviate.WeaviateClient]:
+        """Get the shared client, connecting or reconnecting if needed."""
+        with self._lock:
+            if self._busy and self._client is None:
+                # Another caller is reconnecting: wait for it instead of failing fast
+                self._idle.wait_for(lambda: not self._busy, timeout=self.connect_wait_seconds)
+                return self._client
+            
+            client = self._client
+            action = self._due(time.monotonic())
+            if action is None:
+                return client
+            self._busy = True
+        
+        try:
+            if action == "probe":
+                live = self._is_live(client)
+                with self._lock:
+                    if live:
+                        self._last_check = time.monotonic()
+                        return self._client
+                    self.health_check_failures += 1
+                    if self._client is client:
+                        self._client = None
+                    connect = time.monotonic() >= self._next_connect_at
+                self._close(client)
+                if not connect:
+                    return None
+            
+            new_client = create_weaviate_client()
+            with self._lock:
+                if new_client is None:
+                    self.last_error = "connection failed"
+                    self._next_connect_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+                    return None
+                if self.connects:
+                    self.reconnects += 1
+                self.connects += 1
+                self._client = new_client
+                self._last_check = time.monotonic()
+                return new_client
+        finally:
+            with self._lock:
+                self._busy = False
+                self._idle.notify_all()
+    
+    def _is_live(self, client: weaviate.WeaviateClient) -> bool:
+        """Cheap liveness probe of an open client."""
+        try:
+            return client.is_live()
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+    
+    def mark_unhealthy(self) -> None:
+        """Force a health check on the next get(), e.g. after a failed request."""
+        with self._lock:
+            self._last_check = 0.0
+    
+    @staticmethod
+    def _close(client: Optional[weaviate.WeaviateClient]) -> None:
+        """Close a connection that is no longer shared."""
+        try:
+            close_client(client)
+        except Exception as e:
+            print(f"Error closing Weaviate client: {e}")
+    
+    def close(self) -> None:
+        """Close the shared connection (at process shutdown)."""
+        with self._lock:
+            client, self._client = self._client, None
+        self._close(client)
+    
+    def status(self) -> Dict[str, Any]:
+        """Connection state and counters for monitoring."""
+        with self._lock:
+            return {
+                "connected": self._client is not None,
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "health_check_failures": self.health_check_failures,
+                "last_error": self.last_error,
+            }
+
+
+_shared_client: Optional[SharedWeaviateClient] = None
+_shared_client_lock = threading.Lock()
+
+
+class SharedAsyncWeaviateClient:
+    """Async counterpart of SharedWeaviateClient for code running on the event loop.
+    
+    The async client is tied to the loop it connected on, so it must only be
+    used (and closed) from that loop: the API process's single server loop.
+    State changes happen between awaits, so no lock is needed; as in the
+    sync holder, one caller at a time probes or reconnects, and the others
+    wait up to connect_wait_seconds for a reconnect to finish.
+    """
+    
+    def __init__(self, health_check_seconds: float = 30.0, connect_wait_seconds: float = 5.0):
+        """Initialize the shared client holder (no connection is made yet)."""
+        self.health_check_seconds = health_check_seconds
+        self.connect_wait_seconds = connect_wait_seconds
+        self._client: Optional[weaviate.WeaviateAsyncClient] = None
+        self._last_check = 0.0
+        self._next_connect_at = 0.0
+        # Whether a caller is probing or connecting right now, and the event
+        # set when it is done (created on the loop that uses it)
+        self._busy = False
+        self._idle: Optional[asyncio.Event] = None
+        
+        self.connects = 0
+        self.reconnects = 0
+        self.health_check_failures = 0
+        self.last_error: Optional[str] = None
+    
+    def _due(self, now: float) -> Optional[str]:
+        """Maintenance the current state calls for: "probe", "connect" or None."""
+        if self._busy:
+            return None
+        if self._client is not None:
+            return "probe" if now - self._last_check >= self.health_check_seconds else None
+        return "connect" if now >= self._next_connect_at else None
+    
+    async def get(self) -> Optional[weaviate.WeaviateAsyncClient]:
+        """Get the shared async client, connecting or reconnecting if needed."""
+        if self._busy and self._client is None and self._idle is not None:
+            # Another caller is reconnecting: wait for it instead of failing fast
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.connect_wait_seconds)
+            except asyncio.TimeoutError:
+                pass
+            return self._client
+        
+        client = self._client
+        action = self._due(time.monotonic())
+        if action is None:
+            return client
+        
+        self._busy = True
+        self._idle = asyncio.Event()
+        try:
+            if action == "probe":
+                if await self._is_live(client):
+                    self._last_check = time.monotonic()
+                    return self._client
+                self.health_check_failures += 1
+                if self._client is client:
+                    self._client = None
+                await self._close(client)
+                if time.monotonic() < self._next_connect_at:
+                    return None
+            
+            new_client = await create_async_weaviate_client()
+            if new_client is None:
+                self.last_error = "connection failed"
+                self._next_connect_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+                return None
+            if self.connects:
+                self.reconnects += 1
+            self.connects += 1
+            self._client = new_client
+            self._last_check = time.monotonic()
+            return new_client
+        finally:
+            self._busy = False
+            self._idle.set()
+    
+    async def _is_live(self, client: weaviate.WeaviateAsyncClient) -> bool:
+        """Cheap liveness probe of an open client."""
+        try:
+            return await client.is_live()
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+    
+    def mark_unhealthy(self) -> None:
+        """Force a health check on the next get(), e.g. after a failed request."""
+        self._last_check = 0.0
+    
+    @staticmethod
+    async def _close(client: Optional[weaviate.WeaviateAsyncClient]) -> None:
+        """Close a connection that is no longer shared."""
+        try:
+            if client:
+                await client.close()
+        except Exception as e:
+            print(f"Error closing Weaviate async client: {e}")
+    
+    async def close(self) -> None:
+        """Close the shared connection (at process shutdown)."""
+        client, self._client = self._client, None
+        await self._close(client)
+    
+    def status(self) -> Dict[str, Any]:
+        """Connection state and counters for monitoring."""
+        return {
+            "connected": self._client is not None,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "health_check_failures": self.health_check_failures,
+            "last_error": self.last_error,
+        }
+
+
+_shared_async_client: Optional[SharedAsyncWeaviateClient] = None
+
+
+def _get_shared_holder() -> SharedWeaviateClient:
+    """Get the process-wide client holder, configured from settings."""
+    global _shared_client
+    
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = SharedWeaviateClient(
+                    get_settings().weaviate_health_check_seconds, get_settings().weaviate_connect_wait_seconds
+                )
+    
+    return _shared_client
+
+
+def get_shared_client() -> Optional[weaviate.WeaviateClient]:
+    """Get the process-wide Weaviate client (None while Weaviate is unreachable)."""
+    return _get_shared_holder().get()
+
+
+def mark_shared_client_unhealthy() -> None:
+    """Have the next get_shared_client() call re-check the connection."""
+    _get_shared_holder().mark_unhealthy()
+
+
+def close_shared_client() -> None:
+    """Close the process-wide Weaviate client."""
+    if _shared_client is not None:
+        _shared_client.close()
+
+
+def shared_client_status() -> Dict[str, Any]:
+    """Connection state of the process-wide Weaviate clients."""
+    status = _get_shared_holder().status()
+    status["async"] = _get_shared_async_holder().status()
+    return status
+
+
+def _get_shared_async_holder() -> SharedAsyncWeaviateClient:
+    """Get the process-wide async client holder, configured from settings."""
+    global _shared_async_client
+    
+    # Only touched from the event loop, so no lock is needed to create it
+    if _shared_async_client is None:
+        _shared_async_client = SharedAsyncWeaviateClient(
+            get_settings().weaviate_health_check_seconds, get_settings().weaviate_connect_wait_seconds
+        )
+    
+    return _shared_async_client
+
+
+async def get_shared_async_client() -> Optional[weaviate.WeaviateAsyncClient]:
+    """Get the process-wide async Weaviate client (None while Weaviate is unreachable)."""
+    return await _get_shared_async_holder().get()
+
+
+def mark_shared_async_client_unhealthy() -> None:
+    """Have the next get_shared_async_client() call re-check the connection."""
+    _get_shared_async_holder().mark_unhealthy()
+
+
+async def close_shared_async_client() -> None:
+    """Close the process-wide async Weaviate client."""
+    if _shared_async_client is not None:
+        await _shared_async_client.close()
+
+
 # Public API
 weaviate_client_api = {
     "create_weaviate_client": create_weaviate_client,
     "close_client": close_client,
+    "SharedWeaviateClient": SharedWeaviateClient,
+    "get_shared_client": get_shared_client,
+    "mark_shared_client_unhealthy": mark_shared_client_unhealthy,
+    "close_shared_client": close_shared_client,
+    "shared_client_status": shared_client_status,
+    "create_async_weaviate_client": create_async_weaviate_client,
+    "SharedAsyncWeaviateClient": SharedAsyncWeaviateClient,
+    "get_shared_async_client": get_shared_async_client,
+    "mark_shared_async_client_unhealthy": mark_shared_async_client_unhealthy,
+    "close_shared_async_client": close_shared_async_client,
 } 
\ No newline at end of file
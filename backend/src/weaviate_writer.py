@@ -0,0 +1,242 @@
+"""Write-behind queue batching ticket document writes to Weaviate."""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from .config import get_settings
+from .weviate_service import WeviateService
+
+# Upper bound on the wait before retrying a batch's failed objects
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+class WeaviateWriter:
+    """Accumulate document upserts and flush them with Weaviate's batch API.
+    
+    Documents are keyed by object UUID, so a ticket updated again before it
+    was flushed is written once with its latest properties. A flush happens
+    when batch_size documents are pending or the oldest has waited
+    flush_interval seconds. At most max_queue documents are held: enqueue
+    then waits up to its timeout and reports False, and callers should shed
+    load (is_full lets them reject a request before writing anything) rather
+    than write to Weaviate directly. Failed objects are re-queued with
+    exponential backoff up to max_retries times.
+    """
+    
+    def __init__(
+        self,
+        weaviate_service: WeviateService,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        enqueue_timeout: float = 2.0,
+    ):
+        """Initialize the writer (call start() to begin flushing)."""
+        self.weaviate_service = weaviate_service
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.enqueue_timeout = enqueue_timeout
+        
+        self._condition = threading.Condition()
+        # uuid -> (properties, attempts, not-before time), oldest first
+        self._pending: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        # Enqueue time of documents not yet attempted, and retry time of failed ones
+        self._enqueued_at: Dict[str, float] = {}
+        self._retrying: Dict[str, float] = {}
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self.enqueued = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.written = 0
+        self.retried = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.last_error: Optional[str] = None
+    
+    def enqueue(self, uuid: str, properties: Dict[str, Any], timeout: float = 0.0) -> bool:
+        """Queue a document upsert; False if the queue stayed full for `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while uuid not in self._pending and len(self._pending) >= self.max_queue and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    return False
+                self._condition.wait(remaining)
+            
+            if self._stopping:
+                self.rejected += 1
+                return False
+            
+            if uuid in self._pending:
+                self.coalesced += 1
+            if uuid not in self._pending or self._retrying.pop(uuid, None) is not None:
+                # New, or replacing a failed write that was waiting for its retry
+                self._enqueued_at[uuid] = time.monotonic()
+            self._pending[uuid] = (properties, 0, 0.0)
+            self.enqueued += 1
+            
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+            return True
+    
+    def is_full(self) -> bool:
+        """Whether the queue holds max_queue documents (new writes would have to wait)."""
+        with self._condition:
+            return len(self._pending) >= self.max_queue
+    
+    def _ready_batch(self, now: float, draining: bool) -> Dict[str, Tuple[Dict[str, Any], int]]:
+        """Take up to batch_size documents whose retry delay has passed."""
+        batch: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        for uuid, (properties, attempts, not_before) in self._pending.items():
+            if not_before <= now or draining:
+                batch[uuid] = (properties, attempts)
+                if len(batch) >= self.batch_size:
+                    break
+        
+        for uuid in batch:
+            del self._pending[uuid]
+            self._retrying.pop(uuid, None)
+        self._condition.notify_all()
+        return batch
+    
+    def _should_flush(self, now: float) -> bool:
+        """Whether a full batch is waiting, the oldest document waited long enough or a retry is due.
+        
+        Documents waiting out a retry delay do not count, so a failing batch
+        backs off instead of being flushed again in small pieces.
+        """
+        if len(self._pending) - len(self._retrying) >= self.batch_size:
+            return True
+        oldest = next(iter(self._enqueued_at.values()), None)
+        if oldest is not None and now - oldest >= self.flush_interval:
+            return True
+        return any(retry_at <= now for retry_at in self._retrying.values())
+    
+    def _flush(self, batch: Dict[str, Tuple[Dict[str, Any], int]]) -> None:
+        """Write one batch and re-queue (or drop) the objects that failed."""
+        started = time.perf_counter()
+        try:
+            failed = set(self.weaviate_service.batch_upsert_documents({uuid: properties for uuid, (properties, _) in batch.items()}))
+        except Exception as e:
+            self.last_error = str(e)
+            failed = set(batch)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        
+        with self._condition:
+            self.batches += 1
+            self.written += len(batch) - len(failed)
+            for uuid in batch:
+                if uuid not in failed:
+                    # A newer version enqueued during the flush keeps its timestamp
+                    if uuid not in self._pending:
+                        self._enqueued_at.pop(uuid, None)
+                    continue
+                
+                properties, attempts = batch[uuid]
+                if uuid in self._pending:
+                    # Superseded by a newer version, which will be written instead
+                    continue
+                if attempts >= self.max_retries:
+                    self.dropped += 1
+                    self._enqueued_at.pop(uuid, None)
+                    print(f"⚠️ Dropping Weaviate document {uuid} after {attempts + 1} failed writes")
+                    continue
+                
+                self.retried += 1
+                delay = min(MAX_RETRY_DELAY_SECONDS, self.flush_interval * 2 ** attempts)
+                retry_at = time.monotonic() + delay
+                self._pending[uuid] = (properties, attempts + 1, retry_at)
+                self._enqueued_at.pop(uuid, None)
+                self._retrying[uuid] = retry_at
+    
+    def _run(self) -> None:
+        """Flush loop of the background thread.
+        
+        When stopping, retry delays are skipped so the queue drains promptly;
+        objects still failing are dropped once they run out of retries.
+        """
+        while True:
+            with self._condition:
+                while not self._stopping and not self._should_flush(time.monotonic()):
+                    self._condition.wait(self.flush_interval / 4)
+                
+                draining = self._stopping
+                if draining and not self._pending:
+                    return
+                batch = self._ready_batch(time.monotonic(), draining)
+            
+            if batch:
+                self._flush(batch)
+            else:
+                # Only documents waiting out a retry delay are pending
+                time.sleep(self.flush_interval / 4)
+    
+    def start(self) -> None:
+        """Start flushing on a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="weaviate-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 30.0) -> None:
+        """Flush everything still queued, then stop the background thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                print(f"⚠️ Weaviate writer still flushing after {timeout}s; {len(self._pending)} documents pending")
+            self._thread = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, throughput and failure counters for monitoring."""
+        with self._condition:
+            oldest = next(iter(self._enqueued_at.values()), None)
+            return {
+                "running": bool(self._thread and self._thread.is_alive()),
+                "queue_depth": len(self._pending),
+                "retrying": len(self._retrying),
+                "max_queue": self.max_queue,
+                "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+                "enqueued": self.enqueued,
+                "coalesced": self.coalesced,
+                "rejected": self.rejected,
+                "written": self.written,
+                "retried": self.retried,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "last_flush_ms": round(self.last_flush_ms, 1),
+                "last_error": self.last_error,
+            }
+
+
+def create_weaviate_writer(weaviate_service: WeviateService) -> WeaviateWriter:
+    """Create a WeaviateWriter configured from settings."""
+    settings = get_settings()
+    return WeaviateWriter(
+        weaviate_service,
+        max_queue=settings.weaviate_write_queue_size,
+        batch_size=settings.weaviate_write_batch_size,
+        flush_interval=settings.weaviate_write_flush_seconds,
+        max_retries=settings.weaviate_write_max_retries,
+        enqueue_timeout=settings.weaviate_write_enqueue_timeout_seconds,
+    )
+
+
+# Public API
+weaviate_writer_api = {
+    "WeaviateWriter": WeaviateWriter,
+    "create_weaviate_writer": create_weaviate_writer,
+}
@@ -1,10 +1,89 @@
 """Weviate service for document management."""
 
-from typing import List, Optional, Dict, Any
+import asyncio
+from typing import List, Optional, Dict, Any, Tuple
 import weaviate
-from weaviate.classes.query import Filter
-from ticket_types import Ticket
-from weaviate_client import create_weaviate_client, close_client
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.util import generate_uuid5
+from .ticket_types import Ticket, SearchResult
+from .vector_index import index_mode, search_local
+from .weaviate_client import (
+    get_shared_client,
+    mark_shared_client_unhealthy,
+    close_shared_client,
+    shared_client_status,
+    get_shared_async_client,
+    mark_shared_async_client_unhealthy,
+    close_shared_async_client,
+)
+
+
+# Search modes: "vector" (near_text), "bm25" (keyword) and "hybrid" (both, weighted by alpha)
+SEARCH_MODES = ("vector", "bm25", "hybrid")
+
+# Properties of a Tickets collection object
+TICKET_PROPERTIES = ["issue_id", "problem", "solution", "category", "created_at"]
+
+
+def _search_call(query_api: Any, search_query: str, limit: int, mode: str, alpha: float,
+                 category: Optional[str], properties: Optional[List[str]]) -> Tuple[Any, Dict[str, Any]]:
+    """Query method and arguments for a search mode (shared by the sync and async services)."""
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode!r}; expected one of {', '.join(SEARCH_MODES)}")
+    
+    # issue_id is always fetched so results map back to tickets
+    properties = [prop for prop in (properties or TICKET_PROPERTIES) if prop in TICKET_PROPERTIES]
+    kwargs: Dict[str, Any] = {
+        "query": search_query,
+        "limit": limit,
+        "filters": Filter.by_property("category").equal(category) if category else None,
+        "return_properties": list(dict.fromkeys(["issue_id"] + properties)),
+    }
+    
+    if mode == "vector":
+        kwargs["return_metadata"] = MetadataQuery(distance=True)
+        return query_api.near_text, kwargs
+    
+    kwargs["return_metadata"] = MetadataQuery(score=True)
+    if mode == "hybrid":
+        kwargs["alpha"] = alpha
+        return query_api.hybrid, kwargs
+    return query_api.bm25, kwargs
+
+
+def _local_index_mode(search_mode: str) -> str:
+    """Local vector index mode that applies to a search ("off" unless it is a vector search)."""
+    if search_mode != "vector":
+        return "off"
+    return index_mode()
+
+
+def _search_result(obj: Any) -> SearchResult:
+    """Map a Tickets collection object to a SearchResult (issue_id becomes id)."""
+    result: Dict[str, Any] = {"id": str(obj.properties.get("issue_id") or obj.uuid)}
+    for prop in TICKET_PROPERTIES[1:]:
+        if prop in obj.properties:
+            result[prop] = obj.properties[prop]
+    result["distance"] = obj.metadata.distance
+    result["score"] = obj.metadata.score
+    return result
+
+
+def document_uuid(ticket_id: str) -> str:
+    """Deterministic Weaviate object UUID for a ticket, so re-indexing overwrites it."""
+    return generate_uuid5(ticket_id)
+
+
+def ticket_to_document(ticket: Ticket) -> Dict[str, Any]:
+    """Weaviate properties for a ticket (using compatible field names)."""
+    return {
+        "issue_id": ticket["id"],
+        "problem": ticket.get("problem", ""),
+        "solution": ticket.get("solution", ""),
+        "category": ticket.get("category", ""),
+        "created_at": ticket.get("created_at", "")
+    }
 
 
 class WeviateService:
@@ -12,43 +91,116 @@ class WeviateService:
     
     def __init__(self, collection_name: str = "Documents"):
         """Initialize WeviateService."""
-        self.client: Optional[weaviate.WeaviateClient] = None
         self.collection_name = collection_name
+        self._connected = False
+    
+    @property
+    def client(self) -> Optional[weaviate.WeaviateClient]:
+        """The process-wide Weaviate client (reconnected after failures), once connected."""
+        return get_shared_client() if self._connected else None
     
     def connect(self) -> bool:
-        """Connect to Weaviate."""
-        self.client = create_weaviate_client()
-        return self.client is not None
+        """Connect to Weaviate through the shared client."""
+        self._connected = True
+        if get_shared_client() is None:
+            self._connected = False
+        return self._connected
     
     def disconnect(self) -> None:
-        """Disconnect from Weaviate."""
-        if self.client:
-            close_client(self.client)
-            self.client = None
-    
-    def add_document(self, document: Dict[str, Any]) -> bool:
-        """Add a document to Weaviate collection."""
-        if not self.client:
+        """Stop using Weaviate; the shared connection stays open for other users."""
+        self._connected = False
+    
+    def collection_exists(self) -> bool:
+        """Check that the collection exists in Weaviate."""
+        client = self.client
+        if not client:
+            print("Client not connected")
+            return False
+        
+        try:
+            return client.collections.exists(self.collection_name)
+        except Exception as e:
+            print(f"Error checking collection: {e}")
+            mark_shared_client_unhealthy()
+            return False
+    
+    def add_document(self, document: Dict[str, Any], uuid: Optional[str] = None) -> bool:
+        """Add a document to Weaviate collection, replacing the object if the UUID exists."""
+        if uuid is not None:
+            # A plain insert is rejected for an existing UUID
+            return self.upsert_documents({uuid: document})
+        client = self.client
+        if not client:
             print("Client not connected")
             return False
         
         try:
-            collection = self.client.collections.get(self.collection_name)
-            collection.data.insert(properties=document)
+            collection = client.collections.get(self.collection_name)
+            collection.data.insert(properties=document, uuid=uuid)
             return True
             
         except Exception as e:
             print(f"Error adding document: {e}")
+            mark_shared_client_unhealthy()
+            return False
+    
+    def upsert_documents(self, documents: Dict[str, Dict[str, Any]]) -> bool:
+        """Insert or replace documents keyed by object UUID in one batch request."""
+        client = self.client
+        if not client:
+            print("Client not connected")
+            return False
+        if not documents:
+            return True
+        
+        try:
+            collection = client.collections.get(self.collection_name)
+            result = collection.data.insert_many([
+                DataObject(properties=properties, uuid=uuid)
+                for uuid, properties in documents.items()
+            ])
+            if result.has_errors:
+                print(f"Number of failed documents: {len(result.errors)}")
+                return False
+            return True
+            
+        except Exception as e:
+            print(f"Error upserting documents: {e}")
+            mark_shared_client_unhealthy()
             return False
     
+    def batch_upsert_documents(self, documents: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Insert or replace documents through the batch API; returns the UUIDs that failed."""
+        client = self.client
+        if not client:
+            print("Client not connected")
+            return list(documents)
+        if not documents:
+            return []
+        
+        try:
+            collection = client.collections.get(self.collection_name)
+            
+            with collection.batch.fixed_size(batch_size=len(documents)) as batch:
+                for uuid, properties in documents.items():
+                    batch.add_object(properties=properties, uuid=uuid)
+            
+            return [str(failed.object_.uuid) for failed in collection.batch.failed_objects]
+            
+        except Exception as e:
+            print(f"Error adding documents in batch: {e}")
+            mark_shared_client_unhealthy()
+            return list(documents)
+    
     def add_documents_batch(self, documents: List[Dict[str, Any]]) -> bool:
         """Add multiple documents to Weaviate collection in batch."""
-        if not self.client:
+        client = self.client
+        if not client:
             print("Client not connected")
             return False
         
         try:
-            collection = self.client.collections.get(self.collection_name)
+            collection = client.collections.get(self.collection_name)
             
             with collection.batch.fixed_size(batch_size=100) as batch:
                 for doc in documents:
@@ -67,39 +219,161 @@ class WeviateService:
             
         except Exception as e:
             print(f"Error adding documents in batch: {e}")
+            mark_shared_client_unhealthy()
             return False
     
-    def query(self, search_query: str, limit: int = 10) -> List[Ticket]:
-        """Query documents from Weaviate using semantic search."""
-        if not self.client:
-            print("Client not connected")
+    def query(self, search_query: str, limit: int = 10, mode: str = "vector", alpha: float = 0.5,
+              category: Optional[str] = None, properties: Optional[List[str]] = None) -> List[SearchResult]:
+        """Search tickets by meaning ("vector"), keywords ("bm25") or both ("hybrid").
+        
+        alpha weights hybrid search from pure keyword (0) to pure vector (1).
+        category pre-filters on the exact category; properties limits the
+        returned ticket fields. Raises ValueError for an unknown mode.
+        
+        Vector searches are answered from the local vector index first when
+        VECTOR_INDEX_MODE is primary, or when Weaviate fails in fallback mode.
+        """
+        local_mode = _local_index_mode(mode)
+        if local_mode == "primary":
+            results = search_local(search_query, limit, category, properties=properties)
+            if results is not None:
+                return results
+        
+        try:
+            client = self.client
+            if not client:
+                print("Client not connected")
+                return (search_local(search_query, limit, category, properties=properties) or []) if local_mode == "fallback" else []
+            
+            collection = client.collections.get(self.collection_name)
+            method, kwargs = _search_call(collection.query, search_query, limit, mode, alpha, category, properties)
+            response = method(**kwargs)
+            return [_search_result(obj) for obj in response.objects]
+            
+        except ValueError:
+            # Unknown search mode: the caller's mistake, not a Weaviate failure
+            raise
+        except Exception as e:
+            print(f"Error querying Weaviate: {e}")
+            mark_shared_client_unhealthy()
+            if local_mode == "fallback":
+                return search_local(search_query, limit, category, properties=properties) or []
             return []
+
+
+class AsyncWeviateService:
+    """WeviateService counterpart on the async Weaviate client.
+    
+    For request handlers and agent tools: calls await the network instead of
+    blocking the event loop, so concurrent requests overlap.
+    """
+    
+    def __init__(self, collection_name: str = "Documents"):
+        """Initialize AsyncWeviateService."""
+        self.collection_name = collection_name
+        self._connected = False
+    
+    async def _client(self) -> Optional[weaviate.WeaviateAsyncClient]:
+        """The process-wide async client, once connected."""
+        if not self._connected:
+            print("Client not connected")
+            return None
+        return await get_shared_async_client()
+    
+    async def connect(self) -> bool:
+        """Connect to Weaviate through the shared async client."""
+        self._connected = await get_shared_async_client() is not None
+        return self._connected
+    
+    def disconnect(self) -> None:
+        """Stop using Weaviate; the shared connection stays open for other users."""
+        self._connected = False
+    
+    async def collection_exists(self) -> bool:
+        """Check that the collection exists in Weaviate."""
+        client = await self._client()
+        if not client:
+            return False
+        
+        try:
+            return await client.collections.exists(self.collection_name)
+        except Exception as e:
+            print(f"Error checking collection: {e}")
+            mark_shared_async_client_unhealthy()
+            return False
+    
+    async def add_document(self, document: Dict[str, Any], uuid: Optional[str] = None) -> bool:
+        """Add a document to Weaviate collection, replacing the object if the UUID exists."""
+        if uuid is not None:
+            # A plain insert is rejected for an existing UUID
+            return await self.upsert_documents({uuid: document})
+        client = await self._client()
+        if not client:
+            return False
         
         try:
-            collection = self.client.collections.get(self.collection_name)
-            response = collection.query.near_text(
-                query=search_query,
-                limit=limit
-            )
+            collection = client.collections.get(self.collection_name)
+            await collection.data.insert(properties=document, uuid=uuid)
+            return True
             
-            tickets: List[Ticket] = []
-            for obj in response.objects:
-                # Extract properties and convert to strings
-                doc_id = obj.properties.get("id", str(obj.uuid))
-                doc_description = obj.properties.get("description", "")
-                
-                tickets.append({
-                    "id": str(doc_id),
-                    "description": str(doc_description)
-                })
+        except Exception as e:
+            print(f"Error adding document: {e}")
+            mark_shared_async_client_unhealthy()
+            return False
+    
+    async def upsert_documents(self, documents: Dict[str, Dict[str, Any]]) -> bool:
+        """Insert or replace documents keyed by object UUID in one batch request."""
+        client = await self._client()
+        if not client:
+            return False
+        if not documents:
+            return True
+        
+        try:
+            collection = client.collections.get(self.collection_name)
+            result = await collection.data.insert_many([
+                DataObject(properties=properties, uuid=uuid)
+                for uuid, properties in documents.items()
+            ])
+            if result.has_errors:
+                print(f"Number of failed documents: {len(result.errors)}")
+                return False
+            return True
+            
+        except Exception as e:
+            print(f"Error upserting documents: {e}")
+            mark_shared_async_client_unhealthy()
+            return False
+    
+    async def query(self, search_query: str, limit: int = 10, mode: str = "vector", alpha: float = 0.5,
+                    category: Optional[str] = None, properties: Optional[List[str]] = None) -> List[SearchResult]:
+        """Search tickets by meaning, keywords or both (see WeviateService.query)."""
+        local_mode = _local_index_mode(mode)
+        if local_mode == "primary":
+            results = await asyncio.to_thread(search_local, search_query, limit, category, None, properties)
+            if results is not None:
+                return results
+        
+        try:
+            client = await self._client()
+            if not client:
+                if local_mode == "fallback":
+                    return await asyncio.to_thread(search_local, search_query, limit, category, None, properties) or []
+                return []
             
-            return tickets
+            collection = client.collections.get(self.collection_name)
+            method, kwargs = _search_call(collection.query, search_query, limit, mode, alpha, category, properties)
+            response = await method(**kwargs)
+            return [_search_result(obj) for obj in response.objects]
             
+        except ValueError:
+            raise
         except Exception as e:
             print(f"Error querying Weaviate: {e}")
+            mark_shared_async_client_unhealthy()
+            if local_mode == "fallback":
+                return await asyncio.to_thread(search_local, search_query, limit, category, None, properties) or []
             return []
-    
-
 
 
 def create_weviate_service(collection_name: str = "Documents") -> WeviateService:
@@ -107,8 +381,19 @@ def create_weviate_service(collection_name: str = "Documents") -> WeviateService
     return WeviateService(collection_name)
 
 
+def create_async_weviate_service(collection_name: str = "Documents") -> AsyncWeviateService:
+    """Create AsyncWeviateService instance."""
+    return AsyncWeviateService(collection_name)
+
+
 # Public API
 weviate_api = {
     "WeviateService": WeviateService,
+    "AsyncWeviateService": AsyncWeviateService,
     "create_weviate_service": create_weviate_service,
+    "create_async_weviate_service": create_async_weviate_service,
+    "SEARCH_MODES": SEARCH_MODES,
+    "TICKET_PROPERTIES": TICKET_PROPERTIES,
+    "document_uuid": document_uuid,
+    "ticket_to_document": ticket_to_document,
 } 
\ No newline at end of file
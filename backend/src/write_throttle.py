@@ -0,0 +1,223 @@
+"""Adaptive (AIMD) concurrency and batch-size control for DynamoDB writes."""
+
+import time
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from botocore.exceptions import ClientError
+from .config import get_settings
+
+# Error codes DynamoDB returns when a table, index or account is over capacity
+THROTTLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Whether an exception is a DynamoDB capacity throttle."""
+    return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in THROTTLE_ERROR_CODES
+
+
+def response_retry_attempts(response: Optional[Dict[str, Any]]) -> int:
+    """Retries botocore made before a call succeeded (throttles it absorbed)."""
+    return int(((response or {}).get("ResponseMetadata") or {}).get("RetryAttempts", 0))
+
+
+class AdaptiveWriteController:
+    """Additive-increase / multiplicative-decrease limiter for writes.
+    
+    Writers hold a slot for the duration of each call. Successful calls grow
+    the concurrency limit by roughly one slot per round of calls and grow the
+    batch size by one item; throttles (errors, UnprocessedItems, or retries
+    botocore absorbed) halve both, at most once per cooldown window so a
+    burst of throttled responses counts as one congestion event. Latency
+    above the optional target is treated as a softer congestion signal.
+    """
+    
+    def __init__(
+        self,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        initial_concurrency: int = 4,
+        max_batch_size: int = 25,
+        decrease_factor: float = 0.5,
+        latency_target_ms: float = 0.0,
+        base_backoff_seconds: float = 0.05,
+        max_backoff_seconds: float = 5.0,
+        cooldown_seconds: float = 0.5,
+    ):
+        """Initialize the controller."""
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.max_batch_size = max_batch_size
+        self.decrease_factor = decrease_factor
+        self.latency_target_ms = latency_target_ms
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.cooldown_seconds = cooldown_seconds
+        
+        self._condition = threading.Condition()
+        self._concurrency = float(min(self.max_concurrency, max(self.min_concurrency, initial_concurrency)))
+        self._batch_size = max_batch_size
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._consecutive_throttles = 0
+        self._latency_ewma_ms = 0.0
+        
+        self.calls = 0
+        self.items_written = 0
+        self.throttles = 0
+        self.decreases = 0
+        self.backoff_seconds = 0.0
+        self.wait_seconds = 0.0
+    
+    @property
+    def concurrency(self) -> int:
+        """Current number of writes allowed in flight."""
+        return int(self._concurrency)
+    
+    @property
+    def batch_size(self) -> int:
+        """Current number of items per batch write."""
+        return self._batch_size
+    
+    def acquire(self) -> None:
+        """Block until a write slot is free under the current limit."""
+        started = time.monotonic()
+        with self._condition:
+            while self._in_flight >= int(self._concurrency):
+                self._condition.wait()
+            self._in_flight += 1
+            self.wait_seconds += time.monotonic() - started
+    
+    def release(self) -> None:
+        """Return a write slot."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+    
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a write slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def _decrease(self) -> None:
+        """Multiplicative decrease, once per cooldown window (caller holds the lock)."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        
+        self._last_decrease = now
+        self._concurrency = max(float(self.min_concurrency), self._concurrency * self.decrease_factor)
+        self._batch_size = max(1, int(self._batch_size * self.decrease_factor))
+        self.decreases += 1
+    
+    def record_write(self, items: int, latency_seconds: float, throttled_ratio: float = 0.0) -> None:
+        """Record a completed write call.
+        
+        throttled_ratio is the share of the call DynamoDB pushed back on: the
+        UnprocessedItems fraction of a batch, or 1.0 when botocore had to
+        retry the call. Any throttling shrinks the limits; a clean call grows
+        them unless latency is above target.
+        """
+        latency_ms = latency_seconds * 1000
+        with self._condition:
+            self.calls += 1
+            self.items_written += items
+            self._latency_ewma_ms = latency_ms if not self._latency_ewma_ms else 0.8 * self._latency_ewma_ms + 0.2 * latency_ms
+            
+            if throttled_ratio > 0:
+                self.throttles += 1
+                self._consecutive_throttles += 1
+                self._decrease()
+                return
+            
+            self._consecutive_throttles = 0
+            if self.latency_target_ms and self._latency_ewma_ms > self.latency_target_ms:
+                self._decrease()
+            else:
+                self._concurrency = min(float(self.max_concurrency), self._concurrency + 1.0 / self._concurrency)
+                self._batch_size = min(self.max_batch_size, self._batch_size + 1)
+            self._condition.notify_all()
+    
+    def record_throttle(self) -> None:
+        """Record a call rejected outright with a throttling error."""
+        with self._condition:
+            self.throttles += 1
+            self._consecutive_throttles += 1
+            self._decrease()
+    
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, longer while throttles keep coming."""
+        with self._condition:
+            exponent = attempt + min(self._consecutive_throttles, 4)
+            delay = random.uniform(0, min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** exponent)))
+            self.backoff_seconds += delay
+        return delay
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limits and counters for metrics."""
+        with self._condition:
+            return {
+                "concurrency": int(self._concurrency),
+                "min_concurrency": self.min_concurrency,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "batch_size": self._batch_size,
+                "max_batch_size": self.max_batch_size,
+                "latency_ewma_ms": round(self._latency_ewma_ms, 2),
+                "latency_target_ms": self.latency_target_ms,
+                "calls": self.calls,
+                "items_written": self.items_written,
+                "throttles": self.throttles,
+                "consecutive_throttles": self._consecutive_throttles,
+                "decreases": self.decreases,
+                "backoff_seconds": round(self.backoff_seconds, 3),
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+# One controller per process so API writes and bulk jobs share the same view of capacity
+_write_controller: Optional[AdaptiveWriteController] = None
+_controller_lock = threading.Lock()
+
+
+def get_write_controller() -> AdaptiveWriteController:
+    """Get the shared write controller, configured from settings."""
+    global _write_controller
+    
+    if _write_controller is None:
+        with _controller_lock:
+            if _write_controller is None:
+                settings = get_settings()
+                _write_controller = AdaptiveWriteController(
+                    min_concurrency=settings.dynamodb_write_min_concurrency,
+                    max_concurrency=settings.dynamodb_write_max_concurrency,
+                    initial_concurrency=settings.dynamodb_write_initial_concurrency,
+                    latency_target_ms=settings.dynamodb_write_latency_target_ms,
+                )
+    
+    return _write_controller
+
+
+def write_controller_metrics() -> Dict[str, Any]:
+    """Snapshot of the shared write controller."""
+    return get_write_controller().snapshot()
+
+
+# Public API
+write_throttle_api = {
+    "THROTTLE_ERROR_CODES": THROTTLE_ERROR_CODES,
+    "AdaptiveWriteController": AdaptiveWriteController,
+    "is_throttle_error": is_throttle_error,
+    "response_retry_attempts": response_retry_attempts,
+    "get_write_controller": get_write_controller,
+    "write_controller_metrics": write_controller_metrics,
+}
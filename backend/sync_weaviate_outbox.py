@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Apply ticket change outbox events to Weaviate outside the API process."""
+
+import sys
+import time
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+
+from src.config import get_settings
+from src.dynamodb_client import create_table_if_not_exists
+from src.weviate_service import create_weviate_service, close_shared_client
+from src.outbox_consumer import create_outbox_consumer
+
+# Load environment variables
+load_dotenv()
+
+
+def sync_weaviate(once=False, replay_from=None):
+    """Run the outbox consumer until interrupted (or until caught up with --once)."""
+    print("=== Syncing Weaviate from the Ticket Outbox ===")
+    
+    if not get_settings().ticket_outbox_enabled:
+        print("❌ Set TICKET_OUTBOX_ENABLED=true so ticket writes record outbox events")
+        return False
+    
+    if not create_table_if_not_exists():
+        print("❌ Could not create/access DynamoDB tables")
+        return False
+    
+    weaviate_service = create_weviate_service("Tickets")
+    if not weaviate_service.connect():
+        print("❌ Could not connect to Weaviate")
+        return False
+    
+    consumer = create_outbox_consumer(weaviate_service)
+    try:
+        if replay_from:
+            position = consumer.replay(replay_from)
+            print(f"⏪ Replaying events recorded after {position}")
+        
+        print(f"📍 Checkpoint: {consumer.checkpoint or '(start of outbox)'}")
+        
+        if once:
+            applied = consumer.run_until_caught_up()
+            print(f"📊 Applied {applied} events")
+            return True
+        
+        consumer.start()
+        print("🔄 Polling for changes (Ctrl+C to stop)...")
+        while True:
+            time.sleep(30)
+            metrics = consumer.metrics()
+            print(f"   📝 {metrics['events_applied']} events applied, lag {metrics['lag_seconds']}s, "
+                  f"{metrics['failures']} failures")
+    
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping...")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error applying outbox events: {e}")
+        return False
+    
+    finally:
+        consumer.stop()
+        weaviate_service.disconnect()
+        close_shared_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--once", action="store_true", help="Apply pending events and exit")
+    parser.add_argument("--replay-from", type=datetime.fromisoformat, default=None,
+                        help="ISO timestamp; re-apply events recorded after it (within the outbox retention)")
+    args = parser.parse_args()
+    
+    success = sync_weaviate(args.once, args.replay_from)
+    
+    if not success:
+        print("\n❌ Outbox sync failed")
+        print("💡 The checkpoint only advances after a batch is applied; re-run to retry")
+        sys.exit(1)
@@ -2,23 +2,19 @@
 """Test DynamoDB client functionality."""
 
 import asyncio
-from src.dynamodb_client import (
-    create_table_if_not_exists, 
-    save_ticket, 
-    get_ticket_by_id, 
-    list_tickets,
-    query_tickets_by_category
-)
+from src.ticket_store import get_ticket_store
 from src.openai_service import create_ticket_agent
 
 
 async def test_dynamodb():
     """Test DynamoDB functionality."""
     print("=== DynamoDB Client Test ===\n")
+    store = get_ticket_store()
+    print(f"Storage backend: {store.name}\n")
     
     # Test 1: Create table
     print("1. Creating/verifying table...")
-    if create_table_if_not_exists():
+    if store.ensure_schema():
         print("✅ Table ready")
     else:
         print("❌ Table creation failed")
@@ -46,7 +42,7 @@ async def test_dynamodb():
     
     # Test 3: Get ticket by ID
     print(f"\n3. Retrieving ticket {ticket['id']}...")
-    retrieved = get_ticket_by_id(ticket['id'])
+    retrieved = store.get_ticket_by_id(ticket['id'])
     if retrieved:
         print(f"✅ Retrieved: {retrieved['problem']}")
     else:
@@ -54,7 +50,7 @@ async def test_dynamodb():
     
     # Test 4: List all tickets
     print("\n4. Listing all tickets...")
-    tickets = list_tickets(limit=10)
+    tickets = store.list_tickets(limit=10)["tickets"]
     print(f"✅ Found {len(tickets)} total tickets")
     
     for t in tickets[:3]:  # Show first 3
@@ -62,7 +58,7 @@ async def test_dynamodb():
     
     # Test 5: Query by category
     print(f"\n5. Querying tickets in category '{ticket['category']}'...")
-    category_tickets = query_tickets_by_category(ticket['category'])
+    category_tickets = store.query_tickets_by_category(ticket['category'])["tickets"]
     print(f"✅ Found {len(category_tickets)} tickets in this category")
     
     print("\n🎉 DynamoDB test completed successfully!")
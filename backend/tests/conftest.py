@@ -0,0 +1,49 @@
+"""Shared fixtures: a moto-backed DynamoDB with the tickets tables created."""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tests import the package as src, like the scripts next to it
+sys.path.insert(0, BACKEND_DIR)
+
+moto = pytest.importorskip("moto")
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """Set environment variables and reload settings; returns a setter."""
+    from src import config
+    
+    def set_env(**values):
+        for key, value in values.items():
+            monkeypatch.setenv(key, str(value))
+        config.get_settings.cache_clear()
+    
+    set_env(
+        AWS_ACCESS_KEY_ID="testing",
+        AWS_SECRET_ACCESS_KEY="testing",
+        AWS_REGION="us-east-1",
+        DYNAMODB_TABLE_NAME="tickets_test",
+        TICKET_CACHE_ENABLED="False",
+        TICKET_OUTBOX_ENABLED="False",
+        TICKET_INDEX_SHARDS="1",
+        TICKET_ARCHIVE_DIR="",
+        API_SECRET_KEY="",
+    )
+    yield set_env
+    config.get_settings.cache_clear()
+
+
+@pytest.fixture
+def dynamodb(settings_env):
+    """Mocked DynamoDB with the tickets, stats (and outbox) tables created."""
+    from src import dynamodb_client
+    
+    with moto.mock_aws():
+        dynamodb_client.reset_dynamodb_client()
+        assert dynamodb_client.create_table_if_not_exists()
+        yield dynamodb_client
+        dynamodb_client.reset_dynamodb_client()
@@ -0,0 +1,63 @@
+"""SQLite embedding cache and input truncation."""
+
+import sqlite3
+
+from src import embedding_cache
+from src.embedding_cache import EmbeddingCache, truncate_for_embedding
+
+
+def _last_used(path, key):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT last_used FROM embeddings WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_hits_refresh_last_used_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "TOUCH_FLUSH_SIZE", 3)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("m", {"a": [1.0], "b": [2.0], "c": [3.0]})
+    stored = _last_used(path, "a")
+    
+    assert cache.get_many(["a", "b", "missing"]) == {"a": [1.0], "b": [2.0]}
+    assert _last_used(path, "a") == stored
+    
+    cache.get_many(["c"])
+    assert _last_used(path, "a") > stored
+    assert cache.stats()["hits"] == 3
+    cache.close()
+
+
+def test_eviction_sees_buffered_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path, max_entries=2)
+    cache.put_many("m", {"a": [1.0]})
+    cache.put_many("m", {"b": [2.0]})
+    
+    cache.get_many(["a"])
+    cache.put_many("m", {"c": [3.0]})
+    
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    cache.close()
+
+
+def test_close_writes_buffered_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("m", {"a": [1.0]})
+    stored = _last_used(path, "a")
+    
+    cache.get_many(["a"])
+    cache.close()
+    
+    assert _last_used(path, "a") > stored
+
+
+def test_truncation_without_tiktoken_keeps_a_character_budget(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "tiktoken", None)
+    embedding_cache._encoding.cache_clear()
+    
+    text = "word " * 20000
+    
+    assert truncate_for_embedding("short", "text-embedding-ada-002") == "short"
+    assert truncate_for_embedding(text, "text-embedding-ada-002", max_tokens=100) == text[:100 * embedding_cache.FALLBACK_CHARS_PER_TOKEN]
+    embedding_cache._encoding.cache_clear()
@@ -0,0 +1,35 @@
+"""Batched reads by ticket ID against a mocked DynamoDB table."""
+
+import pytest
+
+
+class UnprocessedClient:
+    """Stands in for the resource when BatchGetItem never processes some keys."""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def batch_get_item(self, RequestItems):
+        self.requests.append(RequestItems)
+        table_name, request = next(iter(RequestItems.items()))
+        return {"Responses": {table_name: []}, "UnprocessedKeys": {table_name: request}}
+
+
+def test_results_follow_request_order_and_skip_missing(dynamodb):
+    for ticket_id in ("a", "b", "c"):
+        dynamodb.save_ticket({"id": ticket_id, "problem": f"Problem {ticket_id}", "category": "General"})
+    
+    tickets = dynamodb.get_tickets_by_ids(["c", "missing", "a", "c"], consistent_read=True)
+    
+    assert [ticket["id"] for ticket in tickets] == ["c", "a"]
+
+
+def test_unprocessed_keys_raise_with_raise_errors(monkeypatch, dynamodb):
+    monkeypatch.setattr(dynamodb, "_backoff_delay", lambda attempt: 0)
+    client = UnprocessedClient()
+    
+    with pytest.raises(RuntimeError):
+        dynamodb._batch_get_chunk(client, "tickets_test", ["a"], consistent_read=True, raise_errors=True)
+    
+    assert client.requests[0]["tickets_test"]["ConsistentRead"] is True
+    assert dynamodb._batch_get_chunk(client, "tickets_test", ["a"]) == []
@@ -0,0 +1,104 @@
+"""Change outbox recording and the Weaviate consumer against a mocked DynamoDB."""
+
+import pytest
+
+from src.outbox_consumer import OutboxConsumer
+
+
+class FakeWeaviateService:
+    """Records the documents the consumer upserts."""
+    
+    def __init__(self):
+        self.documents = {}
+    
+    def upsert_documents(self, documents):
+        self.documents.update(documents)
+        return True
+
+
+@pytest.fixture
+def outbox(settings_env, dynamodb):
+    """Outbox-enabled DynamoDB with the outbox table created."""
+    settings_env(TICKET_OUTBOX_ENABLED="True")
+    assert dynamodb.create_table_if_not_exists()
+    return dynamodb
+
+
+def test_fresh_consumer_on_empty_outbox_applies_nothing(outbox):
+    consumer = OutboxConsumer(FakeWeaviateService(), name="test")
+    
+    assert consumer.checkpoint == ""
+    assert consumer.poll_once() == 0
+
+
+def test_fresh_consumer_indexes_recorded_tickets_and_advances(outbox):
+    service = FakeWeaviateService()
+    consumer = OutboxConsumer(service, name="test")
+    outbox.save_ticket({"id": "t1", "problem": "VPN drops", "category": "Network"})
+    outbox.save_tickets_bulk([{"id": f"b{i}", "problem": f"Problem {i}", "category": "General"} for i in range(3)])
+    
+    assert consumer.run_until_caught_up() == 4
+    assert {document["problem"] for document in service.documents.values()} == {"VPN drops", "Problem 0", "Problem 1", "Problem 2"}
+    assert consumer.checkpoint
+    assert outbox.get_outbox_checkpoint("test") == consumer.checkpoint
+    assert consumer.poll_once() == 0
+
+
+def _put_raw(dynamodb, ticket_id, updated_at):
+    """Write a ticket item directly, without recording an outbox event."""
+    dynamodb.get_tickets_table().put_item(Item={
+        "id": ticket_id, "problem": f"Problem {ticket_id}", "category": "General",
+        "entity_type": "TICKET", "created_at": "2024-01-01T00:00:00", "updated_at": updated_at, "version": 1
+    })
+
+
+def test_event_waits_for_its_ticket_write(outbox):
+    service = FakeWeaviateService()
+    consumer = OutboxConsumer(service, name="test")
+    outbox.record_ticket_changes({"t1": "2024-06-01T00:00:00"})
+    
+    # Recorded, but the ticket write has not landed yet
+    assert consumer.poll_once() == 0
+    assert consumer.checkpoint == ""
+    assert not service.documents
+    
+    _put_raw(outbox, "t1", "2024-06-01T00:00:00")
+    assert consumer.poll_once() == 1
+    assert consumer.checkpoint
+    assert len(service.documents) == 1
+
+
+def test_event_waits_for_a_newer_version_of_the_ticket(outbox):
+    service = FakeWeaviateService()
+    consumer = OutboxConsumer(service, name="test")
+    _put_raw(outbox, "t1", "2024-05-01T00:00:00")
+    outbox.record_ticket_changes({"t1": "2024-06-01T00:00:00"})
+    
+    assert consumer.poll_once() == 0
+    
+    _put_raw(outbox, "t1", "2024-06-01T00:00:00")
+    assert consumer.poll_once() == 1
+    assert consumer.metrics()["events_applied"] == 1
+
+
+def test_waiting_event_holds_the_checkpoint_but_not_later_events(outbox):
+    service = FakeWeaviateService()
+    consumer = OutboxConsumer(service, name="test")
+    outbox.record_ticket_changes({"pending": "2024-06-01T00:00:00"})
+    outbox.save_ticket({"id": "t2", "problem": "Disk full", "category": "Hardware"})
+    
+    assert consumer.poll_once() == 1
+    assert consumer.checkpoint == ""
+    assert len(service.documents) == 1
+    # t2 is not applied again while the checkpoint waits behind the pending event
+    assert consumer.poll_once() == 0
+
+
+def test_event_of_a_failed_write_is_skipped_after_the_timeout(monkeypatch, outbox):
+    monkeypatch.setattr("src.outbox_consumer.PENDING_EVENT_TIMEOUT_SECONDS", 0.0)
+    consumer = OutboxConsumer(FakeWeaviateService(), name="test")
+    outbox.record_ticket_changes({"never-written": "2024-06-01T00:00:00"})
+    
+    assert consumer.poll_once() == 1
+    assert consumer.checkpoint
+    assert consumer.metrics()["events_skipped"] == 1
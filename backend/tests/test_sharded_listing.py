@@ -0,0 +1,80 @@
+"""Sharded CreatedAtIndex listing and the in-place entity_type migration."""
+
+import pytest
+
+import update_existing_tickets
+
+
+@pytest.fixture
+def sharded(dynamodb, settings_env):
+    settings_env(TICKET_INDEX_SHARDS="4")
+    return dynamodb
+
+
+def _put_legacy(dynamodb, ticket_id, created_at):
+    """Write a ticket as stored before sharding (entity_type "TICKET")."""
+    dynamodb.get_tickets_table().put_item(Item={
+        "id": ticket_id, "problem": f"Problem {ticket_id}", "category": "General",
+        "entity_type": "TICKET", "created_at": created_at, "updated_at": created_at, "version": 3
+    })
+
+
+def _all_pages(dynamodb, limit, **kwargs):
+    ids, token = [], None
+    while True:
+        page = dynamodb.list_tickets_sorted_by_created_at(limit=limit, page_token=token, **kwargs)
+        ids.extend(ticket["id"] for ticket in page["tickets"])
+        token = page["next_page_token"]
+        if not token:
+            return ids
+
+
+def test_pagination_merges_shards_in_created_at_order(sharded):
+    for i in range(11):
+        sharded.get_tickets_table().put_item(Item={
+            "id": f"t{i:02d}", "problem": "p", "category": "General",
+            "entity_type": sharded.index_shard_for(f"t{i:02d}"),
+            "created_at": f"2024-01-{i + 1:02d}T00:00:00", "updated_at": "2024-01-01T00:00:00", "version": 1
+        })
+    
+    assert len({sharded.index_shard_for(f"t{i:02d}") for i in range(11)}) > 1
+    assert _all_pages(sharded, limit=3) == [f"t{i:02d}" for i in reversed(range(11))]
+    assert _all_pages(sharded, limit=4, ascending=True) == [f"t{i:02d}" for i in range(11)]
+
+
+def test_unmigrated_tickets_stay_listed_and_are_moved_in_place(sharded):
+    _put_legacy(sharded, "old", "2024-01-01T00:00:00")
+    sharded.save_ticket({"id": "new", "problem": "p", "category": "General"})
+    
+    assert set(_all_pages(sharded, limit=10)) == {"old", "new"}
+    
+    assert update_existing_tickets.update_existing_tickets()
+    
+    stored = sharded.get_ticket_by_id("old", use_cache=False)
+    assert stored["entity_type"] == sharded.index_shard_for("old")
+    assert stored["version"] == 3
+    assert stored["updated_at"] == "2024-01-01T00:00:00"
+    assert set(_all_pages(sharded, limit=10)) == {"old", "new"}
+
+
+def test_set_ticket_attributes_respects_expected_values(sharded):
+    _put_legacy(sharded, "old", "2024-01-01T00:00:00")
+    
+    assert not sharded.set_ticket_attributes("old", {"entity_type": "TICKET#0"}, {"entity_type": "TICKET#3"})
+    assert not sharded.set_ticket_attributes("missing", {"entity_type": "TICKET#0"})
+    assert sharded.get_ticket_by_id("old", use_cache=False)["entity_type"] == "TICKET"
+    
+    assert sharded.set_ticket_attributes("old", {"entity_type": "TICKET#0"}, {"entity_type": "TICKET"})
+    assert sharded.get_ticket_by_id("old", use_cache=False)["entity_type"] == "TICKET#0"
+
+
+def test_summary_view_returns_only_requested_fields(sharded):
+    for i in range(5):
+        sharded.save_ticket({"id": f"t{i}", "problem": "p", "solution": "s", "category": "General"})
+    
+    first = sharded.list_tickets_sorted_by_created_at(limit=3, fields=list(sharded.TICKET_SUMMARY_FIELDS))
+    rest = sharded.list_tickets_sorted_by_created_at(limit=3, page_token=first["next_page_token"], fields=["problem"])
+    
+    assert all(set(ticket) <= set(sharded.TICKET_SUMMARY_FIELDS) for ticket in first["tickets"])
+    assert all(set(ticket) == {"problem"} for ticket in rest["tickets"])
+    assert len(first["tickets"]) + len(rest["tickets"]) == 5
@@ -0,0 +1,39 @@
+"""Conditional partial updates against a mocked DynamoDB table."""
+
+import pytest
+
+
+def test_update_returns_new_image_and_bumps_version(dynamodb):
+    dynamodb.save_ticket({"id": "t1", "problem": "Printer jams", "category": "Hardware"})
+    
+    ticket = dynamodb.update_ticket_fields("t1", {"solution": "Clear the tray", "id": "ignored"}, expected_version=1)
+    
+    assert ticket["solution"] == "Clear the tray"
+    assert ticket["id"] == "t1"
+    assert ticket["version"] == 2
+    assert dynamodb.get_ticket_by_id("t1", use_cache=False)["solution"] == "Clear the tray"
+
+
+def test_stale_version_raises_conflict_with_current_version(dynamodb):
+    dynamodb.save_ticket({"id": "t1", "problem": "Printer jams", "category": "Hardware"})
+    dynamodb.update_ticket_fields("t1", {"status": "closed"}, expected_version=1)
+    
+    with pytest.raises(dynamodb.TicketVersionConflict) as conflict:
+        dynamodb.update_ticket_fields("t1", {"status": "open"}, expected_version=1)
+    
+    assert conflict.value.current_version == 2
+    assert dynamodb.get_ticket_by_id("t1", use_cache=False)["status"] == "closed"
+
+
+def test_update_of_missing_ticket_returns_none(dynamodb):
+    assert dynamodb.update_ticket_fields("missing", {"status": "closed"}, expected_version=1) is None
+
+
+def test_category_move_adjusts_stats_counters(dynamodb):
+    dynamodb.save_ticket({"id": "t1", "problem": "Printer jams", "category": "Hardware"})
+    
+    dynamodb.update_ticket_fields("t1", {"category": "Software"})
+    
+    stats = dynamodb.get_ticket_stats()
+    assert stats["by_category"].get("Hardware", 0) == 0
+    assert stats["by_category"]["Software"] == 1
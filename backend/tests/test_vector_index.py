@@ -0,0 +1,70 @@
+"""Saving and loading the local vector index."""
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src import vector_index
+from src.vector_index import VectorIndex
+
+
+def _index(ids):
+    index = VectorIndex()
+    vectors = np.eye(4, dtype=np.float32)[:len(ids)]
+    index.upsert(ids, vectors, [{"problem": ticket_id} for ticket_id in ids])
+    return index
+
+
+def test_load_reads_the_version_current_points_at(settings_env, tmp_path):
+    _index(["a"]).save(str(tmp_path))
+    _index(["a", "b", "c"]).save(str(tmp_path))
+    
+    loaded = VectorIndex.load(str(tmp_path))
+    
+    assert loaded._ids == ["a", "b", "c"]
+    assert len(loaded) == 3
+    current = (tmp_path / vector_index.CURRENT_FILE).read_text()
+    assert sorted(os.listdir(tmp_path / current)) == [vector_index.META_FILE, vector_index.VECTORS_FILE]
+
+
+def test_save_keeps_only_recent_versions(settings_env, tmp_path):
+    for count in range(1, 5):
+        _index(["a", "b", "c", "d"][:count]).save(str(tmp_path))
+    
+    versions = [name for name in os.listdir(tmp_path) if os.path.isdir(tmp_path / name)]
+    assert len(versions) == 1 + vector_index.KEEP_PREVIOUS_VERSIONS
+    assert (tmp_path / vector_index.CURRENT_FILE).read_text() == max(versions)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_save_leaves_newer_unpublished_versions_alone(settings_env, tmp_path):
+    pending = tmp_path / "v99999999999999999999-1"
+    pending.mkdir()
+    
+    _index(["a"]).save(str(tmp_path))
+    _index(["a", "b"]).save(str(tmp_path))
+    
+    assert pending.is_dir()
+    assert len(VectorIndex.load(str(tmp_path))) == 2
+
+
+def test_load_reads_a_flat_index_from_before_versioning(settings_env, tmp_path):
+    _index(["a", "b"]).save(str(tmp_path))
+    current = tmp_path / (tmp_path / vector_index.CURRENT_FILE).read_text()
+    for name in os.listdir(current):
+        os.replace(current / name, tmp_path / name)
+    os.remove(tmp_path / vector_index.CURRENT_FILE)
+    
+    assert VectorIndex.load(str(tmp_path))._ids == ["a", "b"]
+
+
+def test_configured_mode_without_numpy_is_reported_and_off(settings_env, monkeypatch, capsys):
+    settings_env(VECTOR_INDEX_MODE="primary")
+    monkeypatch.setattr(vector_index, "np", None)
+    monkeypatch.setattr(vector_index, "_warned_missing_numpy", False)
+    
+    assert vector_index.index_mode() == "off"
+    assert vector_index.index_mode() == "off"
+    assert capsys.readouterr().out.count("needs numpy") == 1
@@ -0,0 +1,103 @@
+"""Shared Weaviate client holders: callers wait for an in-flight reconnect."""
+
+import asyncio
+import threading
+import time
+
+from src import weaviate_client
+
+
+class FakeClient:
+    def is_live(self):
+        return True
+    
+    def close(self):
+        pass
+
+
+class FakeAsyncClient:
+    async def is_live(self):
+        return True
+    
+    async def close(self):
+        pass
+
+
+def test_callers_wait_for_an_in_flight_connect(monkeypatch):
+    connecting = threading.Event()
+    client = FakeClient()
+    
+    def slow_connect():
+        connecting.set()
+        time.sleep(0.2)
+        return client
+    
+    monkeypatch.setattr(weaviate_client, "create_weaviate_client", slow_connect)
+    holder = weaviate_client.SharedWeaviateClient(connect_wait_seconds=5)
+    results = []
+    connector = threading.Thread(target=lambda: results.append(holder.get()))
+    connector.start()
+    connecting.wait()
+    
+    assert holder.get() is client
+    connector.join()
+    assert results == [client]
+    assert holder.connects == 1
+
+
+def test_wait_for_an_in_flight_connect_is_bounded(monkeypatch):
+    connecting = threading.Event()
+    release = threading.Event()
+    
+    def stuck_connect():
+        connecting.set()
+        release.wait()
+        return FakeClient()
+    
+    monkeypatch.setattr(weaviate_client, "create_weaviate_client", stuck_connect)
+    holder = weaviate_client.SharedWeaviateClient(connect_wait_seconds=0.1)
+    connector = threading.Thread(target=holder.get)
+    connector.start()
+    connecting.wait()
+    
+    started = time.monotonic()
+    assert holder.get() is None
+    assert time.monotonic() - started < 2
+    release.set()
+    connector.join()
+
+
+def test_async_callers_wait_for_an_in_flight_connect(monkeypatch):
+    client = FakeAsyncClient()
+    
+    async def slow_connect():
+        await asyncio.sleep(0.1)
+        return client
+    
+    monkeypatch.setattr(weaviate_client, "create_async_weaviate_client", slow_connect)
+    holder = weaviate_client.SharedAsyncWeaviateClient(connect_wait_seconds=5)
+    
+    async def run():
+        return await asyncio.gather(holder.get(), holder.get(), holder.get())
+    
+    assert asyncio.run(run()) == [client, client, client]
+    assert holder.connects == 1
+
+
+def test_async_wait_for_an_in_flight_connect_is_bounded(monkeypatch):
+    async def stuck_connect():
+        await asyncio.sleep(1)
+        return FakeAsyncClient()
+    
+    monkeypatch.setattr(weaviate_client, "create_async_weaviate_client", stuck_connect)
+    holder = weaviate_client.SharedAsyncWeaviateClient(connect_wait_seconds=0.05)
+    
+    async def run():
+        connector = asyncio.ensure_future(holder.get())
+        await asyncio.sleep(0)
+        waiter = await holder.get()
+        return waiter, await connector
+    
+    waiter, connected = asyncio.run(run())
+    assert waiter is None
+    assert connected is not None
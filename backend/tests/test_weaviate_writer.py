@@ -0,0 +1,55 @@
+"""Write-behind queue batching and retry backoff."""
+
+from src.weaviate_writer import WeaviateWriter
+
+
+def _take(writer, now):
+    with writer._condition:
+        return writer._ready_batch(now, draining=False)
+
+
+class FlakyService:
+    """Fails every object of the first `failures` batches."""
+    
+    def __init__(self, failures):
+        self.failures = failures
+        self.batches = []
+    
+    def batch_upsert_documents(self, documents):
+        self.batches.append(dict(documents))
+        if len(self.batches) <= self.failures:
+            return list(documents)
+        return []
+
+
+def test_failed_documents_back_off_before_the_next_flush():
+    service = FlakyService(failures=1)
+    writer = WeaviateWriter(service, batch_size=10, flush_interval=1.0)
+    writer.enqueue("a", {"problem": "a"})
+    writer.enqueue("b", {"problem": "b"})
+    
+    writer._flush(_take(writer, 0.0))
+    
+    now = max(writer._retrying.values())
+    assert not writer._should_flush(now - 0.5)
+    assert writer._should_flush(now)
+    assert writer.metrics()["retrying"] == 2
+    
+    writer._flush(_take(writer, now))
+    assert service.batches[-1] == {"a": {"problem": "a"}, "b": {"problem": "b"}}
+    assert writer.written == 2
+    assert not writer._pending and not writer._retrying and not writer._enqueued_at
+
+
+def test_new_version_of_a_retrying_document_is_flushed_on_schedule():
+    service = FlakyService(failures=1)
+    writer = WeaviateWriter(service, batch_size=10, flush_interval=1.0)
+    writer.enqueue("a", {"problem": "old"})
+    writer._flush(_take(writer, 0.0))
+    
+    writer.enqueue("a", {"problem": "new"})
+    
+    assert not writer._retrying
+    enqueued_at = writer._enqueued_at["a"]
+    assert writer._should_flush(enqueued_at + 1.0)
+    assert _take(writer, enqueued_at + 1.0) == {"a": ({"problem": "new"}, 0)}
@@ -0,0 +1,72 @@
+"""WeviateService search against fake Weaviate clients."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src import weviate_service
+
+
+def _response(*issue_ids):
+    return SimpleNamespace(objects=[
+        SimpleNamespace(uuid=f"uuid-{issue_id}", properties={"issue_id": issue_id, "problem": "p"},
+                        metadata=SimpleNamespace(distance=0.1, score=None))
+        for issue_id in issue_ids
+    ])
+
+
+class FakeClient:
+    def __init__(self, near_text):
+        self.collections = SimpleNamespace(get=lambda name: SimpleNamespace(query=SimpleNamespace(near_text=near_text)))
+
+
+class CountingService(weviate_service.WeviateService):
+    """Hands out the client once; later reads see it gone, as after a reconnect."""
+    
+    def __init__(self, client):
+        super().__init__("Tickets")
+        self._clients = [client]
+        self.reads = 0
+    
+    @property
+    def client(self):
+        self.reads += 1
+        return self._clients.pop() if self._clients else None
+
+
+def test_query_reads_the_client_once():
+    service = CountingService(FakeClient(lambda **kwargs: _response("t1")))
+    
+    results = service.query("printer", limit=1)
+    
+    assert [result["id"] for result in results] == ["t1"]
+    assert service.reads == 1
+
+
+def test_query_errors_are_contained_but_bad_modes_raise(monkeypatch):
+    unhealthy = []
+    monkeypatch.setattr(weviate_service, "mark_shared_client_unhealthy", lambda: unhealthy.append(True))
+    
+    def failing(**kwargs):
+        raise RuntimeError("connection reset")
+    
+    assert CountingService(FakeClient(failing)).query("printer") == []
+    assert unhealthy == [True]
+    
+    with pytest.raises(ValueError):
+        CountingService(FakeClient(failing)).query("printer", mode="fuzzy")
+
+
+def test_async_query_contains_client_errors(monkeypatch):
+    unhealthy = []
+    monkeypatch.setattr(weviate_service, "mark_shared_async_client_unhealthy", lambda: unhealthy.append(True))
+    service = weviate_service.AsyncWeviateService("Tickets")
+    
+    async def broken_client():
+        return SimpleNamespace(collections=SimpleNamespace(get=lambda name: 1 / 0))
+    
+    service._client = broken_client
+    
+    assert asyncio.run(service.query("printer")) == []
+    assert unhealthy == [True]
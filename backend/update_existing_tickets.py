@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
-"""Update existing tickets to add entity_type field for GSI compatibility."""
+"""Update existing tickets so entity_type matches the CreatedAtIndex shard layout."""
 
-from src.dynamodb_client import create_dynamodb_client, get_table
+from src.dynamodb_client import create_dynamodb_client, get_table, iter_all_tickets, index_shard_for, index_shard_keys, set_ticket_attributes_bulk
 from src.config import get_dynamodb_config
 from dotenv import load_dotenv
 
@@ -9,8 +9,18 @@ from dotenv import load_dotenv
 load_dotenv()
 
 def update_existing_tickets():
-    """Add entity_type field to existing tickets for GSI compatibility."""
+    """Set entity_type on existing tickets to their index shard.
+    
+    Covers tickets written before entity_type existed as well as tickets
+    written under a different TICKET_INDEX_SHARDS setting. Each ticket is
+    moved with a conditional in-place update that only succeeds while its
+    entity_type is still the one scanned, so it is safe to run while the
+    application keeps writing. Until it has run, sharded listings still
+    read the old "TICKET" partition; tickets left on other retired shards
+    (after lowering TICKET_INDEX_SHARDS) are only listed again once moved.
+    """
     print("=== Updating Existing Tickets for GSI Compatibility ===")
+    print(f"🧩 Index shards: {', '.join(index_shard_keys())}")
     
     client = create_dynamodb_client()
     if not client:
@@ -30,51 +40,46 @@ def update_existing_tickets():
     try:
         print(f"📋 Scanning table: {config['table_name']}")
         
-        # Scan all items in the table
-        response = table.scan()
-        items = response.get('Items', [])
-        
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-            items.extend(response.get('Items', []))
+        scanned_count = 0
+        updated_count = 0
         
-        print(f"📊 Found {len(items)} total items in table")
+        def resharded_items():
+            """Yield (id, new attributes, expected attributes) for tickets on the wrong shard."""
+            nonlocal scanned_count, updated_count
+            for item in iter_all_tickets(projection=['id', 'entity_type']):
+                scanned_count += 1
+                
+                shard = index_shard_for(item['id'])
+                current = item.get('entity_type')
+                if current != shard:
+                    # Add or re-shard the entity_type field, unless it changed since the scan
+                    updated_count += 1
+                    yield item['id'], {'entity_type': shard}, {'entity_type': current}
+                
+                if scanned_count % 1000 == 0:
+                    print(f"   📝 Scanned {scanned_count} items, updated {updated_count}...")
         
-        # Filter items that don't have entity_type
-        items_to_update = []
-        for item in items:
-            if 'entity_type' not in item:
-                items_to_update.append(item)
+        # Stream ids from a parallel scan into conditional updates, so memory use
+        # does not grow with the table and writes back off when throttled
+        stats = set_ticket_attributes_bulk(resharded_items())
         
-        print(f"🔄 {len(items_to_update)} items need entity_type field added")
+        print(f"📊 Scanned {scanned_count} total items in table")
         
-        if len(items_to_update) == 0:
-            print("✅ All items already have entity_type field!")
+        if updated_count == 0:
+            print("✅ All items already have the expected entity_type!")
             return True
         
-        # Update items in batches
-        batch_size = 25  # DynamoDB batch write limit
-        updated_count = 0
+        if stats["skipped"]:
+            print(f"   ⏭️  {stats['skipped']} tickets changed or were deleted during the scan; re-run to check them")
         
-        for i in range(0, len(items_to_update), batch_size):
-            batch = items_to_update[i:i + batch_size]
-            
-            print(f"📝 Updating batch {i//batch_size + 1} ({len(batch)} items)...")
-            
-            # Prepare batch write request
-            with table.batch_writer() as batch_writer:
-                for item in batch:
-                    # Add entity_type field
-                    item['entity_type'] = 'TICKET'
-                    
-                    # Write the updated item
-                    batch_writer.put_item(Item=item)
-                    updated_count += 1
-            
-            print(f"   ✅ Updated {len(batch)} items")
+        if stats["failed"]:
+            print(f"❌ {stats['failed']} items could not be written; re-run to retry them")
+            return False
         
-        print(f"🎉 Successfully updated {updated_count} tickets with entity_type field!")
+        controller = stats.get("controller", {})
+        print(f"🎉 Successfully updated entity_type on {stats['updated']} tickets!")
+        print(f"   ⚙️  Throttles: {controller.get('throttles', 0)}, "
+              f"final concurrency: {controller.get('concurrency')}, batch size: {controller.get('batch_size')}")
         print("✅ All tickets are now compatible with the CreatedAtIndex GSI")
         return True
         